@@ -0,0 +1,20 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:55
+
+import core.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0003_alter_profile_avatar'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='avatar',
+            field=models.ImageField(blank=True, default='profile_avatars/default_profile_avatar.png', storage=core.storage.PublicContentAddressedStorage(), upload_to='profile_avatars/%Y/%m/%d/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=('png', 'jpg', 'jpeg'))], verbose_name='Фотография профиля'),
+        ),
+    ]
@@ -4,6 +4,8 @@ from django.db import models
 from django.urls import reverse
 from django.utils.text import slugify
 
+from core.storage import PublicContentAddressedStorage
+
 User = get_user_model()
 
 
@@ -25,6 +27,7 @@ class Profile(models.Model):
         verbose_name='Фотография профиля',
         upload_to='profile_avatars/%Y/%m/%d/',
         default='profile_avatars/default_profile_avatar.png',
+        storage=PublicContentAddressedStorage(),
         blank=True,
         validators=[FileExtensionValidator(allowed_extensions=('png', 'jpg', 'jpeg'))]
     )
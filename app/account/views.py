@@ -1,3 +1,4 @@
+from django.http import Http404
 from django.shortcuts import render
 from django.urls import reverse_lazy
 from django.views.generic import DetailView, UpdateView
@@ -5,7 +6,12 @@ from django.views.generic.edit import FormView
 from django.views.generic.list import ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
 
-from education.models import Course
+from core.conditional import ConditionalGetMixin
+from education.models import Content, Course
+from education.service.enrollment import touch_enrollment
+from education.service.outline import get_outline
+from education.service.progress import record_progress
+from education.service.render_cache import render_items
 from .forms import ProfileUpdateForm, CourseEnrollForm
 from .models import Profile
 from .services.services import service_create_user_registration_form, ServiceProfileUpdate
@@ -145,19 +151,28 @@ class StudentCourseListView(LoginRequiredMixin, ListView):
             QuerySet: queryset курсов для текущего студента.
         """
         qs = super().get_queryset()
-        return qs.filter(students__in=[self.request.user])
+        return qs.filter(enrollments__user=self.request.user)
 
 
-class StudentCourseDetailView(DetailView):
+class StudentCourseDetailView(LoginRequiredMixin, ConditionalGetMixin, DetailView):
     """
     Представление детальной информации о курсе для студента.
 
+    Курс читается один раз за запрос, список модулей берется из кэша
+    оглавления курса, а текущий модуль выбирается из этого списка,
+    поэтому страница строится за постоянное число запросов. На повторный
+    запрос неизменившейся страницы отвечает 304 Not Modified.
+
     Attributes:
         model (Course): Модель курса.
         template_name (str): Имя шаблона для отображения детальной информации.
 
     Methods:
         get_queryset(): Получает и возвращает queryset курсов для текущего студента.
+        get_object(queryset=None): Возвращает курс, прочитанный за запрос один раз.
+        get_module(outline): Возвращает текущий модуль из оглавления курса.
+        get_validators(): Возвращает валидаторы страницы без ее прорисовки.
+        get(request, *args, **kwargs): Отмечает посещение и при ответе 304.
         get_context_data(**kwargs): Получает и возвращает контекст для отображения детальной информации о курсе.
     """
     model = Course
@@ -171,7 +186,75 @@ class StudentCourseDetailView(DetailView):
             QuerySet: queryset курсов для текущего студента.
         """
         qs = super().get_queryset()
-        return qs.filter(students__in=[self.request.user])
+        return qs.filter(enrollments__user=self.request.user)
+
+    def get_object(self, queryset=None):
+        """
+        Возвращает курс, прочитанный за запрос один раз.
+
+        Returns:
+            Course: Курс текущего студента.
+        """
+        if queryset is None and getattr(self, 'object', None) is not None:
+            return self.object
+        return super().get_object(queryset)
+
+    def get_module(self, outline):
+        """
+        Возвращает текущий модуль из оглавления курса.
+
+        Без module_id в адресе возвращается первый модуль.
+
+        Returns:
+            dict: Элемент оглавления {'id', 'order', 'title'}.
+
+        Raises:
+            Http404: У курса нет модулей или модуль не принадлежит курсу.
+        """
+        if 'module_id' not in self.kwargs:
+            if not outline:
+                raise Http404('У курса пока нет модулей')
+            return outline[0]
+        for module in outline:
+            if str(module['id']) == str(self.kwargs['module_id']):
+                return module
+        raise Http404('Модуль не найден')
+
+    def get_validators(self):
+        """
+        Возвращает валидаторы страницы: версию содержимого курса, его заголовок и текущий модуль.
+
+        Версия меняется при любом изменении модулей и контента курса,
+        поэтому шаблон для проверки не прорисовывается. Заголовок курса
+        в версию не входит и учитывается отдельно. Прочитанный курс
+        используется и при построении страницы.
+
+        Returns:
+            tuple | None: Пара (валидаторы, None); None - курс или модуль не
+             найдены (ответ 404 строит само представление).
+        """
+        try:
+            self.object = self.get_object()
+            self.module = self.get_module(get_outline(self.object))
+        except Http404:
+            return None
+        return (self.object.content_version, self.object.title, self.module['id']), None
+
+    def get(self, request, *args, **kwargs):
+        """
+        Возвращает страницу курса или 304 Not Modified.
+
+        Повторный просмотр неизменившейся страницы тоже отмечает
+        посещение курса и просмотр контента.
+        """
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 304:
+            touch_enrollment(self.object.pk, request.user.pk)
+            record_progress(
+                request.user.pk,
+                list(Content.objects.filter(module_id=self.module['id']).values_list('pk', flat=True))
+            )
+        return response
 
     def get_context_data(self, **kwargs):
         """
@@ -185,15 +268,23 @@ class StudentCourseDetailView(DetailView):
         """
         context = super().get_context_data(**kwargs)
 
-        # Получить объект Course
         course = self.get_object()
-
-        if 'module_id' in self.kwargs:
-            # Взять текущий модуль
-            context['module'] = course.modules.get(id=self.kwargs['module_id'])
-        else:
-            # Взять первый модуль
-            context['module'] = course.modules.all()[0]
+        context['outline'] = get_outline(course)
+        context['module'] = self.get_module(context['outline'])
+        touch_enrollment(course.pk, self.request.user.pk)
+
+        # Объекты контента подгружаются пачкой по каждому типу,
+        # а их HTML берется из кэша одним запросом
+        contents = [
+            content for content in Content.objects.filter(
+                module_id=context['module']['id']
+            ).with_items()
+            if content.item is not None
+        ]
+        items = [content.item for content in contents]
+        context['contents'] = list(zip(items, render_items(items)))
+        # Просмотр попадает в буфер прогресса и записывается позже
+        record_progress(self.request.user.pk, [content.pk for content in contents])
 
         return context
 
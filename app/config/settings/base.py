@@ -56,6 +56,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # Полнотекстовый поиск
     'embed_video',  # Работа с видео
     'channels',
 ]
@@ -175,6 +176,28 @@ CHANNEL_LAYERS = {
     }
 }
 
+# Кэширование
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Локальный (в процессе) LRU-кэш прорисованного контента курсов.
+    # Общий уровень 'content_render_shared' (Redis) подключается в prod.py
+    'content_render': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'content-render',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+}
+# Версия разметки объектов контента в ключах кэша прорисовки
+# (education.service.render_cache). Увеличивается при каждом изменении
+# шаблонов courses/content/*.html и тегов, которые они используют,
+# чтобы после выкладки общий кэш не отдавал прежнюю разметку
+RENDER_CACHE_VERSION = 1
+
 # Раздача статики
 
 STATIC_ROOT = BASE_DIR / 'static'
@@ -182,3 +205,49 @@ STATIC_ROOT = BASE_DIR / 'static'
 # Работа с медиафайлами
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Медиафайлы хранятся один раз на содержимое с подсчетом ссылок (core.storage)
+STORAGES = {
+    'default': {
+        'BACKEND': 'core.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Уменьшенные копии изображений (core.derivatives)
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1280)
+IMAGE_DERIVATIVE_FORMATS = ('webp', 'jpeg')
+# Количество процессов пула, 0 - строить копии в текущем процессе
+IMAGE_DERIVATIVE_WORKERS = 2
+
+# Каталоги MEDIA_ROOT, которые nginx отдает из /media/ без проверки доступа:
+# общедоступное хранилище (core.storage.PublicContentAddressedStorage) и
+# аватары, загруженные до него. Остальные файлы - только через /protected-media/
+PUBLIC_MEDIA_DIRS = ('public', 'profile_avatars')
+
+# Выдача файлов контента (education.service.downloads)
+# Префикс internal-location nginx для X-Accel-Redirect, None - отдавать файлы приложением
+MEDIA_ACCEL_REDIRECT_PREFIX = None
+# Время жизни подписанной ссылки на скачивание в секундах
+DOWNLOAD_URL_MAX_AGE = 60 * 60
+
+# Метаданные встраивания видео (education.service.video_embeds)
+VIDEO_EMBED_BACKENDS = (
+    'embed_video.backends.YoutubeBackend',
+    'embed_video.backends.VimeoBackend',
+    'embed_video.backends.SoundCloudBackend',
+)
+VIDEO_EMBED_TIMEOUT = 5
+
+# Прогресс студентов (education.service.progress)
+# Интервал записи буфера событий в секундах, 0 - писать каждое событие сразу
+PROGRESS_FLUSH_INTERVAL = 5
+# Количество пар (студент, контент), после которого буфер записывается досрочно
+PROGRESS_FLUSH_SIZE = 1000
+
+# Условные GET-запросы страниц (core.conditional)
+# Входит в ETag страниц: увеличивается при изменении их шаблонов,
+# чтобы браузеры не показывали сохраненную копию старой разметки
+PAGE_ETAG_VERSION = 1
@@ -23,6 +23,17 @@ DATABASES = {
     }
 }
 
+# Общий для всех воркеров кэш прорисованного контента курсов
+# в том же Redis, что и CHANNEL_LAYERS (база 1)
+CACHES['content_render_shared'] = {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': f'redis://{REDIS_HOST}:{REDIS_PORT}/1',
+    'TIMEOUT': 60 * 60 * 24 * 7,
+}
+
+# Передачу файлов контента выполняет nginx (location /protected-media/)
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
 # # Безопасность
 # CSRF_COOKIE_SECURE = True
 # SESSION_COOKIE_SECURE = True
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Подсчет ссылок на файлы в хранилище с адресацией по содержимому
+        from . import signals  # noqa: F401
@@ -0,0 +1,123 @@
+"""
+Условные GET-запросы страниц (ETag / Last-Modified).
+
+Представление сначала вычисляет дешевые валидаторы страницы (версии и
+даты изменения показываемых данных), не прорисовывая шаблон. Если ETag
+совпадает с If-None-Match запроса (или страница не менялась после
+If-Modified-Since), возвращается 304 Not Modified без тела.
+
+Страницы зависят от пользователя (шапка base.html) и содержат CSRF-токен
+в формах, поэтому в ETag входят идентификатор пользователя и CSRF-cookie,
+а ответы помечаются Cache-Control: private, no-cache - браузер хранит
+копию, но каждый раз проверяет ее у сервера.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def page_etag(request, *parts):
+    """
+    Вычисляет ETag страницы по валидаторам parts.
+
+    Args:
+        request (HttpRequest): Запрос.
+        *parts: Значения, от которых зависит содержимое страницы.
+
+    Returns:
+        str: ETag в кавычках.
+    """
+    raw = repr((
+        settings.PAGE_ETAG_VERSION,
+        request.user.pk,
+        request.META.get('CSRF_COOKIE', ''),
+        parts,
+    ))
+    return quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+
+def conditional_get(request, get_response, parts, last_modified=None):
+    """
+    Возвращает 304 Not Modified, если страница не изменилась, иначе - ответ get_response().
+
+    Args:
+        request (HttpRequest): Запрос.
+        get_response (callable): Строит полный ответ страницы.
+        parts (tuple): Валидаторы страницы для ETag.
+        last_modified (datetime): Дата последнего изменения страницы, если известна.
+
+    Returns:
+        HttpResponse: Ответ 304 или полный ответ с заголовками валидаторов.
+    """
+    etag = page_etag(request, *parts)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = get_response()
+        if response.status_code != 200:
+            return response
+        if hasattr(response, 'render'):
+            response.render()
+        # CSRF-cookie нового посетителя появляется при прорисовке формы
+        etag = page_etag(request, *parts)
+    response.headers.setdefault('ETag', etag)
+    if timestamp is not None:
+        response.headers.setdefault('Last-Modified', http_date(timestamp))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_page(get_validators):
+    """
+    Декоратор функции-представления, отвечающий 304 на неизменившуюся страницу.
+
+    Args:
+        get_validators (callable): Принимает аргументы представления и
+         возвращает пару (валидаторы для ETag, дата изменения или None)
+         либо None, если страница не найдена (ответ строит само представление).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            validators = None
+            if request.method in ('GET', 'HEAD'):
+                validators = get_validators(request, *args, **kwargs)
+            if validators is None:
+                return view(request, *args, **kwargs)
+            parts, last_modified = validators
+            return conditional_get(
+                request,
+                lambda: view(request, *args, **kwargs),
+                parts,
+                last_modified
+            )
+        return wrapper
+    return decorator
+
+
+class ConditionalGetMixin:
+    """
+    Примесь представления-класса, отвечающая 304 на неизменившуюся страницу.
+
+    Methods:
+        get_validators(): Возвращает пару (валидаторы для ETag, дата
+         изменения или None) либо None - тогда страница строится как обычно.
+    """
+
+    def get_validators(self):
+        return None
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+        parts, last_modified = validators
+        return conditional_get(
+            request,
+            lambda: super(ConditionalGetMixin, self).get(request, *args, **kwargs),
+            parts,
+            last_modified
+        )
@@ -0,0 +1,237 @@
+"""
+Фоновое построение уменьшенных копий изображений (WebP/JPEG разных ширин).
+
+После фиксации транзакции, в которой сохранилось новое изображение,
+задача отправляется в пул процессов (core.imaging работает без Django),
+а результат записывается в ImageDerivative из потока обратного вызова.
+Шаблоны выводят копии в srcset тегом responsive_image (media_tags).
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.dispatch import Signal
+from django.utils.http import urlencode
+
+from .imaging import render_derivatives
+from .models import ImageDerivative
+from .storage import is_public_name
+
+logger = logging.getLogger(__name__)
+
+# Поля с изображениями, для которых строятся копии
+DERIVATIVE_FIELDS = (
+    ('education', 'Image', 'file'),
+    ('account', 'Profile', 'avatar'),
+)
+DERIVATIVE_DIR = 'derivatives'
+
+# Отправляется после записи копий изображения, аргумент source - имя исходного файла
+derivatives_ready = Signal()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def is_derivative_field(field):
+    """Строятся ли копии для файлов поля."""
+    return (field.model._meta.app_label, field.model.__name__, field.name) in DERIVATIVE_FIELDS
+
+
+def get_derivative_fields():
+    """Поля с изображениями из DERIVATIVE_FIELDS."""
+    return [
+        apps.get_model(app_label, model_name)._meta.get_field(field_name)
+        for app_label, model_name, field_name in DERIVATIVE_FIELDS
+    ]
+
+
+def get_executor():
+    """
+    Пул процессов, общий для всего процесса приложения.
+
+    Процессы запускаются методом spawn: форк процесса с открытыми
+    соединениями к базе и потоками сервера небезопасен.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_DERIVATIVE_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+
+def derivative_dir(source):
+    """
+    Каталог копий изображения в хранилище.
+
+    Копии общедоступного изображения тоже общедоступны и лежат в public/.
+    """
+    key = hashlib.sha1(source.encode()).hexdigest()
+    directory = f'{DERIVATIVE_DIR}/{key[:2]}/{key}'
+    return f'public/{directory}' if is_public_name(source) else directory
+
+
+def get_job(source):
+    """Аргументы render_derivatives для исходного файла."""
+    return (
+        default_storage.path(source),
+        default_storage.path(derivative_dir(source)),
+        settings.IMAGE_DERIVATIVE_WIDTHS,
+        settings.IMAGE_DERIVATIVE_FORMATS,
+    )
+
+
+def record_derivatives(source, results):
+    """
+    Сохраняет сведения о построенных копиях и сообщает о них.
+
+    Returns:
+        int: Количество записанных копий.
+    """
+    directory = derivative_dir(source)
+    ImageDerivative.objects.bulk_create(
+        [
+            ImageDerivative(
+                source=source,
+                format=result['format'],
+                width=result['width'],
+                height=result['height'],
+                name=f"{directory}/{result['filename']}"
+            )
+            for result in results
+        ],
+        ignore_conflicts=True
+    )
+    if results:
+        derivatives_ready.send(sender=ImageDerivative, source=source)
+    return len(results)
+
+
+def _record_future(source, future):
+    """Обратный вызов пула: записывает результат задачи."""
+    try:
+        record_derivatives(source, future.result())
+    except Exception:
+        logger.exception('Не удалось построить копии изображения %s', source)
+    finally:
+        # Поток обратного вызова не проходит через цикл запроса
+        close_old_connections()
+
+
+def submit_derivatives(sources):
+    """Отправляет построение копий в пул процессов или строит их сразу."""
+    for source in sources:
+        if not settings.IMAGE_DERIVATIVE_WORKERS:
+            record_derivatives(source, render_derivatives(*get_job(source)))
+            continue
+        future = get_executor().submit(render_derivatives, *get_job(source))
+        future.add_done_callback(lambda future, source=source: _record_future(source, future))
+
+
+def schedule_derivatives(*sources):
+    """
+    Ставит построение копий изображений в очередь после фиксации транзакции.
+
+    Изображения, у которых копии уже есть (например, повторная загрузка
+    того же содержимого), пропускаются.
+    """
+    sources = {source for source in sources if source}
+    if sources:
+        transaction.on_commit(lambda: submit_derivatives(missing_sources(sources)))
+
+
+def missing_sources(sources):
+    """Исходные файлы из sources, для которых еще нет копий."""
+    done = set(
+        ImageDerivative.objects.filter(source__in=sources).values_list('source', flat=True)
+    )
+    return [source for source in sources if source not in done]
+
+
+def get_srcsets(source, url=''):
+    """
+    Строки srcset копий изображения по форматам.
+
+    Args:
+        source (str): Имя исходного файла.
+        url (str): Ссылка на защищенное изображение. Если задана, копии
+         запрашиваются по ней с параметрами format и width, иначе -
+         по ссылкам хранилища.
+
+    Returns:
+        dict: Словарь {формат: 'url 320w, url 640w'}.
+    """
+    srcsets = {}
+    for derivative in ImageDerivative.objects.filter(source=source).order_by('width'):
+        if url:
+            query = urlencode({'format': derivative.format, 'width': derivative.width})
+            derivative_url = f'{url}?{query}'
+        else:
+            derivative_url = default_storage.url(derivative.name)
+        srcsets.setdefault(derivative.format, []).append(f'{derivative_url} {derivative.width}w')
+    return {image_format: ', '.join(items) for image_format, items in srcsets.items()}
+
+
+def delete_derivatives(source):
+    """Удаляет копии изображения из хранилища и базы."""
+    derivatives = ImageDerivative.objects.filter(source=source)
+    for name in derivatives.values_list('name', flat=True):
+        default_storage.delete(name)
+    derivatives.delete()
+    directory = default_storage.path(derivative_dir(source))
+    if os.path.isdir(directory) and not os.listdir(directory):
+        os.rmdir(directory)
+
+
+def get_image_sources():
+    """Имена всех изображений из полей DERIVATIVE_FIELDS без значений по умолчанию."""
+    sources = set()
+    for field in get_derivative_fields():
+        names = field.model._base_manager.exclude(**{field.name: ''}).values_list(
+            field.attname, flat=True
+        ).distinct()
+        default = field.default if isinstance(field.default, str) else None
+        sources.update(name for name in names.iterator() if name and name != default)
+    return sorted(sources)
+
+
+def backfill_derivatives(workers, force=False, batch_size=200):
+    """
+    Строит копии для уже загруженных изображений в отдельном пуле процессов.
+
+    Args:
+        workers (int): Количество процессов.
+        force (bool): Перестроить копии, которые уже есть.
+        batch_size (int): Количество изображений, отправляемых в пул за раз.
+
+    Returns:
+        tuple: Количество обработанных изображений и построенных копий.
+    """
+    sources = get_image_sources()
+    images = derivatives = 0
+    with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        for start in range(0, len(sources), batch_size):
+            batch = sources[start:start + batch_size]
+            if force:
+                ImageDerivative.objects.filter(source__in=batch).delete()
+            else:
+                batch = missing_sources(batch)
+            jobs = [get_job(source) for source in batch]
+            results = executor.map(render_derivatives, *zip(*jobs)) if jobs else []
+            for source, result in zip(batch, results):
+                derivatives += record_derivatives(source, result)
+                images += 1
+    return images, derivatives
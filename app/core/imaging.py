@@ -0,0 +1,62 @@
+"""
+Построение уменьшенных копий изображений.
+
+Модуль не зависит от Django: функции выполняются в процессах пула
+(см. core.derivatives) и работают только с путями в файловой системе.
+"""
+import os
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Расширение файла и параметры сохранения для каждого формата
+FORMATS = {
+    'webp': ('webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def render_derivatives(source_path, target_dir, widths, formats):
+    """
+    Сохраняет уменьшенные копии изображения в target_dir.
+
+    Копии строятся только для ширин меньше исходной; если изображение
+    уже самой маленькой ширины, сохраняется одна копия исходного размера.
+
+    Args:
+        source_path (str): Путь к исходному изображению.
+        target_dir (str): Каталог для копий.
+        widths (iterable): Ширины копий в пикселях.
+        formats (iterable): Форматы копий из FORMATS.
+
+    Returns:
+        list: Словари с шириной, высотой, форматом и именем файла копии.
+         Пустой список, если файл отсутствует или не является изображением.
+    """
+    try:
+        with Image.open(source_path) as image:
+            image = ImageOps.exif_transpose(image)
+            image.load()
+    except (FileNotFoundError, UnidentifiedImageError, OSError):
+        return []
+
+    target_widths = sorted({width for width in widths if width < image.width}) or [image.width]
+    os.makedirs(target_dir, exist_ok=True)
+    results = []
+    for width in target_widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+        for image_format in formats:
+            extension, options = FORMATS[image_format]
+            # JPEG не поддерживает прозрачность и палитру
+            converted = resized.convert('RGB') if image_format == 'jpeg' else resized
+            if image_format == 'webp' and converted.mode not in ('RGB', 'RGBA'):
+                converted = converted.convert('RGBA')
+            filename = f'{width}.{extension}'
+            converted.save(os.path.join(target_dir, filename), image_format.upper(), **options)
+            results.append({
+                'width': width,
+                'height': height,
+                'format': image_format,
+                'filename': filename,
+            })
+    return results
@@ -0,0 +1,49 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.derivatives import backfill_derivatives
+
+
+class Command(BaseCommand):
+    """
+    Строит уменьшенные копии для уже загруженных изображений контента и аватаров.
+
+    Новые изображения обрабатываются автоматически после загрузки,
+    команда нужна для заполнения копий существующих файлов.
+    """
+    help = 'Строит копии WebP/JPEG для существующих изображений в несколько процессов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Количество процессов'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Количество изображений в одной порции'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Перестроить уже существующие копии'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        images, derivatives = backfill_derivatives(
+            workers=options['workers'],
+            force=options['force'],
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Обработано изображений: {images}, построено копий: {derivatives} '
+                f'за {time.monotonic() - started:.1f} с'
+            )
+        )
@@ -0,0 +1,41 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from core.storage import ContentAddressedStorage, collect_blobs, recount_blobs
+
+
+class Command(BaseCommand):
+    """
+    Обслуживание хранилища медиафайлов с адресацией по содержимому.
+
+    Пересчитывает счетчики ссылок по фактическим значениям полей
+    (после массовых операций в обход сигналов) и удаляет файлы без
+    ссылок, а также временные файлы прерванных сохранений.
+    """
+    help = 'Пересчитывает ссылки на медиафайлы и удаляет неиспользуемые файлы'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recount',
+            action='store_true',
+            help='Перед очисткой пересчитать счетчики ссылок'
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=60,
+            help='Минимальный возраст удаляемых файлов в минутах'
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError('Хранилище по умолчанию не считает ссылки на файлы')
+        if options['recount']:
+            with transaction.atomic():
+                changed = recount_blobs()
+            self.stdout.write(f'Исправлено счетчиков ссылок: {changed}')
+        purged = collect_blobs(default_storage, timedelta(minutes=options['min_age']))
+        self.stdout.write(self.style.SUCCESS(f'Удалено файлов: {purged}'))
@@ -0,0 +1,48 @@
+import os
+from collections import Counter
+
+from django.conf import settings
+from django.db import migrations
+
+# Поля, файлы которых переходят под подсчет ссылок
+FILE_FIELDS = (
+    ('education', 'file', 'file'),
+    ('education', 'image', 'file'),
+    ('account', 'profile', 'avatar'),
+)
+
+
+def register_existing_files(apps, schema_editor):
+    """
+    Заводит Blob для уже загруженных файлов со счетчиком текущих ссылок.
+
+    Значения полей по умолчанию (общая заглушка аватара) не регистрируются,
+    поэтому хранилище их никогда не удаляет.
+    """
+    Blob = apps.get_model('core', 'Blob')
+    references = Counter()
+    for app_label, model_name, field_name in FILE_FIELDS:
+        model = apps.get_model(app_label, model_name)
+        default = model._meta.get_field(field_name).default
+        names = model.objects.exclude(**{field_name: ''}).values_list(field_name, flat=True)
+        references.update(name for name in names.iterator() if name and name != default)
+
+    blobs = []
+    for name, refcount in references.items():
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        blobs.append(Blob(name=name, size=size, refcount=refcount))
+    Blob.objects.bulk_create(blobs, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_blob'),
+        ('account', '0003_alter_profile_avatar'),
+        ('education', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(register_existing_files, migrations.RunPython.noop),
+    ]
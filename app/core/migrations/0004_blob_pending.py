@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_image_derivative'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blob',
+            name='pending',
+            field=models.PositiveIntegerField(default=0, verbose_name='Ссылок, взятых при сохранении файла'),
+        ),
+    ]
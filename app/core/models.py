@@ -0,0 +1,102 @@
+from django.db import models
+
+
+class Blob(models.Model):
+    """
+    Файл в хранилище с адресацией по содержимому.
+
+    Каждое уникальное содержимое хранится один раз под своим хэшем
+    (у общедоступного хранилища хэш считается с префиксом),
+    refcount - количество полей FileField, которые ссылаются на файл.
+    pending - часть refcount, взятая при сохранении файла в хранилище,
+    пока строка с полем FileField еще не сохранена.
+    Файлы, загруженные до появления хранилища, учитываются по имени
+    и не имеют хэша.
+    """
+    digest = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name='SHA-256 содержимого'
+    )
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name='Имя файла в хранилище'
+    )
+    size = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Размер в байтах'
+    )
+    refcount = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество ссылок'
+    )
+    pending = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Ссылок, взятых при сохранении файла'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата загрузки'
+    )
+
+    class Meta:
+        verbose_name = 'Файл хранилища'
+        verbose_name_plural = 'Файлы хранилища'
+
+    def __str__(self):
+        return f'{self.name} ({self.refcount})'
+
+
+class ImageDerivative(models.Model):
+    """
+    Уменьшенная копия изображения для атрибута srcset.
+
+    Копии привязаны к имени исходного файла в хранилище, поэтому
+    одинаковые изображения (один Blob) обрабатываются один раз.
+    """
+
+    class Format(models.TextChoices):
+        """ Определение вариантов формата копии """
+        WEBP = 'webp', 'WebP'
+        JPEG = 'jpeg', 'JPEG'
+
+    source = models.CharField(
+        max_length=255,
+        verbose_name='Имя исходного файла'
+    )
+    format = models.CharField(
+        max_length=4,
+        choices=Format.choices,
+        verbose_name='Формат'
+    )
+    width = models.PositiveIntegerField(
+        verbose_name='Ширина'
+    )
+    height = models.PositiveIntegerField(
+        verbose_name='Высота'
+    )
+    name = models.CharField(
+        max_length=255,
+        verbose_name='Имя файла копии'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+
+    class Meta:
+        ordering = ['source', 'format', 'width']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['source', 'format', 'width'],
+                name='core_derivative_unique_size'
+            ),
+        ]
+        verbose_name = 'Копия изображения'
+        verbose_name_plural = 'Копии изображений'
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,73 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .derivatives import delete_derivatives, is_derivative_field, schedule_derivatives
+from .models import Blob
+from .storage import stored_file_fields
+
+
+def get_file_names(instance, fields):
+    """
+    Имена файлов загруженных полей экземпляра.
+
+    Отложенные (deferred) поля не загружаются и не учитываются.
+    """
+    return {
+        field.attname: str(instance.__dict__[field.attname] or '')
+        for field in fields if field.attname in instance.__dict__
+    }
+
+
+def connect_file_references(model):
+    """
+    Подключает подсчет ссылок на файлы для полей модели в ContentAddressedStorage.
+    """
+    fields = stored_file_fields(model)
+    if not fields:
+        return
+
+    def remember_file_names(sender, instance, **kwargs):
+        instance._loaded_file_names = get_file_names(instance, fields)
+
+    def update_file_references(sender, instance, created, raw=False, update_fields=None, **kwargs):
+        if raw:
+            return
+        loaded = {} if created else getattr(instance, '_loaded_file_names', {})
+        current = get_file_names(instance, fields)
+        for field in fields:
+            if update_fields is not None and field.name not in update_fields:
+                continue
+            if field.attname not in current or (not created and field.attname not in loaded):
+                continue
+            old_name, new_name = loaded.get(field.attname, ''), current[field.attname]
+            if old_name != new_name:
+                field.storage.acquire([new_name])
+                field.storage.release([old_name])
+                if is_derivative_field(field):
+                    schedule_derivatives(new_name)
+        instance._loaded_file_names = current
+
+    def release_file_references(sender, instance, **kwargs):
+        for field in fields:
+            field.storage.release([getattr(instance, field.attname).name])
+
+    # Обработчики хранятся на модели, поскольку сигналы держат слабые ссылки
+    model._file_reference_handlers = (
+        remember_file_names, update_file_references, release_file_references
+    )
+    post_init.connect(remember_file_names, sender=model)
+    post_save.connect(update_file_references, sender=model)
+    post_delete.connect(release_file_references, sender=model)
+
+
+for model in apps.get_models():
+    connect_file_references(model)
+
+
+@receiver(post_delete, sender=Blob)
+def delete_blob_derivatives(sender, instance, **kwargs):
+    """
+    Удаляет уменьшенные копии вместе с последним исходным файлом.
+    """
+    delete_derivatives(instance.name)
@@ -0,0 +1,316 @@
+"""
+Хранилище медиафайлов с адресацией по содержимому и подсчетом ссылок.
+
+При сохранении файл потоком пишется во временный файл с одновременным
+вычислением SHA-256 и переносится (без копирования) в
+blobs/<aa>/<bb>/<digest><.ext>. Если такое содержимое уже есть,
+временный файл удаляется, а полю возвращается имя существующего файла.
+Общедоступные файлы (аватары) хранятся так же, но в public/blobs
+(PublicContentAddressedStorage): nginx отдает без проверки доступа только
+каталоги PUBLIC_MEDIA_DIRS.
+
+Количество ссылок на файл хранится в core.Blob и меняется сигналами
+моделей с полями FileField в этом хранилище (см. core.signals): ссылка
+берется при сохранении строки с новым именем файла и освобождается при
+смене имени или удалении строки. Сохранение файла в хранилище сразу
+берет ссылку заранее (Blob.pending), чтобы файл не удалили до сохранения
+строки; сохранение строки затем забирает эту ссылку, а не берет новую.
+Код, который создает или удаляет строки в обход сигналов (bulk_create,
+_raw_delete), вызывает acquire_files и release_files сам. Файл удаляется
+после фиксации транзакции, в которой освободилась последняя ссылка.
+"""
+import hashlib
+import os
+import tempfile
+import uuid
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F, FileField, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Blob
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище, которое хранит каждое уникальное содержимое один раз.
+    """
+    blob_dir = 'blobs'
+    temp_dir = 'tmp'
+    # Размер блока при чтении файла для вычисления хэша
+    read_size = 64 * 1024
+    # Префикс, с которым считается хэш: у хранилищ с разными префиксами
+    # одинаковое содержимое хранится в разных файлах
+    digest_prefix = b''
+
+    def get_available_name(self, name, max_length=None):
+        # Итоговое имя определяется содержимым, а не именем загрузки
+        return name
+
+    def blob_name(self, digest, name):
+        """Имя файла в хранилище для содержимого с хэшем digest."""
+        extension = os.path.splitext(name)[1].lower()
+        return f'{self.blob_dir}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    def _save(self, name, content):
+        temp_dir = self.path(self.temp_dir)
+        os.makedirs(temp_dir, exist_ok=True)
+        digest = hashlib.sha256(self.digest_prefix)
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=temp_dir, delete=False) as temp_file:
+            try:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+                    size += len(chunk)
+            except BaseException:
+                os.remove(temp_file.name)
+                raise
+        try:
+            return self._store(temp_file.name, digest.hexdigest(), size, name)
+        finally:
+            if os.path.exists(temp_file.name):
+                os.remove(temp_file.name)
+
+    def ingest(self, name):
+        """
+        Регистрирует уже записанный в хранилище файл под именем по его содержимому.
+
+        Файл читается один раз для вычисления хэша, а на место по
+        содержимому переносится его жесткая ссылка, поэтому так можно
+        принять файл, собранный из частей загрузки, без копирования.
+        Исходный файл остается на месте: вызывающий код удаляет его сам,
+        когда транзакция с новой ссылкой на содержимое зафиксирована.
+
+        Returns:
+            str: Имя файла в хранилище.
+        """
+        path = self.path(name)
+        digest = hashlib.sha256(self.digest_prefix)
+        with open(path, 'rb') as stored_file:
+            while chunk := stored_file.read(self.read_size):
+                digest.update(chunk)
+        temp_dir = self.path(self.temp_dir)
+        os.makedirs(temp_dir, exist_ok=True)
+        temp_path = os.path.join(temp_dir, uuid.uuid4().hex)
+        os.link(path, temp_path)
+        try:
+            return self._store(temp_path, digest.hexdigest(), os.path.getsize(path), name)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _store(self, temp_path, digest, size, name):
+        """
+        Регистрирует содержимое и переносит временный файл на его место.
+
+        Под блокировкой строки Blob сразу берется ссылка на файл для
+        строки, которая его сохраняет (Blob.pending), поэтому параллельное
+        удаление последней ссылки не удалит файл, который только что стал
+        нужен снова. При откате транзакции ссылка возвращается вместе с ней.
+        Если такое содержимое уже хранится, временный файл удаляется.
+        """
+        with transaction.atomic():
+            blob, created = Blob.objects.select_for_update().get_or_create(
+                digest=digest,
+                defaults={
+                    'name': self.blob_name(digest, name),
+                    'size': size,
+                    'refcount': 1,
+                    'pending': 1,
+                }
+            )
+            if not created:
+                Blob.objects.filter(pk=blob.pk).update(
+                    refcount=F('refcount') + 1,
+                    pending=F('pending') + 1
+                )
+            path = self.path(blob.name)
+            if os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp_path, path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(path, self.file_permissions_mode)
+        return blob.name
+
+    def acquire(self, names):
+        """
+        Увеличивает счетчики ссылок файлов.
+
+        Ссылки, взятые заранее при сохранении файла (Blob.pending),
+        забираются первыми и счетчик не увеличивают.
+
+        Args:
+            names (iterable): Имена файлов, по одному на каждую новую ссылку.
+        """
+        for name, count in Counter(name for name in names if name).items():
+            # Правые части SET вычисляются по значениям строки до обновления
+            Blob.objects.filter(name=name).update(
+                refcount=F('refcount') + Greatest(Value(count) - F('pending'), Value(0)),
+                pending=Greatest(F('pending') - Value(count), Value(0))
+            )
+
+    def release(self, names):
+        """
+        Уменьшает счетчики ссылок и удаляет файлы без ссылок после фиксации транзакции.
+
+        Имена, которых нет в Blob (например, значение поля по умолчанию),
+        хранилищем не управляются и не удаляются.
+
+        Args:
+            names (iterable): Имена файлов, по одному на каждую освобожденную ссылку.
+        """
+        counts = Counter(name for name in names if name)
+        for name, count in counts.items():
+            Blob.objects.filter(name=name).update(
+                refcount=Greatest(F('refcount') - count, Value(0))
+            )
+        unused = list(
+            Blob.objects.filter(name__in=counts, refcount=0).values_list('name', flat=True)
+        )
+        if unused:
+            transaction.on_commit(lambda: self.purge(unused))
+
+    def purge(self, names):
+        """
+        Удаляет файлы, на которые по-прежнему нет ни одной ссылки.
+
+        Returns:
+            int: Количество удаленных файлов.
+        """
+        purged = 0
+        for name in names:
+            with transaction.atomic():
+                blob = Blob.objects.select_for_update().filter(name=name, refcount=0).first()
+                if blob is None:
+                    continue
+                super().delete(name)
+                blob.delete()
+                purged += 1
+        return purged
+
+    def delete(self, name):
+        """
+        Удаляет только файлы, которыми хранилище не управляет.
+
+        FieldFile.delete() вызывает delete(), пока строка еще ссылается
+        на файл. Файл из Blob удаляется позже, когда обработчик post_save
+        или post_delete освободит последнюю ссылку (см. core.signals).
+        """
+        if name and not Blob.objects.filter(name=name).exists():
+            super().delete(name)
+
+
+class PublicContentAddressedStorage(ContentAddressedStorage):
+    """
+    Хранилище общедоступных файлов (аватаров), которые nginx отдает без проверки доступа.
+
+    Файлы лежат в каталоге public/ того же MEDIA_ROOT (см. PUBLIC_MEDIA_DIRS).
+    Хэш считается с отдельным префиксом, поэтому общедоступный файл
+    никогда не совпадает по имени с защищенным файлом того же содержимого.
+    """
+    blob_dir = 'public/blobs'
+    digest_prefix = b'public:'
+
+
+def is_public_name(name):
+    """Отдается ли файл с таким именем без проверки доступа (PUBLIC_MEDIA_DIRS)."""
+    return name.split('/', 1)[0] in settings.PUBLIC_MEDIA_DIRS
+
+
+def stored_file_fields(model):
+    """Поля FileField модели, которые хранятся в ContentAddressedStorage."""
+    return [
+        field for field in model._meta.concrete_fields
+        if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def acquire_files(field, names):
+    """Берет ссылки на файлы поля для строк, созданных в обход сигналов."""
+    if isinstance(field.storage, ContentAddressedStorage):
+        field.storage.acquire(names)
+
+
+def release_files(field, names):
+    """
+    Освобождает ссылки на файлы поля для строк, удаленных в обход сигналов.
+
+    Returns:
+        bool: True, если хранилище поля считает ссылки и файлы обработаны.
+    """
+    if isinstance(field.storage, ContentAddressedStorage):
+        field.storage.release(names)
+        return True
+    return False
+
+
+def count_references():
+    """
+    Считает ссылки на файлы по всем полям в ContentAddressedStorage.
+
+    Returns:
+        Counter: Количество строк, ссылающихся на каждое имя файла.
+    """
+    references = Counter()
+    for model in apps.get_models():
+        for field in stored_file_fields(model):
+            names = model._base_manager.exclude(**{field.name: ''}).values_list(
+                field.attname, flat=True
+            )
+            references.update(name for name in names.iterator() if name)
+    return references
+
+
+def recount_blobs():
+    """
+    Пересчитывает Blob.refcount по фактическим ссылкам из базы.
+
+    Заранее взятые ссылки, которые не забрала ни одна строка (сохранение
+    строки не удалось вне транзакции или не изменило имя файла строки),
+    при этом сбрасываются.
+
+    Returns:
+        int: Количество исправленных счетчиков.
+    """
+    references = count_references()
+    changed = []
+    for blob in Blob.objects.only('pk', 'name', 'refcount', 'pending').iterator():
+        refcount = references.get(blob.name, 0)
+        if blob.refcount != refcount or blob.pending:
+            blob.refcount = refcount
+            blob.pending = 0
+            changed.append(blob)
+    Blob.objects.bulk_update(changed, ['refcount', 'pending'], batch_size=1000)
+    return len(changed)
+
+
+def collect_blobs(storage, min_age=timedelta(hours=1)):
+    """
+    Удаляет файлы без ссылок и временные файлы прерванных сохранений.
+
+    Файлы моложе min_age не трогаются: их строка могла еще не успеть
+    сохраниться.
+
+    Returns:
+        int: Количество удаленных файлов.
+    """
+    threshold = timezone.now() - min_age
+    purged = storage.purge(list(
+        Blob.objects.filter(refcount=0, created__lt=threshold).values_list('name', flat=True)
+    ))
+    temp_dir = storage.path(storage.temp_dir)
+    if os.path.isdir(temp_dir):
+        for entry in os.scandir(temp_dir):
+            if entry.is_file() and entry.stat().st_mtime < threshold.timestamp():
+                os.remove(entry.path)
+                purged += 1
+    return purged
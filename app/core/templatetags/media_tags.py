@@ -0,0 +1,23 @@
+from django import template
+
+from core.derivatives import get_srcsets
+
+register = template.Library()
+
+
+@register.inclusion_tag('media/responsive_image.html')
+def responsive_image(file, alt='', sizes='100vw', css_class='', url=''):
+    """
+    Выводит изображение с уменьшенными копиями WebP/JPEG в srcset.
+
+    Пока копии не построены, выводится только исходный файл. Защищенные
+    изображения передают url представления с проверкой доступа: копии
+    запрашиваются по нему же с параметрами format и width.
+    """
+    return {
+        'url': url or file.url,
+        'srcsets': get_srcsets(file.name, url),
+        'alt': alt,
+        'sizes': sizes,
+        'css_class': css_class,
+    }
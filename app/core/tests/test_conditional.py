@@ -0,0 +1,49 @@
+import pytest
+from django.contrib.auth.models import User
+
+from account.models import Profile
+from faq.models import Commentary, Post
+
+
+@pytest.fixture
+def post():
+    author = User.objects.create(username='author', password='testpassword')
+    return Post.objects.create(author=author, title='Post', slug='post', body='Body',
+                               status=Post.Status.PUBLISHED)
+
+
+@pytest.mark.django_db
+def test_faq_detail_not_modified(client, post, django_assert_max_num_queries):
+    url = post.get_absolute_url()
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'private' in response['Cache-Control'] and 'no-cache' in response['Cache-Control']
+    etag = response['ETag']
+
+    with django_assert_max_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code == 304
+
+    # Новый комментарий меняет страницу
+    Commentary.objects.create(post=post, author=post.author, body='Comment')
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+
+
+@pytest.mark.django_db
+def test_etag_depends_on_user(client, post):
+    url = post.get_absolute_url()
+    etag = client.get(url)['ETag']
+
+    Profile.objects.create(user=post.author)
+    client.force_login(post.author)
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_missing_page_is_not_found(client, post):
+    url = post.get_absolute_url().replace('post', 'missing')
+    assert client.get(url, HTTP_IF_NONE_MATCH='"anything"').status_code == 404
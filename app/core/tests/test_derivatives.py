@@ -0,0 +1,83 @@
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from PIL import Image as PillowImage
+
+from account.models import Profile
+from core.derivatives import backfill_derivatives
+from core.models import Blob, ImageDerivative
+from core.storage import is_public_name
+from education.models import Image
+
+
+def png_bytes(width, height):
+    buffer = io.BytesIO()
+    PillowImage.new('RGBA', (width, height), (200, 10, 10, 128)).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def owner(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1280)
+    settings.IMAGE_DERIVATIVE_WORKERS = 0
+    return User.objects.create(username='owner', password='testpassword')
+
+
+@pytest.mark.django_db
+def test_derivatives_built_after_commit_and_rendered(owner, tmp_path, django_capture_on_commit_callbacks):
+    image = Image(owner=owner, title='Photo')
+    with django_capture_on_commit_callbacks(execute=True):
+        image.file.save('photo.png', ContentFile(png_bytes(800, 400)))
+
+    derivatives = ImageDerivative.objects.filter(source=image.file.name)
+    assert sorted(derivatives.values_list('format', 'width', 'height')) == [
+        ('jpeg', 320, 160), ('jpeg', 640, 320), ('webp', 320, 160), ('webp', 640, 320)
+    ]
+    for derivative in derivatives:
+        assert (tmp_path / derivative.name).exists()
+
+    html = image.render()
+    assert 'type="image/webp"' in html
+    assert '320w' in html and '640w' in html and '1280w' not in html
+
+    # Копии удаляются вместе с исходным файлом
+    names = list(derivatives.values_list('name', flat=True))
+    with django_capture_on_commit_callbacks(execute=True):
+        image.delete()
+    assert not ImageDerivative.objects.exists()
+    assert not any((tmp_path / name).exists() for name in names)
+
+
+@pytest.mark.django_db
+def test_backfill_derivatives_in_process_pool(owner):
+    # Изображения загружены без построения копий, файла первого нет в хранилище
+    Image.objects.bulk_create([Image(owner=owner, title='Lost', file='images/lost.png')])
+    image = Image(owner=owner, title='Small')
+    image.file.save('small.png', ContentFile(png_bytes(200, 100)))
+
+    assert backfill_derivatives(workers=2) == (2, 2)
+    # Маленькое изображение не увеличивается
+    assert set(ImageDerivative.objects.values_list('source', 'width')) == {(image.file.name, 200)}
+    # Повторный запуск пропускает изображения с готовыми копиями
+    assert backfill_derivatives(workers=2) == (1, 0)
+
+
+@pytest.mark.django_db
+def test_avatar_and_its_derivatives_are_public(owner, django_capture_on_commit_callbacks):
+    data = png_bytes(800, 400)
+    profile = Profile.objects.create(user=owner)
+    image = Image(owner=owner, title='Photo')
+    with django_capture_on_commit_callbacks(execute=True):
+        image.file.save('photo.png', ContentFile(data))
+        profile.avatar.save('avatar.png', ContentFile(data))
+
+    # То же содержимое, что у изображения курса, хранится отдельно
+    assert profile.avatar.name.startswith('public/blobs/')
+    assert not is_public_name(image.file.name)
+    assert Blob.objects.count() == 2
+    derivatives = ImageDerivative.objects.values_list('source', 'name')
+    assert {is_public_name(name) for source, name in derivatives if source == profile.avatar.name} == {True}
+    assert {is_public_name(name) for source, name in derivatives if source == image.file.name} == {False}
@@ -0,0 +1,79 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.db import transaction
+
+from core.models import Blob
+from core.storage import recount_blobs
+from education.models import File
+
+
+@pytest.fixture
+def owner(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return User.objects.create(username='owner', password='testpassword')
+
+
+def upload_file(owner, name, data):
+    item = File(owner=owner, title=name)
+    item.file.save(name, ContentFile(data))
+    return item
+
+
+@pytest.mark.django_db
+def test_identical_uploads_share_one_blob(owner, tmp_path, django_capture_on_commit_callbacks):
+    first = upload_file(owner, 'lecture.pdf', b'same content')
+    second = upload_file(owner, 'lecture-copy.PDF', b'same content')
+    other = upload_file(owner, 'other.pdf', b'other content')
+
+    assert first.file.name == second.file.name
+    assert first.file.name.startswith('blobs/') and first.file.name.endswith('.pdf')
+    assert other.file.name != first.file.name
+    assert Blob.objects.get(name=first.file.name).refcount == 2
+    assert len([path for path in tmp_path.joinpath('blobs').rglob('*') if path.is_file()]) == 2
+
+    # Файл удаляется только вместе с последней ссылкой
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert (tmp_path / second.file.name).exists()
+    with django_capture_on_commit_callbacks(execute=True):
+        second.delete()
+    assert not (tmp_path / second.file.name).exists()
+    assert not Blob.objects.filter(name=second.file.name).exists()
+
+    # Замена файла освобождает ссылку на прежний
+    old_name = other.file.name
+    with django_capture_on_commit_callbacks(execute=True):
+        other.file.save('new.pdf', ContentFile(b'new content'))
+    assert not (tmp_path / old_name).exists()
+    assert Blob.objects.get(name=other.file.name).refcount == 1
+
+
+@pytest.mark.django_db
+def test_recount_blobs_restores_refcounts(owner):
+    item = upload_file(owner, 'lecture.pdf', b'content')
+    File.objects.bulk_create([File(owner=owner, title='Copy', file=item.file.name)])
+    assert Blob.objects.get().refcount == 1
+
+    assert recount_blobs() == 1
+    assert Blob.objects.get().refcount == 2
+
+
+@pytest.mark.django_db
+def test_stored_file_survives_purge_before_row_save(owner, tmp_path):
+    storage = File._meta.get_field('file').storage
+    name = storage.save('lecture.pdf', ContentFile(b'content'))
+    # Ссылка взята при сохранении файла, удаление файлов без ссылок его не трогает
+    assert storage.purge([name]) == 0
+    assert (tmp_path / name).exists()
+
+    File.objects.create(owner=owner, title='Lecture', file=name)
+    blob = Blob.objects.get(name=name)
+    assert (blob.refcount, blob.pending) == (1, 0)
+
+    # Сохранение, откаченное вместе с транзакцией, ссылку не оставляет
+    with pytest.raises(RuntimeError), transaction.atomic():
+        storage.save('copy.pdf', ContentFile(b'content'))
+        raise RuntimeError
+    blob.refresh_from_db()
+    assert (blob.refcount, blob.pending) == (1, 0)
@@ -1,6 +1,15 @@
+import io
+
 from django.contrib import admin
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 
-from education.models import Subject, Course, Module
+from education.forms import EnrollmentCSVForm
+from education.models import Subject, Course, Enrollment, Module
+from education.service.cloning import clone_course
+from education.service.deletion import delete_course
+from education.service.enrollment import enroll_from_csv
 
 
 @admin.register(Subject)
@@ -12,6 +21,20 @@ class SubjectAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title',)}
 
 
+@admin.register(Enrollment)
+class EnrollmentAdmin(admin.ModelAdmin):
+    """
+    Административная панель для модели Enrollment.
+    """
+    list_display = ['user', 'course', 'enrolled_at', 'last_accessed']
+    list_filter = ['course']
+    list_select_related = ['user', 'course']
+    date_hierarchy = 'enrolled_at'
+    search_fields = ['user__username', 'user__email']
+    raw_id_fields = ['user', 'course']
+    ordering = ['-enrolled_at']
+
+
 class ModuleInline(admin.StackedInline):
     """
     Встроенная административная панель для модели Module.
@@ -29,3 +52,65 @@ class CourseAdmin(admin.ModelAdmin):
     search_fields = ['title', 'overview']
     prepopulated_fields = {'slug': ('title',)}
     inlines = [ModuleInline]
+    actions = ['clone_courses', 'enroll_students_from_csv']
+
+    def delete_model(self, request, obj):
+        """Удаляет курс вместе с контентом и файлами контента."""
+        delete_course(obj)
+
+    def delete_queryset(self, request, queryset):
+        """Удаляет выбранные курсы вместе с контентом и файлами контента."""
+        for course in queryset:
+            delete_course(course)
+
+    @admin.action(description='Скопировать выбранные курсы')
+    def clone_courses(self, request, queryset):
+        """Создает копии выбранных курсов от имени текущего пользователя."""
+        for course in queryset:
+            clone_course(course, new_owner=request.user)
+        self.message_user(request, f'Скопировано курсов: {len(queryset)}')
+
+    @admin.action(description='Записать студентов из CSV на выбранные курсы')
+    def enroll_students_from_csv(self, request, queryset):
+        """Открывает форму загрузки CSV с отмеченными курсами."""
+        ids = ','.join(str(pk) for pk in queryset.values_list('pk', flat=True))
+        return redirect(f"{reverse('admin:education_course_enroll_csv')}?ids={ids}")
+
+    def get_urls(self):
+        return [
+            path('enroll-csv/',
+                 self.admin_site.admin_view(self.enroll_csv_view),
+                 name='education_course_enroll_csv'),
+        ] + super().get_urls()
+
+    def enroll_csv_view(self, request):
+        """
+        Массовая запись студентов на курсы из загруженного CSV-файла.
+        """
+        if not self.has_change_permission(request):
+            return redirect('admin:index')
+        if request.method == 'POST':
+            form = EnrollmentCSVForm(request.POST, request.FILES)
+            if form.is_valid():
+                stream = io.TextIOWrapper(form.cleaned_data['csv_file'].file, encoding='utf-8-sig')
+                counts = enroll_from_csv(stream, form.cleaned_data['courses'])
+                self.message_user(
+                    request,
+                    f"Записано: {counts['added']}, уже были записаны: {counts['already_enrolled']}, "
+                    f"неизвестных пользователей: {counts['unknown_users']}, "
+                    f"неизвестных курсов: {counts['unknown_courses']}"
+                )
+                return redirect('admin:education_course_changelist')
+        else:
+            ids = [pk for pk in request.GET.get('ids', '').split(',') if pk.isdigit()]
+            form = EnrollmentCSVForm(initial={'courses': ids})
+        return TemplateResponse(
+            request,
+            'admin/education/course/enroll_csv.html',
+            {
+                **self.admin_site.each_context(request),
+                'opts': self.model._meta,
+                'title': 'Запись студентов из CSV',
+                'form': form,
+            }
+        )
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class EducationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'education'
+
+    def ready(self):
+        # Регистрация обработчиков сигналов
+        from . import signals  # noqa: F401
+
+        # Модели и формы встроенных типов контента
+        from .models import File, Image, Text, Video
+        from .service.content_registry import content_registry
+        for model in (Text, Video, Image, File):
+            content_registry.register(model)
@@ -1,12 +1,107 @@
 from django import forms
-from django.forms.models import inlineformset_factory
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.forms.models import BaseInlineFormSet, inlineformset_factory
 
 from .models import Course, Module
+from .service.search import schedule_search_update
+from .service.utils import batched
+
+# Размер пачки UPDATE/INSERT/DELETE при сохранении модулей
+MODULE_BATCH_SIZE = 200
+
+
+class LoadedObjectField(forms.ModelChoiceField):
+    """
+    Поле идентификатора формы набора, которое ищет объект среди объектов,
+    уже загруженных набором форм, а не отдельным запросом на каждую форму.
+    """
+
+    def __init__(self, lookup, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lookup = lookup
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        obj = self.lookup(value)
+        if obj is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value}
+            )
+        return obj
+
+
+class BaseModuleFormSet(BaseInlineFormSet):
+    """
+    Набор форм модулей курса, который сохраняет только измененные формы.
+
+    Набор строится по части модулей курса (окну), а save_bulk() записывает
+    изменения пачками: bulk_update для измененных модулей, bulk_create для
+    новых и DELETE по списку для удаляемых. Формы, которые пользователь не
+    менял, в запись не попадают.
+    """
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        field = form.fields[self._pk_field.name]
+        form.fields[self._pk_field.name] = LoadedObjectField(
+            self._loaded_object,
+            queryset=field.queryset,
+            initial=field.initial,
+            required=False,
+            widget=field.widget
+        )
+
+    def _loaded_object(self, value):
+        """Модуль набора форм по идентификатору из данных формы."""
+        try:
+            return self._existing_object(self._pk_field.to_python(value))
+        except ValidationError:
+            return None
+
+    def save_bulk(self):
+        """
+        Сохраняет изменения набора форм в одной транзакции.
+
+        Returns:
+            dict: Количество измененных ('updated'), созданных ('created')
+             и удаленных ('deleted') модулей.
+        """
+        changed, created, deleted = [], [], []
+        for form in self.initial_forms:
+            if form.instance.pk is None:
+                # Как и в save_existing_objects(), формы без модуля набора пропускаются:
+                # удаляемая форма не проверяется и может прийти с чужим или пустым id
+                continue
+            if self.can_delete and self._should_delete_form(form):
+                deleted.append(form.instance.pk)
+            elif form.has_changed():
+                changed.append(form.instance)
+        for form in self.extra_forms:
+            if form.has_changed() and not (self.can_delete and self._should_delete_form(form)):
+                form.instance.course = self.instance
+                created.append(form.instance)
+
+        with transaction.atomic():
+            Module.objects.bulk_update(changed, self.form._meta.fields, batch_size=MODULE_BATCH_SIZE)
+            Module.objects.bulk_create(created, batch_size=MODULE_BATCH_SIZE)
+            for batch in batched(deleted, MODULE_BATCH_SIZE):
+                # Удаление через QuerySet: каскад на контент и сигналы счетчиков
+                Module.objects.filter(course=self.instance, pk__in=batch).delete()
+            if changed or created:
+                # bulk_update и bulk_create не отправляют post_save
+                schedule_search_update(self.instance.pk)
+        return {'updated': len(changed), 'created': len(created), 'deleted': len(deleted)}
+
 
 # Создаем модельный набор форм для объектов Module, связанных с объектом Course
 ModuleFormSet = inlineformset_factory(
     Course,
     Module,
+    formset=BaseModuleFormSet,
     # Поля, которые будут включены в каждую форму набора форм
     fields=[
         'title',
@@ -17,3 +112,28 @@ ModuleFormSet = inlineformset_factory(
     # Добавим возможность удаления модуля
     can_delete=True
 )
+
+
+class CourseSearchForm(forms.Form):
+    """
+    Форма полнотекстового поиска по курсам.
+    """
+    query = forms.CharField(
+        max_length=200,
+        label='Поиск по курсам'
+    )
+
+
+class EnrollmentCSVForm(forms.Form):
+    """
+    Форма массовой записи студентов из CSV-файла.
+    """
+    csv_file = forms.FileField(
+        label='CSV-файл',
+        help_text='Колонки: username или email и, при необходимости, course (слаг или ИД курса)'
+    )
+    courses = forms.ModelMultipleChoiceField(
+        queryset=Course.objects.all(),
+        required=False,
+        label='Курсы для строк без колонки course'
+    )
@@ -0,0 +1,55 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from education.models import Course
+from education.service.enrollment import enroll_from_csv
+
+
+class Command(BaseCommand):
+    """
+    Записывает студентов на курсы по CSV-файлу.
+
+    Файл содержит колонку username или email и, при необходимости,
+    колонку course (слаг или ИД курса). Для файлов без колонки course
+    курсы задаются параметром --course.
+    """
+    help = 'Массово записывает студентов на курсы из CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input',
+            help="Путь к CSV-файлу или '-' для чтения из stdin"
+        )
+        parser.add_argument(
+            '--course',
+            action='append',
+            default=[],
+            help='Слаг курса для всех строк файла (можно указать несколько раз)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество строк, записываемых за раз'
+        )
+
+    def handle(self, *args, **options):
+        courses = list(Course.objects.filter(slug__in=options['course']))
+        missing = set(options['course']) - {course.slug for course in courses}
+        if missing:
+            raise CommandError(f'Курсы не найдены: {", ".join(sorted(missing))}')
+
+        if options['input'] == '-':
+            counts = enroll_from_csv(sys.stdin, courses, options['batch_size'])
+        else:
+            with open(options['input'], encoding='utf-8-sig', newline='') as stream:
+                counts = enroll_from_csv(stream, courses, options['batch_size'])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Записано: {counts['added']}, уже были записаны: {counts['already_enrolled']}, "
+                f"неизвестных пользователей: {counts['unknown_users']}, "
+                f"неизвестных курсов: {counts['unknown_courses']}"
+            )
+        )
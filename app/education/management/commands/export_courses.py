@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from education.models import Course
+from education.service.transfer import export_courses
+
+
+class Command(BaseCommand):
+    """
+    Экспортирует курсы в NDJSON: Subject -> Course -> Module -> Content.
+
+    Пример:
+        python manage.py export_courses --subject python -o courses.ndjson
+    """
+    help = 'Потоковый экспорт курсов в формате NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-o', '--output', help='Файл для записи (по умолчанию stdout)')
+        parser.add_argument('--course', action='append', default=[],
+                            help='Слаг экспортируемого курса (можно указать несколько раз)')
+        parser.add_argument('--subject', action='append', default=[],
+                            help='Слаг субъекта, курсы которого экспортируются')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Размер порции чтения из базы')
+
+    def handle(self, *args, **options):
+        courses = Course.objects.all()
+        if options['course']:
+            courses = courses.filter(slug__in=options['course'])
+        if options['subject']:
+            courses = courses.filter(subject__slug__in=options['subject'])
+
+        started = time.monotonic()
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as stream:
+                counts = export_courses(stream, courses, options['chunk_size'])
+        else:
+            counts = export_courses(self.stdout, courses, options['chunk_size'])
+        elapsed = time.monotonic() - started
+
+        rows = sum(counts.values())
+        # Статистика пишется в stderr, чтобы не смешиваться с данными в stdout
+        self.stderr.write(
+            f'Экспортировано строк: {rows} ({counts}) за {elapsed:.2f} с, '
+            f'{rows / elapsed if elapsed else rows:.0f} строк/с'
+        )
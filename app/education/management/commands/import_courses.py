@@ -0,0 +1,53 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from education.service.transfer import CourseImporter
+
+
+class Command(BaseCommand):
+    """
+    Импортирует курсы из NDJSON, созданного командой export_courses.
+
+    Субъекты и курсы сопоставляются по слагу: повторный импорт того же
+    файла не создает дубликатов.
+
+    Пример:
+        python manage.py import_courses courses.ndjson --default-owner admin
+    """
+    help = 'Потоковый импорт курсов из NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='Файл NDJSON или "-" для stdin')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Размер пачки bulk_create')
+        parser.add_argument('--default-owner',
+                            help='Пользователь-автор для записей с неизвестным автором')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        default_owner = None
+        if options['default_owner']:
+            try:
+                default_owner = User.objects.get(username=options['default_owner'])
+            except User.DoesNotExist:
+                raise CommandError(f'Пользователь {options["default_owner"]} не найден')
+
+        importer = CourseImporter(options['batch_size'], default_owner)
+        try:
+            if options['input'] == '-':
+                result = importer.import_stream(sys.stdin)
+            else:
+                with open(options['input'], encoding='utf-8') as stream:
+                    result = importer.import_stream(stream)
+        except (KeyError, ValueError) as error:
+            raise CommandError(f'Ошибка импорта: {error}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: субъектов - {result["subject"]}, курсов - {result["course"]}, '
+            f'модулей - {result["module"]}, контента - {result["content"]}; '
+            f'пропущено - {result["skipped"]}. '
+            f'Строк: {result["rows"]} за {result["seconds"]:.2f} с '
+            f'({result["rows_per_second"]:.0f} строк/с)'
+        ))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from education.service.counters import recompute_all_counters
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает денормализованные счетчики каталога курсов.
+
+    Используется для восстановления значений Subject.total_courses,
+    Course.total_modules и Course.total_students после массовых
+    операций в обход сигналов.
+    """
+    help = 'Пересчитывает счетчики курсов, модулей и участников'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            subjects, courses = recompute_all_counters()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Пересчитаны счетчики: субъектов - {subjects}, курсов - {courses}'
+            )
+        )
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from education.models import Video
+from education.service.video_embeds import refresh_videos
+
+
+class Command(BaseCommand):
+    """
+    Обновляет сохраненные метаданные встраивания видео.
+
+    По умолчанию обрабатываются видео без метаданных и видео,
+    метаданные которых старше --older-than дней.
+    """
+    help = 'Обновляет провайдера, ссылку для встраивания, превью и длительность видео'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Обновить все видео'
+        )
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=30,
+            help='Обновлять метаданные старше указанного количества дней'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Количество параллельных запросов к провайдерам'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Размер пачки сохранения'
+        )
+
+    def handle(self, *args, **options):
+        videos = Video.objects.order_by('pk')
+        if not options['all']:
+            threshold = timezone.now() - timedelta(days=options['older_than'])
+            videos = videos.filter(
+                Q(embed_resolved__isnull=True) | Q(embed_resolved__lt=threshold)
+            )
+        refreshed = refresh_videos(
+            videos,
+            workers=options['workers'],
+            batch_size=options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(f'Обновлено видео: {refreshed}'))
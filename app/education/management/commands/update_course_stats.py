@@ -0,0 +1,50 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from education.service.analytics import backfill_stats, update_stats
+
+
+class Command(BaseCommand):
+    """
+    Обновляет дневную статистику курсов и модулей.
+
+    Без аргументов учитывает данные, появившиеся после сохраненной
+    отметки (запускается периодически). С --backfill пересчитывает
+    статистику за прошедшие дни по частям и ставит отметку.
+    """
+    help = 'Обновляет дневную статистику курсов и модулей'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Пересчитать статистику за прошедшие дни'
+        )
+        parser.add_argument(
+            '--since',
+            type=date.fromisoformat,
+            help='Первый день пересчета (ГГГГ-ММ-ДД), по умолчанию день самых ранних данных'
+        )
+        parser.add_argument(
+            '--chunk-days',
+            type=int,
+            default=30,
+            help='Количество дней, пересчитываемых в одной транзакции'
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill']:
+            if options['chunk_days'] < 1:
+                raise CommandError('--chunk-days должен быть положительным')
+            chunks = backfill_stats(options['since'], options['chunk_days'])
+            self.stdout.write(self.style.SUCCESS(f'Пересчитано частей: {chunks}'))
+            return
+
+        courses = update_stats()
+        if courses is None:
+            raise CommandError(
+                'Отметка статистики не найдена или обновление уже выполняется; '
+                'для первого запуска используйте --backfill'
+            )
+        self.stdout.write(self.style.SUCCESS(f'Обновлена статистика курсов: {courses}'))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:46
+
+from django.db import migrations, models
+
+
+def renumber_duplicate_orders(apps, schema_editor):
+    """
+    Перенумеровывает группы, в которых уже есть повторяющиеся порядковые номера.
+
+    Порядок внутри группы сохраняется по (order, id).
+    """
+    for model_name, parent_field in (('Module', 'course_id'), ('Content', 'module_id')):
+        model = apps.get_model('education', model_name)
+        duplicated_parents = (
+            model.objects.order_by()
+            .values(parent_field)
+            .annotate(
+                total=models.Count('id'),
+                distinct_orders=models.Count('order', distinct=True)
+            )
+            .filter(total__gt=models.F('distinct_orders'))
+            .values_list(parent_field, flat=True)
+        )
+        for parent_id in duplicated_parents:
+            objs = list(
+                model.objects.filter(**{parent_field: parent_id}).order_by('order', 'id')
+            )
+            for order, obj in enumerate(objs):
+                obj.order = order
+            model.objects.bulk_update(objs, ['order'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0004_rename_account_course_students'),
+    ]
+
+    operations = [
+        migrations.RunPython(renumber_duplicate_orders, migrations.RunPython.noop),
+    ]
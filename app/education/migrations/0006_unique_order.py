@@ -0,0 +1,22 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:46
+
+from django.db import migrations, models
+import django.db.models.constraints
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0005_renumber_duplicate_orders'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='content',
+            constraint=models.UniqueConstraint(deferrable=django.db.models.constraints.Deferrable['DEFERRED'], fields=('module', 'order'), name='education_content_unique_order'),
+        ),
+        migrations.AddConstraint(
+            model_name='module',
+            constraint=models.UniqueConstraint(deferrable=django.db.models.constraints.Deferrable['DEFERRED'], fields=('course', 'order'), name='education_module_unique_order'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:49
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field):
+    counts = (
+        queryset.filter(**{field: models.OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=models.Count('*'))
+        .values('total')
+    )
+    return Coalesce(models.Subquery(counts), models.Value(0), output_field=models.IntegerField())
+
+
+def fill_counters(apps, schema_editor):
+    """
+    Заполняет счетчики для уже существующих субъектов и курсов.
+    """
+    Subject = apps.get_model('education', 'Subject')
+    Course = apps.get_model('education', 'Course')
+    Module = apps.get_model('education', 'Module')
+    Subject.objects.update(total_courses=count_subquery(Course.objects.all(), 'subject'))
+    Course.objects.update(
+        total_modules=count_subquery(Module.objects.all(), 'course'),
+        total_students=count_subquery(Course.students.through.objects.all(), 'course')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0006_unique_order'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='total_modules',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество модулей'),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='total_students',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество участников'),
+        ),
+        migrations.AddField(
+            model_name='subject',
+            name='total_courses',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество курсов'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:52
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def joined_text(queryset, field):
+    return Coalesce(
+        models.Subquery(
+            queryset.order_by()
+            .annotate(joined=StringAgg(field, delimiter=' '))
+            .values('joined')[:1]
+        ),
+        models.Value(''),
+        output_field=models.TextField()
+    )
+
+
+def fill_search_vectors(apps, schema_editor):
+    """
+    Заполняет поисковые векторы уже существующих курсов.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Course = apps.get_model('education', 'Course')
+    Module = apps.get_model('education', 'Module')
+    Content = apps.get_model('education', 'Content')
+    Text = apps.get_model('education', 'Text')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+
+    modules = Module.objects.filter(course=models.OuterRef('pk')).values('course')
+    text_ids = Content.objects.filter(
+        module__course=models.OuterRef(models.OuterRef('pk')),
+        content_type__in=ContentType.objects.filter(app_label='education', model='text')
+    ).values('object_id')
+    texts = Text.objects.filter(pk__in=models.Subquery(text_ids)).annotate(
+        group=models.Value(1)
+    ).values('group')
+    Course.objects.update(
+        search_vector=(
+            SearchVector('title', weight='A', config='russian')
+            + SearchVector('overview', weight='B', config='russian')
+            + SearchVector(joined_text(modules, 'title'), weight='C', config='russian')
+            + SearchVector(joined_text(texts, 'content'), weight='D', config='russian')
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0008_course_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Поисковый вектор курса'),
+        ),
+        migrations.AddIndex(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='education_course_search_idx'),
+        ),
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('education', '0009_course_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Upload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('model_name', models.CharField(choices=[('file', 'Файл'), ('image', 'Изображение')], max_length=10, verbose_name='Тип контента')),
+                ('title', models.CharField(max_length=250, verbose_name='Заголовок')),
+                ('file_name', models.CharField(max_length=255, verbose_name='Имя файла в хранилище')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Размер файла в байтах')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Принято байт')),
+                ('status', models.CharField(choices=[('AC', 'Загружается'), ('CM', 'Завершена')], default='AC', max_length=2, verbose_name='Статус загрузки')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата начала загрузки')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Дата приема последней части')),
+                ('content', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload', to='education.content', verbose_name='Созданный контент')),
+                ('module', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='education.module', verbose_name='Модуль для загружаемого контента')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+            ],
+            options={
+                'verbose_name': 'Загрузка',
+                'verbose_name_plural': 'Загрузки',
+                'ordering': ['-created'],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0010_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='duration',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Длительность в секундах'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='embed_resolved',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Дата определения метаданных'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='embed_url',
+            field=models.URLField(blank=True, editable=False, max_length=500, verbose_name='Ссылка для встраивания'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='provider',
+            field=models.CharField(blank=True, editable=False, max_length=50, verbose_name='Видеохостинг'),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='thumbnail_url',
+            field=models.URLField(blank=True, editable=False, max_length=500, verbose_name='Ссылка на превью'),
+        ),
+    ]
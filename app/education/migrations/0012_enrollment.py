@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    """
+    Промежуточная таблица Course.students становится моделью Enrollment.
+
+    Существующая таблица education_course_students не пересоздается:
+    модель сначала описывается поверх нее только в состоянии миграций,
+    затем к таблице добавляются поля, индексы и новое имя.
+    """
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('education', '0011_video_embed_metadata'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Enrollment',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='education.course', verbose_name='Курс')),
+                        ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to=settings.AUTH_USER_MODEL, verbose_name='Студент')),
+                    ],
+                    options={
+                        'db_table': 'education_course_students',
+                        'unique_together': {('course', 'user')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='course',
+                    name='students',
+                    field=models.ManyToManyField(blank=True, related_name='courses_joined', through='education.Enrollment', to=settings.AUTH_USER_MODEL, verbose_name='Участники курса'),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='enrolled_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата записи на курс'),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='last_accessed',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Дата последнего посещения курса'),
+        ),
+        migrations.AlterModelTable(
+            name='enrollment',
+            table=None,
+        ),
+        migrations.AlterModelOptions(
+            name='enrollment',
+            options={'verbose_name': 'Запись на курс', 'verbose_name_plural': 'Записи на курсы'},
+        ),
+        # Индексы по одному полю и ограничение (course, user) заменяются составными
+        migrations.AddConstraint(
+            model_name='enrollment',
+            constraint=models.UniqueConstraint(fields=('user', 'course'), name='education_enrollment_user_course'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['course', 'enrolled_at'], name='education_enrollment_date_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='enrollment',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='enrollment',
+            name='course',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to='education.course', verbose_name='Курс'),
+        ),
+        migrations.AlterField(
+            model_name='enrollment',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='enrollments', to=settings.AUTH_USER_MODEL, verbose_name='Студент'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:15
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('education', '0012_enrollment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Progress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_viewed', models.DateTimeField(verbose_name='Дата первого просмотра')),
+                ('last_viewed', models.DateTimeField(verbose_name='Дата последнего просмотра')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Количество просмотров')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата завершения')),
+                ('updated', models.DateTimeField(verbose_name='Дата записи')),
+                ('content', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='education.content', verbose_name='Контент')),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='progress', to=settings.AUTH_USER_MODEL, verbose_name='Студент')),
+            ],
+            options={
+                'verbose_name': 'Прогресс по контенту',
+                'verbose_name_plural': 'Прогресс по контенту',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='progress',
+            constraint=models.UniqueConstraint(fields=('user', 'content'), name='education_progress_user_content'),
+        ),
+    ]
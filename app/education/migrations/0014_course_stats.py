@@ -0,0 +1,102 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('education', '0013_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='День')),
+            ],
+            options={
+                'verbose_name': 'Активность студента',
+                'verbose_name_plural': 'Активность студентов',
+            },
+        ),
+        migrations.CreateModel(
+            name='CourseDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='День')),
+                ('enrollments', models.PositiveIntegerField(default=0, verbose_name='Новых записей на курс')),
+                ('active_students', models.PositiveIntegerField(default=0, verbose_name='Активных студентов')),
+            ],
+            options={
+                'verbose_name': 'Статистика курса за день',
+                'verbose_name_plural': 'Статистика курсов по дням',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ModuleDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='День')),
+                ('completions', models.PositiveIntegerField(default=0, verbose_name='Завершений контента')),
+            ],
+            options={
+                'verbose_name': 'Статистика модуля за день',
+                'verbose_name_plural': 'Статистика модулей по дням',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatsWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Имя')),
+                ('value', models.DateTimeField(verbose_name='Учтено до')),
+            ],
+            options={
+                'verbose_name': 'Отметка статистики',
+                'verbose_name_plural': 'Отметки статистики',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='progress',
+            index=models.Index(fields=['updated'], name='education_progress_upd_idx'),
+        ),
+        migrations.AddField(
+            model_name='moduledailystats',
+            name='module',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='education.module', verbose_name='Модуль'),
+        ),
+        migrations.AddField(
+            model_name='coursedailystats',
+            name='course',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='education.course', verbose_name='Курс'),
+        ),
+        migrations.AddField(
+            model_name='courseactivity',
+            name='course',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='education.course', verbose_name='Курс'),
+        ),
+        migrations.AddField(
+            model_name='courseactivity',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Студент'),
+        ),
+        migrations.AddConstraint(
+            model_name='moduledailystats',
+            constraint=models.UniqueConstraint(fields=('module', 'date'), name='education_module_stats_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='coursedailystats',
+            constraint=models.UniqueConstraint(fields=('course', 'date'), name='education_course_stats_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='courseactivity',
+            constraint=models.UniqueConstraint(fields=('course', 'date', 'user'), name='education_activity_unique'),
+        ),
+    ]
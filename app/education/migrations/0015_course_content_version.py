@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('education', '0014_course_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='content_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия содержимого курса'),
+        ),
+    ]
@@ -1,10 +1,19 @@
+import uuid
+
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.template.loader import render_to_string
 
 from .service.fields import OrderField
+from .service.querysets import (
+    ContentItemQuerySet, ContentQuerySet, CourseManager, ModuleQuerySet
+)
+from .service.render_cache import render_item
 
 
 class Subject(models.Model):
@@ -20,6 +29,11 @@ class Subject(models.Model):
         unique=True,
         verbose_name='Уникальное имя субъекта (Slug)',
     )
+    total_courses = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество курсов'
+    )
 
     class Meta:
         app_label = 'education'
@@ -65,19 +79,111 @@ class Course(models.Model):
     )
     students = models.ManyToManyField(
         User,
+        through='Enrollment',
         related_name='courses_joined',
         verbose_name='Участники курса',
         blank=True
     )
+    total_modules = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество модулей'
+    )
+    total_students = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество участников'
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name='Поисковый вектор курса'
+    )
+    content_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Версия содержимого курса'
+    )
+
+    objects = CourseManager()
 
     class Meta:
         ordering = ['-created']
+        indexes = [
+            # Курсорная пагинация каталога по (-created, id)
+            models.Index(fields=['-created', '-id'], name='education_course_created_idx'),
+            models.Index(fields=['subject', '-created', '-id'], name='education_course_subj_idx'),
+            # Полнотекстовый поиск по курсам
+            GinIndex(fields=['search_vector'], name='education_course_search_idx'),
+        ]
         verbose_name = 'Курс'
         verbose_name_plural = 'Курсы'
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет курс, не перезаписывая content_version.
+
+        Версия меняется только атомарными UPDATE (education.service.versions),
+        а значение, прочитанное вместе с курсом, к моменту сохранения могло
+        устареть - его запись вернула бы версию назад.
+        """
+        full_update = not (self._state.adding or args or kwargs.get('force_insert'))
+        if full_update and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'content_version'
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+class Enrollment(models.Model):
+    """
+    Запись студента на курс (промежуточная модель Course.students).
+    """
+    course = models.ForeignKey(
+        Course,
+        related_name='enrollments',
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Курс'
+    )
+    user = models.ForeignKey(
+        User,
+        related_name='enrollments',
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Студент'
+    )
+    enrolled_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Дата записи на курс'
+    )
+    last_accessed = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата последнего посещения курса'
+    )
+
+    class Meta:
+        constraints = [
+            # Курсы студента (личный кабинет); заменяет индекс по user_id
+            models.UniqueConstraint(fields=['user', 'course'], name='education_enrollment_user_course'),
+        ]
+        indexes = [
+            # Участники курса по дате записи; заменяет индекс по course_id
+            models.Index(fields=['course', 'enrolled_at'], name='education_enrollment_date_idx'),
+        ]
+        verbose_name = 'Запись на курс'
+        verbose_name_plural = 'Записи на курсы'
+
+    def __str__(self):
+        return f'{self.user} - {self.course}'
+
 
 class Module(models.Model):
     """
@@ -103,8 +209,18 @@ class Module(models.Model):
         verbose_name='Порядковый номер модуля в курсе'
     )
 
+    objects = ModuleQuerySet.as_manager()
+
     class Meta:
         ordering = ['order']
+        constraints = [
+            # Отложенная проверка позволяет переставлять модули в одной транзакции
+            models.UniqueConstraint(
+                fields=['course', 'order'],
+                name='education_module_unique_order',
+                deferrable=models.Deferrable.DEFERRED
+            ),
+        ]
         verbose_name = 'Модуль'
         verbose_name_plural = 'Модули'
 
@@ -152,8 +268,18 @@ class Content(models.Model):
         verbose_name='Порядковый номер контента в модуле'
     )
 
+    objects = ContentQuerySet.as_manager()
+
     class Meta:
         ordering = ['order']
+        constraints = [
+            # Отложенная проверка позволяет переставлять контент в одной транзакции
+            models.UniqueConstraint(
+                fields=['module', 'order'],
+                name='education_content_unique_order',
+                deferrable=models.Deferrable.DEFERRED
+            ),
+        ]
         verbose_name = 'Контент'
         verbose_name_plural = 'Контент'
 
@@ -185,6 +311,8 @@ class ContentBase(models.Model):
         verbose_name='Дата изменения'
     )
 
+    objects = ContentItemQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
@@ -192,6 +320,13 @@ class ContentBase(models.Model):
         return self.title
 
     def render(self):
+        """
+        Возвращает прорисованное содержимое из кэша,
+        при промахе прорисовывает шаблон и сохраняет результат.
+        """
+        return render_item(self)
+
+    def render_template(self):
         """
         Прорисовывает шаблон и возвращает прорисованное содержимое
         в виде строкового литерала.
@@ -216,3 +351,303 @@ class Image(ContentBase):
 
 class Video(ContentBase):
     url = models.URLField()
+    # Метаданные встраивания, определяемые при сохранении
+    # (education.service.video_embeds), чтобы не обращаться к провайдеру при показе
+    provider = models.CharField(
+        max_length=50,
+        blank=True,
+        editable=False,
+        verbose_name='Видеохостинг'
+    )
+    embed_url = models.URLField(
+        max_length=500,
+        blank=True,
+        editable=False,
+        verbose_name='Ссылка для встраивания'
+    )
+    thumbnail_url = models.URLField(
+        max_length=500,
+        blank=True,
+        editable=False,
+        verbose_name='Ссылка на превью'
+    )
+    duration = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Длительность в секундах'
+    )
+    embed_resolved = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Дата определения метаданных'
+    )
+
+    @property
+    def duration_display(self):
+        """
+        Длительность видео в виде Ч:ММ:СС или М:СС.
+        """
+        if self.duration is None:
+            return ''
+        minutes, seconds = divmod(self.duration, 60)
+        hours, minutes = divmod(minutes, 60)
+        if hours:
+            return f'{hours}:{minutes:02}:{seconds:02}'
+        return f'{minutes}:{seconds:02}'
+
+
+class Upload(models.Model):
+    """
+    Возобновляемая загрузка файла по частям для контента File или Image.
+
+    Части дописываются прямо в итоговый файл хранилища, поле offset
+    хранит количество уже принятых байт. После приема последней части
+    файл привязывается к новому объекту File/Image и записи Content.
+    """
+
+    class Status(models.TextChoices):
+        """ Определение вариантов статусов загрузки """
+        ACTIVE = 'AC', 'Загружается'
+        COMPLETE = 'CM', 'Завершена'
+
+    class ModelName(models.TextChoices):
+        """ Модели контента, поддерживающие загрузку по частям """
+        FILE = 'file', 'Файл'
+        IMAGE = 'image', 'Изображение'
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    owner = models.ForeignKey(
+        User,
+        related_name='uploads',
+        on_delete=models.CASCADE,
+        verbose_name='Автор'
+    )
+    module = models.ForeignKey(
+        Module,
+        related_name='uploads',
+        on_delete=models.CASCADE,
+        verbose_name='Модуль для загружаемого контента'
+    )
+    model_name = models.CharField(
+        max_length=10,
+        choices=ModelName.choices,
+        verbose_name='Тип контента'
+    )
+    title = models.CharField(
+        max_length=250,
+        verbose_name='Заголовок'
+    )
+    file_name = models.CharField(
+        max_length=255,
+        verbose_name='Имя файла в хранилище'
+    )
+    size = models.PositiveBigIntegerField(
+        verbose_name='Размер файла в байтах'
+    )
+    offset = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Принято байт'
+    )
+    status = models.CharField(
+        max_length=2,
+        choices=Status.choices,
+        default=Status.ACTIVE,
+        verbose_name='Статус загрузки'
+    )
+    content = models.OneToOneField(
+        Content,
+        related_name='upload',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name='Созданный контент'
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата начала загрузки'
+    )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата приема последней части'
+    )
+
+    class Meta:
+        ordering = ['-created']
+        verbose_name = 'Загрузка'
+        verbose_name_plural = 'Загрузки'
+
+    def __str__(self):
+        return f'{self.title} ({self.offset}/{self.size})'
+
+
+class Progress(models.Model):
+    """
+    Прогресс студента по объекту контента: просмотры и завершение.
+
+    Строки пишутся пачками из буфера событий (education.service.progress).
+    """
+    user = models.ForeignKey(
+        User,
+        related_name='progress',
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Студент'
+    )
+    content = models.ForeignKey(
+        Content,
+        related_name='progress',
+        on_delete=models.CASCADE,
+        verbose_name='Контент'
+    )
+    first_viewed = models.DateTimeField(
+        verbose_name='Дата первого просмотра'
+    )
+    last_viewed = models.DateTimeField(
+        verbose_name='Дата последнего просмотра'
+    )
+    views = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Количество просмотров'
+    )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата завершения'
+    )
+    updated = models.DateTimeField(
+        verbose_name='Дата записи'
+    )
+
+    class Meta:
+        constraints = [
+            # Ключ пакетной вставки с ON CONFLICT; заменяет индекс по user_id
+            models.UniqueConstraint(fields=['user', 'content'], name='education_progress_user_content'),
+        ]
+        indexes = [
+            # Выборка записанного после отметки для статистики (education.service.analytics)
+            models.Index(fields=['updated'], name='education_progress_upd_idx'),
+        ]
+        verbose_name = 'Прогресс по контенту'
+        verbose_name_plural = 'Прогресс по контенту'
+
+    def __str__(self):
+        return f'{self.user} - {self.content_id}'
+
+
+class CourseActivity(models.Model):
+    """
+    День, в который студент занимался курсом.
+
+    Служебная таблица статистики: по ней считается количество активных
+    студентов курса за день без повторного учета одного студента.
+    """
+    course = models.ForeignKey(
+        Course,
+        related_name='+',
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Курс'
+    )
+    user = models.ForeignKey(
+        User,
+        related_name='+',
+        on_delete=models.CASCADE,
+        verbose_name='Студент'
+    )
+    date = models.DateField(
+        verbose_name='День'
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['course', 'date', 'user'], name='education_activity_unique'),
+        ]
+        verbose_name = 'Активность студента'
+        verbose_name_plural = 'Активность студентов'
+
+
+class CourseDailyStats(models.Model):
+    """
+    Статистика курса за день: новые записи и активные студенты.
+    """
+    course = models.ForeignKey(
+        Course,
+        related_name='daily_stats',
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Курс'
+    )
+    date = models.DateField(
+        verbose_name='День'
+    )
+    enrollments = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Новых записей на курс'
+    )
+    active_students = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Активных студентов'
+    )
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['course', 'date'], name='education_course_stats_unique'),
+        ]
+        verbose_name = 'Статистика курса за день'
+        verbose_name_plural = 'Статистика курсов по дням'
+
+
+class ModuleDailyStats(models.Model):
+    """
+    Статистика модуля за день: завершенные объекты контента.
+    """
+    module = models.ForeignKey(
+        Module,
+        related_name='daily_stats',
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Модуль'
+    )
+    date = models.DateField(
+        verbose_name='День'
+    )
+    completions = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Завершений контента'
+    )
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['module', 'date'], name='education_module_stats_unique'),
+        ]
+        verbose_name = 'Статистика модуля за день'
+        verbose_name_plural = 'Статистика модулей по дням'
+
+
+class StatsWatermark(models.Model):
+    """
+    Отметка времени, до которой исходные данные учтены в статистике.
+    """
+    name = models.CharField(
+        max_length=50,
+        unique=True,
+        verbose_name='Имя'
+    )
+    value = models.DateTimeField(
+        verbose_name='Учтено до'
+    )
+
+    class Meta:
+        verbose_name = 'Отметка статистики'
+        verbose_name_plural = 'Отметки статистики'
+
+    def __str__(self):
+        return f'{self.name}: {self.value}'
@@ -0,0 +1,229 @@
+"""
+Дневная статистика курсов и модулей для авторов.
+
+Статистика хранится в небольших таблицах CourseDailyStats и
+ModuleDailyStats и обновляется инкрементально: update_stats учитывает
+записи на курсы и строки Progress, появившиеся после отметки
+StatsWatermark, и пересчитывает только затронутые курсы и модули за дни
+после отметки. Пересчет дня выполняется целиком, поэтому повторная
+обработка тех же данных ничего не удваивает. История обрабатывается
+по частям функцией backfill_stats (команда update_course_stats --backfill).
+
+Progress хранит только первый и последний просмотр, поэтому активность
+студента за день (CourseActivity) фиксируется при каждом обновлении
+статистики; при восстановлении истории учитываются только эти два дня.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from ..models import CourseActivity, CourseDailyStats, Enrollment, ModuleDailyStats, Progress, StatsWatermark
+from .utils import batched
+
+# Имя отметки в StatsWatermark
+WATERMARK = 'course_stats'
+# Отставание обработки от текущего времени: строки незафиксированных
+# транзакций должны успеть появиться до того, как отметка пройдет их время
+STATS_LAG = timedelta(minutes=1)
+BATCH_SIZE = 1000
+
+
+def day_bounds(start_day, end_day):
+    """Границы [начало start_day, начало дня после end_day) в текущем часовом поясе."""
+    return (
+        timezone.make_aware(datetime.combine(start_day, time.min)),
+        timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min)),
+    )
+
+
+def record_activity(progress):
+    """
+    Добавляет в CourseActivity дни первого и последнего просмотра строк Progress.
+
+    Returns:
+        int: Количество обработанных строк Progress.
+    """
+    rows = progress.values_list(
+        'user_id', 'content__module__course_id', 'first_viewed', 'last_viewed'
+    ).order_by()
+    processed = 0
+    for batch in batched(rows.iterator(chunk_size=BATCH_SIZE), BATCH_SIZE):
+        activities = {
+            (course_id, timezone.localdate(viewed), user_id)
+            for user_id, course_id, first_viewed, last_viewed in batch
+            for viewed in (first_viewed, last_viewed)
+        }
+        CourseActivity.objects.bulk_create(
+            [
+                CourseActivity(course_id=course_id, date=date, user_id=user_id)
+                for course_id, date, user_id in activities
+            ],
+            ignore_conflicts=True
+        )
+        processed += len(batch)
+    return processed
+
+
+def rebuild_course_stats(start_day, end_day, course_ids=None):
+    """
+    Пересчитывает CourseDailyStats за дни с start_day по end_day включительно.
+
+    Args:
+        start_day (date): Первый день.
+        end_day (date): Последний день.
+        course_ids (iterable): Идентификаторы курсов, None - все курсы.
+
+    Returns:
+        int: Количество записанных строк статистики.
+    """
+    start, end = day_bounds(start_day, end_day)
+    enrollments = Enrollment.objects.filter(enrolled_at__gte=start, enrolled_at__lt=end)
+    activity = CourseActivity.objects.filter(date__range=(start_day, end_day))
+    stats = CourseDailyStats.objects.filter(date__range=(start_day, end_day))
+    if course_ids is not None:
+        enrollments = enrollments.filter(course_id__in=course_ids)
+        activity = activity.filter(course_id__in=course_ids)
+        stats = stats.filter(course_id__in=course_ids)
+
+    rows = {}
+    for course_id, day, total in (
+            enrollments.annotate(day=TruncDate('enrolled_at'))
+            .values('course_id', 'day').annotate(total=Count('*'))
+            .values_list('course_id', 'day', 'total').order_by()
+    ):
+        rows.setdefault((course_id, day), CourseDailyStats(course_id=course_id, date=day)).enrollments = total
+    for course_id, day, total in (
+            activity.values('course_id', 'date').annotate(total=Count('*'))
+            .values_list('course_id', 'date', 'total').order_by()
+    ):
+        rows.setdefault((course_id, day), CourseDailyStats(course_id=course_id, date=day)).active_students = total
+
+    stats.delete()
+    CourseDailyStats.objects.bulk_create(rows.values(), batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def rebuild_module_stats(start_day, end_day, module_ids=None):
+    """
+    Пересчитывает ModuleDailyStats за дни с start_day по end_day включительно.
+
+    Args:
+        start_day (date): Первый день.
+        end_day (date): Последний день.
+        module_ids (iterable): Идентификаторы модулей, None - все модули.
+
+    Returns:
+        int: Количество записанных строк статистики.
+    """
+    start, end = day_bounds(start_day, end_day)
+    completions = Progress.objects.filter(completed_at__gte=start, completed_at__lt=end)
+    stats = ModuleDailyStats.objects.filter(date__range=(start_day, end_day))
+    if module_ids is not None:
+        completions = completions.filter(content__module_id__in=module_ids)
+        stats = stats.filter(module_id__in=module_ids)
+
+    rows = [
+        ModuleDailyStats(module_id=module_id, date=day, completions=total)
+        for module_id, day, total in (
+            completions.annotate(day=TruncDate('completed_at'))
+            .values('content__module_id', 'day').annotate(total=Count('*'))
+            .values_list('content__module_id', 'day', 'total').order_by()
+        )
+    ]
+    stats.delete()
+    ModuleDailyStats.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def update_stats(now=None):
+    """
+    Учитывает в статистике данные, появившиеся после отметки.
+
+    Отметка блокируется на время обновления; если обновление уже
+    выполняет другой процесс, функция сразу возвращается.
+
+    Returns:
+        int | None: Количество затронутых курсов. None - отметки еще нет
+         (нужно восстановить историю) или обновление уже выполняется.
+    """
+    upto = (now or timezone.now()) - STATS_LAG
+    with transaction.atomic():
+        watermark = StatsWatermark.objects.select_for_update(skip_locked=True).filter(
+            name=WATERMARK
+        ).first()
+        if watermark is None:
+            return None
+        since = watermark.value
+        if upto <= since:
+            return 0
+
+        progress = Progress.objects.filter(updated__gt=since, updated__lte=upto)
+        course_ids = set(
+            Enrollment.objects.filter(
+                enrolled_at__gt=since,
+                enrolled_at__lte=upto
+            ).values_list('course_id', flat=True).distinct()
+        )
+        course_ids.update(progress.values_list('content__module__course_id', flat=True).distinct())
+        module_ids = set(
+            progress.filter(completed_at__isnull=False).values_list(
+                'content__module_id', flat=True
+            ).distinct()
+        )
+
+        record_activity(progress)
+        start_day, end_day = timezone.localdate(since), timezone.localdate(upto)
+        if course_ids:
+            rebuild_course_stats(start_day, end_day, course_ids)
+        if module_ids:
+            rebuild_module_stats(start_day, end_day, module_ids)
+
+        watermark.value = upto
+        watermark.save(update_fields=['value'])
+    return len(course_ids)
+
+
+def backfill_stats(since=None, chunk_days=30):
+    """
+    Пересчитывает статистику за прошедшие дни по частям и ставит отметку.
+
+    Каждая часть из chunk_days дней обрабатывается в своей транзакции.
+
+    Args:
+        since (date): Первый день. По умолчанию день самых ранних данных.
+        chunk_days (int): Количество дней в одной части.
+
+    Returns:
+        int: Количество обработанных частей.
+    """
+    upto = timezone.now() - STATS_LAG
+    end_day = timezone.localdate(upto)
+    if since is None:
+        earliest = [
+            value for value in (
+                Enrollment.objects.aggregate(value=Min('enrolled_at'))['value'],
+                Progress.objects.aggregate(value=Min('first_viewed'))['value'],
+            ) if value
+        ]
+        since = timezone.localdate(min(earliest)) if earliest else end_day
+
+    chunks = 0
+    day = since
+    while day <= end_day:
+        chunk_end = min(day + timedelta(days=chunk_days - 1), end_day)
+        start, end = day_bounds(day, chunk_end)
+        with transaction.atomic():
+            record_activity(Progress.objects.filter(
+                Q(first_viewed__gte=start, first_viewed__lt=end)
+                | Q(last_viewed__gte=start, last_viewed__lt=end)
+            ))
+            rebuild_course_stats(day, chunk_end)
+            rebuild_module_stats(day, chunk_end)
+        chunks += 1
+        day = chunk_end + timedelta(days=1)
+
+    StatsWatermark.objects.update_or_create(name=WATERMARK, defaults={'value': upto})
+    return chunks
@@ -0,0 +1,126 @@
+"""
+Копирование курса вместе с модулями, контентом и объектами контента.
+
+Каждая таблица копируется одним bulk_create, порядковые номера модулей
+и контента сохраняются, а объекты File/Image ссылаются на те же файлы
+в хранилище - повторной загрузки не происходит.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils.text import slugify
+
+from core.storage import acquire_files
+
+from ..models import Content, Course, File, Image, Module
+
+
+def get_unique_slug(base_slug):
+    """
+    Возвращает свободный слаг курса вида '<base_slug>-copy', '<base_slug>-copy-2', ...
+    """
+    base_slug = slugify(f'{base_slug}-copy')[:190]
+    taken = set(
+        Course.objects.filter(slug__startswith=base_slug).values_list('slug', flat=True)
+    )
+    slug, number = base_slug, 1
+    while slug in taken:
+        number += 1
+        slug = f'{base_slug}-{number}'
+    return slug
+
+
+def acquire_stored_files(model, items):
+    """
+    Берет ссылки на файлы объектов, созданных через bulk_create.
+
+    bulk_create не отправляет сигналы, поэтому счетчики ссылок хранилища
+    увеличиваются здесь явно.
+    """
+    field = model._meta.get_field('file') if model in (File, Image) else None
+    if field is not None:
+        acquire_files(field, [item.file.name for item in items])
+
+
+def clone_items(contents, new_owner):
+    """
+    Копирует объекты контента, на которые ссылаются записи Content.
+
+    Объекты загружаются одним запросом и создаются одним bulk_create
+    на каждый тип контента.
+
+    Args:
+        contents (list): Копируемые записи Content.
+        new_owner (User): Автор копий.
+
+    Returns:
+        dict: Словарь {(content_type_id, старый object_id): новый object_id}.
+    """
+    ids_by_type = {}
+    for content in contents:
+        ids_by_type.setdefault(content.content_type_id, set()).add(content.object_id)
+
+    new_ids = {}
+    for content_type_id, object_ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        items = list(model.objects.filter(pk__in=object_ids))
+        old_ids = [item.pk for item in items]
+        for item in items:
+            item.pk = None
+            item._state.adding = True
+            item.owner = new_owner
+        model.objects.bulk_create(items)
+        acquire_stored_files(model, items)
+        for old_id, item in zip(old_ids, items):
+            new_ids[(content_type_id, old_id)] = item.pk
+    return new_ids
+
+
+def clone_course(course, new_owner, new_subject=None, title=None, slug=None):
+    """
+    Создает копию курса для нового автора.
+
+    Args:
+        course (Course): Исходный курс.
+        new_owner (User): Автор копии.
+        new_subject (Subject): Субъект-родитель копии. По умолчанию субъект исходного курса.
+        title (str): Заголовок копии. По умолчанию заголовок исходного курса.
+        slug (str): Слаг копии. По умолчанию свободный слаг на основе исходного.
+
+    Returns:
+        Course: Созданная копия курса.
+    """
+    with transaction.atomic():
+        new_course = Course.objects.create(
+            owner=new_owner,
+            subject=new_subject or course.subject,
+            title=title or course.title,
+            slug=slug or get_unique_slug(course.slug),
+            overview=course.overview
+        )
+
+        modules = list(course.modules.order_by('order'))
+        old_module_ids = [module.pk for module in modules]
+        for module in modules:
+            module.pk = None
+            module._state.adding = True
+            module.course = new_course
+        Module.objects.bulk_create(modules)
+        new_modules = dict(zip(old_module_ids, modules))
+
+        contents = list(
+            Content.objects.filter(module__course=course).order_by('module', 'order')
+        )
+        if contents:
+            new_item_ids = clone_items(contents, new_owner)
+            Content.objects.bulk_create([
+                Content(
+                    module=new_modules[content.module_id],
+                    content_type_id=content.content_type_id,
+                    object_id=new_item_ids[(content.content_type_id, content.object_id)],
+                    order=content.order
+                )
+                for content in contents
+                # Записи с потерянным объектом контента не копируются
+                if (content.content_type_id, content.object_id) in new_item_ids
+            ])
+    return new_course
@@ -0,0 +1,60 @@
+"""
+Реестр типов контента модулей и их модельных форм.
+
+Модель и класс формы каждого типа создаются один раз при регистрации
+(для встроенных типов - в EducationConfig.ready), поэтому редактор
+контента не строит формы заново на каждый запрос. Новые типы контента
+регистрируются тем же способом:
+
+    content_registry.register(Quiz)
+    content_registry.register(Quiz, form=QuizForm)
+"""
+from django.forms.models import modelform_factory
+
+# Поля объектов контента, которые не редактируются в форме
+FORM_EXCLUDE = ('owner', 'order', 'created', 'updated')
+
+
+class ContentRegistry:
+    """
+    Модели и классы форм типов контента по имени модели.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._forms = {}
+
+    def register(self, model, form=None, exclude=FORM_EXCLUDE):
+        """
+        Регистрирует тип контента.
+
+        Args:
+            model (Model): Модель контента (наследник ContentBase).
+            form (ModelForm): Класс формы. По умолчанию строится
+             modelform_factory со всеми полями, кроме exclude.
+            exclude (iterable): Поля, не попадающие в форму по умолчанию.
+
+        Returns:
+            Model: Зарегистрированная модель (метод можно использовать как декоратор).
+        """
+        name = model._meta.model_name
+        self._models[name] = model
+        self._forms[name] = form or modelform_factory(model, exclude=list(exclude))
+        return model
+
+    def get_model(self, name):
+        """Модель типа контента, None - тип не зарегистрирован."""
+        return self._models.get(name)
+
+    def get_form_class(self, name):
+        """Класс формы типа контента, None - тип не зарегистрирован."""
+        return self._forms.get(name)
+
+    def __contains__(self, name):
+        return name in self._models
+
+    def __iter__(self):
+        return iter(self._models)
+
+
+content_registry = ContentRegistry()
@@ -0,0 +1,82 @@
+"""
+Денормализованные счетчики каталога курсов.
+
+Subject.total_courses, Course.total_modules и Course.total_students
+поддерживаются обработчиками сигналов (education/signals.py), а функции
+этого модуля пересчитывают их целиком одним UPDATE на счетчик - для
+массовых операций (bulk_create, импорт) и для восстановления.
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from ..models import Course, Enrollment, Module, Subject
+
+
+def _count_subquery(queryset, field):
+    """
+    Подзапрос количества строк queryset, сгруппированных по field = OuterRef('pk').
+    """
+    counts = (
+        queryset.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('*'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), Value(0), output_field=IntegerField())
+
+
+def increment(model, pk, field, delta):
+    """
+    Атомарно изменяет счетчик field объекта model с идентификатором pk на delta.
+    """
+    if pk is None or not delta:
+        return
+    model.objects.filter(pk=pk).update(**{field: F(field) + delta})
+
+
+def recompute_subject_counters(subject_ids=None):
+    """
+    Пересчитывает Subject.total_courses.
+
+    Args:
+        subject_ids (iterable): Идентификаторы субъектов, None - все субъекты.
+
+    Returns:
+        int: Количество обновленных строк.
+    """
+    qs = Subject.objects.all()
+    if subject_ids is not None:
+        qs = qs.filter(pk__in=subject_ids)
+    return qs.update(total_courses=_count_subquery(Course.objects.all(), 'subject'))
+
+
+def recompute_course_counters(course_ids=None, **updates):
+    """
+    Пересчитывает Course.total_modules и Course.total_students одним UPDATE.
+
+    Args:
+        course_ids (iterable): Идентификаторы курсов, None - все курсы.
+        **updates: Другие поля курса, изменяемые тем же UPDATE.
+
+    Returns:
+        int: Количество обновленных строк.
+    """
+    qs = Course.objects.all()
+    if course_ids is not None:
+        qs = qs.filter(pk__in=course_ids)
+    return qs.update(
+        total_modules=_count_subquery(Module.objects.all(), 'course'),
+        total_students=_count_subquery(Enrollment.objects.all(), 'course'),
+        **updates
+    )
+
+
+def recompute_all_counters():
+    """
+    Пересчитывает все счетчики каталога.
+
+    Returns:
+        tuple: Количество обновленных субъектов и курсов.
+    """
+    return recompute_subject_counters(), recompute_course_counters()
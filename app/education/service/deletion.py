@@ -0,0 +1,125 @@
+"""
+Удаление курса вместе с модулями, контентом и объектами контента.
+
+Стандартный каскад Django загружает в память каждый удаляемый объект
+(на моделях есть обработчики сигналов) и не знает об объектах, на которые
+Content ссылается через GenericForeignKey. Здесь все удаляется
+множественными DELETE, сгруппированными по типу контента, а загруженные
+файлы удаляются из хранилища после фиксации транзакции.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from core.storage import release_files
+
+from ..models import Content, File, Image, Module, ModuleDailyStats, Progress, Text, Upload, Video
+from .uploads import delete_upload_files
+
+# Модели контента, на которые ссылается Content.item
+CONTENT_MODELS = (Text, Video, Image, File)
+# Модели контента, хранящие загруженный файл в поле file
+FILE_MODELS = (Image, File)
+
+
+def delete_stored_files(names_by_model):
+    """
+    Удаляет файлы из хранилища, если на них больше не ссылается ни один объект.
+
+    Один и тот же файл может использоваться несколькими объектами
+    (например, после копирования курса), поэтому перед удалением
+    проверяются оставшиеся ссылки.
+
+    Args:
+        names_by_model (dict): Словарь {модель: список имен файлов}.
+    """
+    all_names = {name for names in names_by_model.values() for name in names if name}
+    if not all_names:
+        return
+    still_used = set()
+    for model in FILE_MODELS:
+        still_used.update(
+            model.objects.filter(file__in=all_names).values_list('file', flat=True)
+        )
+    for model, names in names_by_model.items():
+        storage = model._meta.get_field('file').storage
+        for name in set(names) - still_used:
+            if name:
+                storage.delete(name)
+
+
+def release_stored_files(names_by_model):
+    """
+    Освобождает файлы объектов, удаленных в обход сигналов.
+
+    Хранилище с подсчетом ссылок получает по одной освобожденной ссылке
+    на каждую удаленную строку и само удаляет файлы без ссылок после
+    фиксации транзакции. Для остальных хранилищ файлы удаляются после
+    фиксации через delete_stored_files.
+    """
+    unmanaged = {}
+    for model, names in names_by_model.items():
+        if not release_files(model._meta.get_field('file'), names):
+            unmanaged[model] = names
+    if unmanaged:
+        transaction.on_commit(lambda: delete_stored_files(unmanaged))
+
+
+def delete_course(course):
+    """
+    Удаляет курс, его модули, контент и объекты контента.
+
+    Объекты контента удаляются одним DELETE на каждую модель по подзапросу
+    к Content, затем одним DELETE удаляются записи Content и модули, и
+    только потом сам курс. Файлы удаляются после фиксации транзакции,
+    поэтому при откате они остаются на месте.
+
+    Кэш прорисовки удаленных объектов не сбрасывается явно: его ключи
+    больше никогда не запрашиваются и вытесняются сами.
+
+    Args:
+        course (Course): Удаляемый курс.
+
+    Returns:
+        dict: Количество удаленных строк по моделям.
+    """
+    deleted = {}
+    stored_files = {}
+    contents = Content.objects.filter(module__course=course)
+
+    with transaction.atomic():
+        for model in CONTENT_MODELS:
+            items = model.objects.filter(
+                pk__in=contents.filter(
+                    content_type=ContentType.objects.get_for_model(model)
+                ).values('object_id')
+            )
+            if model in FILE_MODELS:
+                stored_files[model] = list(items.values_list('file', flat=True))
+            # Объекты контента не имеют обратных связей, поэтому удаляются
+            # без сборщика каскада и без загрузки в память
+            deleted[model._meta.label] = items._raw_delete(items.db)
+
+        # Загрузки ссылаются на модули и записи Content; файлы
+        # незавершенных загрузок удаляются после фиксации
+        uploads = Upload.objects.filter(module__course=course)
+        upload_files = list(
+            uploads.filter(status=Upload.Status.ACTIVE).values_list('model_name', 'file_name')
+        )
+        deleted[Upload._meta.label] = uploads._raw_delete(uploads.db)
+        if upload_files:
+            transaction.on_commit(lambda: delete_upload_files(upload_files))
+
+        progress = Progress.objects.filter(content__in=contents)
+        deleted[Progress._meta.label] = progress._raw_delete(progress.db)
+        deleted[Content._meta.label] = contents._raw_delete(contents.db)
+        module_stats = ModuleDailyStats.objects.filter(module__course=course)
+        deleted[ModuleDailyStats._meta.label] = module_stats._raw_delete(module_stats.db)
+        modules = Module.objects.filter(course=course)
+        deleted[Module._meta.label] = modules._raw_delete(modules.db)
+
+        # Сам курс удаляется обычным способом: сигналы обновят счетчики
+        _, course_deleted = course.delete()
+        deleted.update(course_deleted)
+
+        release_stored_files(stored_files)
+    return deleted
@@ -0,0 +1,230 @@
+"""
+Защищенная выдача файлов контента File/Image.
+
+Доступ есть у автора объекта, у автора курса и у студентов, записанных
+на курс, в модулях которого объект используется, а также у любого
+обладателя подписанной ссылки, пока она не истекла.
+
+Изображения показываются на страницах курса по тем же ссылкам, а их
+уменьшенные копии - с параметрами format и width. Изображения и копии
+отдаются inline, остальные файлы - как вложение (attachment).
+
+Если задан MEDIA_ACCEL_REDIRECT_PREFIX, сама передача файла отдается
+nginx заголовком X-Accel-Redirect (nginx поддерживает Range). Иначе
+файл отдается приложением ответом FileResponse с поддержкой Range.
+"""
+import mimetypes
+import os
+import re
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core import signing
+from django.db.models import Q
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.http import content_disposition_header, http_date, urlencode
+
+from core.models import ImageDerivative
+
+from ..models import Content, File, Image
+
+# Модели контента, файлы которых выдаются через download-представление
+DOWNLOAD_MODELS = {model._meta.model_name: model for model in (File, Image)}
+# Соль подписи ссылок на скачивание
+SIGNING_SALT = 'education.download'
+# Размер блока при чтении части файла
+READ_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def can_download(user, item):
+    """
+    Проверяет, может ли пользователь скачать файл объекта контента.
+    """
+    if not user.is_authenticated:
+        return False
+    if item.owner_id == user.pk:
+        return True
+    return Content.objects.filter(
+        content_type=ContentType.objects.get_for_model(item),
+        object_id=item.pk
+    ).filter(
+        Q(module__course__students=user) | Q(module__course__owner=user)
+    ).exists()
+
+
+def get_download_url(item):
+    """Постоянная ссылка на скачивание с проверкой доступа по сессии."""
+    return reverse('education:content_download', args=[item._meta.model_name, item.pk])
+
+
+def get_signed_download_url(item, expires_in=None):
+    """
+    Подписанная ссылка на скачивание, которая действует без сессии.
+
+    Args:
+        item (File | Image): Объект контента.
+        expires_in (int): Время жизни ссылки в секундах.
+         По умолчанию DOWNLOAD_URL_MAX_AGE.
+
+    Returns:
+        tuple: Ссылка и момент истечения (unix-время).
+    """
+    expires = int(time.time()) + (expires_in or settings.DOWNLOAD_URL_MAX_AGE)
+    token = signing.dumps(
+        [item._meta.model_name, item.pk, expires],
+        salt=SIGNING_SALT,
+        compress=True
+    )
+    return f'{get_download_url(item)}?{urlencode({"token": token})}', expires
+
+
+def check_download_token(token, item):
+    """Проверяет, что подписанная ссылка выдана для этого объекта и не истекла."""
+    try:
+        model_name, pk, expires = signing.loads(token, salt=SIGNING_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return False
+    return model_name == item._meta.model_name and pk == item.pk and expires >= time.time()
+
+
+def get_download_filename(item):
+    """Имя файла для сохранения: заголовок объекта с расширением файла."""
+    extension = os.path.splitext(item.file.name)[1]
+    title = item.title or os.path.basename(item.file.name)
+    return title if title.lower().endswith(extension.lower()) else f'{title}{extension}'
+
+
+def get_derivative_name(item, image_format, width):
+    """
+    Имя уменьшенной копии изображения объекта контента.
+
+    Returns:
+        str | None: Имя файла копии в хранилище, None - такой копии нет.
+    """
+    try:
+        width = int(width)
+    except (TypeError, ValueError):
+        return None
+    return ImageDerivative.objects.filter(
+        source=item.file.name,
+        format=image_format,
+        width=width
+    ).values_list('name', flat=True).first()
+
+
+def serve_file(request, item, name=None, as_attachment=True):
+    """
+    Отдает файл объекта контента через nginx или с поддержкой Range.
+
+    Args:
+        request (HttpRequest): Запрос.
+        item (File | Image): Объект контента.
+        name (str): Имя другого файла объекта в хранилище (например,
+         уменьшенной копии изображения). По умолчанию - файл объекта.
+        as_attachment (bool): Предложить сохранить файл (attachment),
+         а не показать его в браузере (inline).
+    """
+    if name is None:
+        name, filename = item.file.name, get_download_filename(item)
+    else:
+        filename = os.path.basename(name)
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    prefix = settings.MEDIA_ACCEL_REDIRECT_PREFIX
+    if prefix:
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = f'{prefix.rstrip("/")}/{quote(name)}'
+        response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+        return response
+    return ranged_file_response(
+        request, item.file.storage.path(name), filename, content_type, as_attachment
+    )
+
+
+def parse_range(header, size):
+    """
+    Разбирает заголовок Range с одним диапазоном байт.
+
+    Returns:
+        tuple | None: Начало и конец диапазона включительно, None - отдать файл целиком.
+
+    Raises:
+        ValueError: Корректный диапазон не пересекается с файлом.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match or match.groups() == ('', ''):
+        # Отсутствующий, несколько или некорректный диапазон - весь файл
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            # bytes=5-3 синтаксически некорректен и игнорируется (RFC 9110)
+            return None
+        if start >= size:
+            raise ValueError('Диапазон вне файла')
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # bytes=-N - последние N байт
+        length = int(last)
+        if not length or not size:
+            raise ValueError('Диапазон вне файла')
+        start, end = max(size - length, 0), size - 1
+    return start, end
+
+
+def read_range(path, start, length):
+    """Читает часть файла блоками."""
+    with open(path, 'rb') as stored_file:
+        stored_file.seek(start)
+        while length > 0:
+            data = stored_file.read(min(READ_SIZE, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def ranged_file_response(request, path, filename, content_type, as_attachment=True):
+    """
+    Ответ с файлом, поддерживающий запросы Range (206 Partial Content).
+
+    Ответ на условный запрос с If-Range отдает весь файл, если файл
+    изменился после даты из заголовка.
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    last_modified = http_date(stat.st_mtime)
+    byte_range = None
+    if request.method == 'GET' and request.headers.get('If-Range', last_modified) == last_modified:
+        try:
+            byte_range = parse_range(request.headers.get('Range'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None:
+        response = FileResponse(
+            open(path, 'rb'),
+            as_attachment=as_attachment,
+            filename=filename,
+            content_type=content_type
+        )
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            read_range(path, start, end - start + 1),
+            status=206,
+            content_type=content_type
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Disposition'] = content_disposition_header(as_attachment, filename)
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = last_modified
+    return response
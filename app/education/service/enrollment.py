@@ -0,0 +1,182 @@
+"""
+Массовая запись студентов на курсы.
+
+Записи Enrollment создаются пачками через bulk_create(ignore_conflicts=True),
+поэтому повторная запись ничего не дублирует. m2m_changed при этом
+не отправляется, и счетчики Course.total_students пересчитываются один
+раз на пачку.
+"""
+import csv
+from datetime import timedelta
+from itertools import product
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from ..models import Course, Enrollment
+from .counters import recompute_course_counters
+from .utils import batched
+
+User = get_user_model()
+
+# Как часто обновляется Enrollment.last_accessed при посещении курса
+ACCESS_UPDATE_INTERVAL = timedelta(minutes=5)
+
+
+def enroll_pairs(pairs, batch_size=1000):
+    """
+    Записывает студентов на курсы.
+
+    Args:
+        pairs (iterable): Пары (course_id, user_id).
+        batch_size (int): Размер пачки bulk_create.
+
+    Returns:
+        dict: Количество новых записей ('added') и уже записанных
+         пользователей ('already_enrolled').
+    """
+    counts = {'added': 0, 'already_enrolled': 0}
+    for batch in batched(pairs, batch_size):
+        batch = set(batch)
+        course_ids = {course_id for course_id, _ in batch}
+        user_ids = {user_id for _, user_id in batch}
+        with transaction.atomic():
+            existing = set(
+                Enrollment.objects.filter(
+                    course_id__in=course_ids,
+                    user_id__in=user_ids
+                ).values_list('course_id', 'user_id')
+            ) & batch
+            new = batch - existing
+            Enrollment.objects.bulk_create(
+                [Enrollment(course_id=course_id, user_id=user_id) for course_id, user_id in new],
+                ignore_conflicts=True
+            )
+            if new:
+                recompute_course_counters({course_id for course_id, _ in new})
+        counts['added'] += len(new)
+        counts['already_enrolled'] += len(existing)
+    return counts
+
+
+def enroll_users(courses, users, batch_size=1000):
+    """
+    Записывает каждого из пользователей на каждый из курсов.
+
+    Args:
+        courses (iterable): Курсы или их идентификаторы.
+        users (iterable): Пользователи или их идентификаторы.
+        batch_size (int): Размер пачки bulk_create.
+
+    Returns:
+        dict: Результат enroll_pairs.
+    """
+    course_ids = [getattr(course, 'pk', course) for course in courses]
+    user_ids = [getattr(user, 'pk', user) for user in users]
+    return enroll_pairs(product(course_ids, user_ids), batch_size)
+
+
+def find_users(rows):
+    """
+    Находит пользователей строк CSV по username или email одним запросом.
+
+    Returns:
+        dict: Словари {username: id} и {email в нижнем регистре: id}.
+    """
+    usernames = {row['username'] for row in rows if row.get('username')}
+    emails = {row['email'].lower() for row in rows if row.get('email')}
+    by_username, by_email = {}, {}
+    if usernames or emails:
+        users = User.objects.annotate(email_lower=Lower('email')).filter(
+            Q(username__in=usernames) | Q(email_lower__in=emails)
+        ).values_list('pk', 'username', 'email_lower')
+        for pk, username, email in users:
+            by_username[username] = pk
+            if email:
+                by_email[email] = pk
+    return by_username, by_email
+
+
+def find_courses(rows):
+    """
+    Находит курсы строк CSV по слагу или ИД одним запросом.
+
+    Returns:
+        dict: Словарь {значение колонки course: id курса}.
+    """
+    values = {row['course'] for row in rows if row.get('course')}
+    ids = {value for value in values if value.isdigit()}
+    found = {}
+    for pk, slug in Course.objects.filter(
+            Q(slug__in=values) | Q(pk__in=ids)
+    ).values_list('pk', 'slug'):
+        found[slug] = pk
+        found[str(pk)] = pk
+    return found
+
+
+def enroll_from_csv(stream, courses=None, batch_size=1000):
+    """
+    Записывает студентов на курсы по CSV-файлу.
+
+    Файл содержит заголовок с колонкой username или email и, при
+    необходимости, колонкой course (слаг или ИД курса). Если колонки
+    course нет, каждый пользователь записывается на все курсы courses.
+
+    Args:
+        stream: Текстовый поток CSV.
+        courses (iterable): Курсы для файлов без колонки course.
+        batch_size (int): Количество строк CSV, обрабатываемых за раз.
+
+    Returns:
+        dict: Количество добавленных записей, уже записанных пользователей,
+         а также строк с неизвестным пользователем или курсом.
+    """
+    course_ids = [course.pk for course in courses or []]
+    counts = {'added': 0, 'already_enrolled': 0, 'unknown_users': 0, 'unknown_courses': 0}
+    reader = csv.DictReader(stream)
+    for rows in batched(reader, batch_size):
+        rows = [
+            {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+            for row in rows
+        ]
+        by_username, by_email = find_users(rows)
+        found_courses = find_courses(rows)
+        pairs = []
+        for row in rows:
+            user_id = by_username.get(row.get('username')) or by_email.get(row.get('email', '').lower())
+            if user_id is None:
+                counts['unknown_users'] += 1
+                continue
+            if row.get('course'):
+                course_id = found_courses.get(row['course'])
+                if course_id is None:
+                    counts['unknown_courses'] += 1
+                    continue
+                pairs.append((course_id, user_id))
+            else:
+                pairs.extend((course_id, user_id) for course_id in course_ids)
+        for key, value in enroll_pairs(pairs, batch_size).items():
+            counts[key] += value
+    return counts
+
+
+def touch_enrollment(course_id, user_id):
+    """
+    Отмечает посещение курса студентом.
+
+    Дата обновляется не чаще раза в ACCESS_UPDATE_INTERVAL: условие стоит
+    в самом UPDATE, поэтому повторные просмотры страниц не пишут в таблицу.
+
+    Returns:
+        bool: Была ли обновлена дата посещения.
+    """
+    now = timezone.now()
+    return bool(
+        Enrollment.objects.filter(course_id=course_id, user_id=user_id).filter(
+            Q(last_accessed__isnull=True) | Q(last_accessed__lt=now - ACCESS_UPDATE_INTERVAL)
+        ).update(last_accessed=now)
+    )
@@ -1,5 +1,6 @@
-from django.db import models
-from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections, models, router, transaction
+from django.db.models import Case, Max, Subquery, Value, When
+from django.db.models.functions import Coalesce
 
 
 class OrderField(models.PositiveIntegerField):
@@ -10,6 +11,13 @@ class OrderField(models.PositiveIntegerField):
     Он ищет последний порядковый номер для объектов, связанных с теми
     же полями, указанными в `for_fields`, и увеличивает его на 1.
 
+    Следующий номер вычисляется подзапросом прямо внутри INSERT, а
+    итоговое значение возвращается базой через RETURNING, поэтому
+    создание объекта не требует отдельного SELECT. Если сохранение
+    выполняется внутри transaction.atomic(), родительская строка
+    (например, курс для модуля) блокируется через SELECT ... FOR UPDATE,
+    и параллельные вставки в одного родителя выстраиваются в очередь.
+
     Аргументы:
     - `for_fields` (list): Список полей модели, для которых вы хотите
      упорядочить объекты.
@@ -22,11 +30,77 @@ class OrderField(models.PositiveIntegerField):
     В этом примере, объекты MyModel будут автоматически упорядочиваться
     по полю 'order' в пределах одинаковой категории.
     """
+    # Значение, вычисленное базой в INSERT, возвращается через RETURNING
+    db_returning = True
 
     def __init__(self, for_fields=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.for_fields = for_fields
 
+    def get_group_filter(self, model_instance):
+        """
+        Возвращает словарь для фильтрации объектов той же группы, что и model_instance.
+        """
+        if not self.for_fields:
+            return {}
+        return {
+            # Для внешних ключей берем attname (course_id), чтобы не загружать родителя
+            self.model._meta.get_field(field).attname:
+                getattr(model_instance, self.model._meta.get_field(field).attname)
+            for field in self.for_fields
+        }
+
+    def lock_parents(self, using, groups):
+        """
+        Блокирует родительские строки групп (SELECT ... FOR UPDATE).
+
+        Блокировка берется только внутри транзакции и только на бэкендах,
+        которые поддерживают SELECT ... FOR UPDATE.
+
+        Args:
+            using (str): Алиас базы данных.
+            groups (iterable): Словари фильтров групп из get_group_filter().
+        """
+        connection = connections[using]
+        if not (connection.in_atomic_block and connection.features.has_select_for_update):
+            return
+        for field_name in self.for_fields or []:
+            field = self.model._meta.get_field(field_name)
+            if not field.is_relation:
+                continue
+            parent_ids = {group[field.attname] for group in groups}
+            list(
+                field.remote_field.model._base_manager.using(using)
+                .select_for_update()
+                .filter(pk__in=parent_ids)
+                .order_by('pk')
+                .values_list('pk', flat=True)
+            )
+
+    def next_order_expression(self, model_instance):
+        """
+        Выражение для вычисления следующего номера внутри INSERT.
+        """
+        qs = self.model._base_manager.filter(
+            **self.get_group_filter(model_instance)
+        ).order_by(f'-{self.attname}')
+        return Coalesce(
+            Subquery(qs.values(self.attname)[:1]),
+            Value(-1),
+            output_field=models.IntegerField()
+        ) + Value(1)
+
+    def next_order_value(self, model_instance, using):
+        """
+        Вычисляет следующий номер отдельным запросом.
+
+        Используется для бэкендов без RETURNING и при обновлении объекта.
+        """
+        last_order = self.model._base_manager.using(using).filter(
+            **self.get_group_filter(model_instance)
+        ).aggregate(last_order=Max(self.attname))['last_order']
+        return 0 if last_order is None else last_order + 1
+
     def pre_save(self, model_instance, add):
         """
         Вычисляет порядковый номер и назначает его объекту перед сохранением.
@@ -34,23 +108,151 @@ class OrderField(models.PositiveIntegerField):
         # Если порядковый номер уже назначен объекту, ничего не делаем.
         if getattr(model_instance, self.attname) is not None:
             return super().pre_save(model_instance, add)
+
+        using = model_instance._state.db or router.db_for_write(
+            self.model, instance=model_instance
+        )
+        self.lock_parents(using, [self.get_group_filter(model_instance)])
+        connection = connections[using]
+        if add and connection.features.can_return_columns_from_insert:
+            # Номер вычисляется в самом INSERT, а база вернет его через RETURNING
+            return self.next_order_expression(model_instance)
+
+        # Присваивает порядковый номер объекту и возвращает его.
+        value = self.next_order_value(model_instance, using)
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class OrderedQuerySet(models.QuerySet):
+    """
+    QuerySet для моделей с полем OrderField.
+
+    Переопределяет bulk_create: порядковые номера для всей пачки объектов
+    назначаются последовательно по группам одним агрегирующим запросом,
+    а не подзапросом на каждый объект.
+
+    Метод reorder() записывает новые позиции всех объектов одним UPDATE.
+    """
+
+    def get_order_fields(self):
+        """Возвращает поля OrderField модели."""
+        return [
+            field for field in self.model._meta.concrete_fields
+            if isinstance(field, OrderField)
+        ]
+
+    def reorder(self, orders):
+        """
+        Записывает новые порядковые номера одним UPDATE ... SET order = CASE ...
+
+        Обновляются только объекты текущего QuerySet'а, поэтому фильтр
+        по владельцу, наложенный заранее, проверяется в том же запросе.
+        Строки, номер которых не изменился, не перезаписываются.
+
+        Args:
+            orders (dict): Словарь {идентификатор объекта: новый номер}.
+
+        Returns:
+            int: Количество измененных строк.
+
+        Raises:
+            ValueError: Если идентификатор или номер не является
+             неотрицательным целым числом.
+            IntegrityError: Если новые номера совпадают с номерами других
+             объектов группы (отложенная проверка выполняется сразу).
+        """
+        orders = {int(pk): int(order) for pk, order in orders.items()}
+        if any(order < 0 for order in orders.values()):
+            raise ValueError('Порядковый номер не может быть отрицательным')
+        if not orders:
+            return 0
+
+        field = self.get_order_fields()[0]
+        new_order = Case(
+            *[When(pk=pk, then=Value(order)) for pk, order in orders.items()],
+            output_field=models.PositiveIntegerField()
+        )
+        with transaction.atomic(using=self.db, savepoint=False):
+            updated = self.filter(pk__in=orders).exclude(
+                **{field.attname: new_order}
+            ).update(**{field.attname: new_order})
+            if updated:
+                self.check_deferred_constraints()
+            return updated
+
+    def check_deferred_constraints(self):
+        """
+        Проверяет отложенные ограничения уникальности модели сразу, а не при COMMIT.
+
+        Частичный или конфликтующий набор номеров иначе обнаружился бы
+        только при фиксации транзакции, вне кода, который может его обработать.
+
+        Raises:
+            IntegrityError: Если ограничение нарушено.
+        """
+        connection = connections[self.db]
+        if not connection.features.supports_deferrable_unique_constraints:
+            return
+        names = ', '.join(
+            connection.ops.quote_name(constraint.name)
+            for constraint in self.model._meta.constraints
+            if isinstance(constraint, models.UniqueConstraint) and constraint.deferrable
+        )
+        if not names:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f'SET CONSTRAINTS {names} IMMEDIATE')
+            # Остальная часть транзакции снова может переставлять номера
+            cursor.execute(f'SET CONSTRAINTS {names} DEFERRED')
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Назначает порядковые номера объектам без номера и создает их пачкой.
+        """
+        objs = list(objs)
+        using = self.db
+        with transaction.atomic(using=using, savepoint=False):
+            for field in self.get_order_fields():
+                self._assign_orders(field, objs, using)
+            return super().bulk_create(objs, *args, **kwargs)
+
+    def _assign_orders(self, field, objs, using):
+        """
+        Назначает последовательные номера объектам без номера в пределах группы.
+
+        Args:
+            field (OrderField): Поле порядкового номера.
+            objs (list): Создаваемые объекты.
+            using (str): Алиас базы данных.
+        """
+        pending = {}
+        for obj in objs:
+            if getattr(obj, field.attname) is None:
+                group = field.get_group_filter(obj)
+                pending.setdefault(tuple(group.items()), []).append(obj)
+        if not pending:
+            return
+
+        groups = [dict(key) for key in pending]
+        field.lock_parents(using, groups)
+
+        group_fields = [key for key, _ in next(iter(pending))]
+        qs = self.model._base_manager.using(using).order_by()
+        if group_fields:
+            lookup = models.Q()
+            for group in groups:
+                lookup |= models.Q(**group)
+            qs = qs.filter(lookup).values(*group_fields)
+            last_orders = {
+                tuple((name, row[name]) for name in group_fields): row['last_order']
+                for row in qs.annotate(last_order=Max(field.attname))
+            }
         else:
-            try:
-                qs = self.model.objects.all()
-                #
-                if self.for_fields:
-                    query = {
-                        # Создает словарь для фильтрации объектов по полям.
-                        field: getattr(model_instance, field) for field in self.for_fields
-                    }
-                    qs = qs.filter(**query)
-                # Ищет последний объект и получает его порядковый номер.
-                last_item = qs.latest(self.attname)
-                value = last_item.order + 1
-            except ObjectDoesNotExist:
-                # Если объект не найден, присваивает начальное значение.
-                value = 0
-
-            # Присваивает порядковый номер объекту и возвращает его.
-            setattr(model_instance, self.attname, value)
-            return value
+            last_orders = {(): qs.aggregate(last_order=Max(field.attname))['last_order']}
+
+        for key, group_objs in pending.items():
+            last_order = last_orders.get(key)
+            start = 0 if last_order is None else last_order + 1
+            for offset, obj in enumerate(group_objs):
+                setattr(obj, field.attname, start + offset)
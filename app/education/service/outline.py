@@ -0,0 +1,50 @@
+"""
+Кэшированное оглавление курса (список модулей в боковой панели).
+
+Оглавление - список словарей {'id', 'order', 'title'} модулей курса.
+Ключ кэша содержит Course.content_version, который увеличивается при
+любом изменении модулей и контента курса (education.service.versions),
+поэтому после изменения старая версия просто перестает запрашиваться.
+Одно оглавление используется на всех страницах курса и для всех
+студентов. Хранится в тех же уровнях кэша, что и HTML контента.
+"""
+from ..models import Module
+from .render_cache import get_cache_tiers
+
+
+def outline_cache_key(course):
+    """Ключ кэша оглавления для версии курса: (pk, content_version)."""
+    return f'education:outline:{course.pk}:{course.content_version}'
+
+
+def build_outline(course_id):
+    """Читает оглавление курса одним запросом."""
+    return list(
+        Module.objects.filter(course_id=course_id).values('id', 'order', 'title')
+    )
+
+
+def get_outline(course):
+    """
+    Возвращает оглавление курса из кэша, при промахе - строит и кэширует его.
+
+    Args:
+        course (Course): Курс с загруженным полем content_version.
+
+    Returns:
+        list: Словари {'id', 'order', 'title'} модулей в порядке следования.
+    """
+    key = outline_cache_key(course)
+    tiers = get_cache_tiers()
+    for level, cache in enumerate(tiers):
+        outline = cache.get(key)
+        if outline is not None:
+            # Найденное в общем кэше копируется в локальный
+            for upper in tiers[:level]:
+                upper.set(key, outline)
+            return outline
+
+    outline = build_outline(course.pk)
+    for cache in tiers:
+        cache.set(key, outline)
+    return outline
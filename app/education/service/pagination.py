@@ -0,0 +1,135 @@
+"""
+Курсорная (keyset) пагинация.
+
+В отличие от Paginator с OFFSET, страница выбирается условием
+WHERE (created, id) < (курсор), поэтому стоимость запроса не зависит
+от глубины страницы, а ссылка на страницу остается корректной при
+добавлении новых объектов.
+"""
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+class KeysetPage:
+    """
+    Страница результатов курсорной пагинации.
+
+    Attributes:
+        object_list (list): Объекты страницы.
+        next_cursor (str): Курсор следующей страницы или None.
+        previous_cursor (str): Курсор предыдущей страницы или None.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Пагинатор по убыванию пары (order_field, pk), например (-created, -id).
+
+    Args:
+        queryset (QuerySet): Исходный QuerySet.
+        per_page (int): Количество объектов на странице.
+        order_field (str): Поле даты/числа, по которому идет сортировка.
+    """
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    def __init__(self, queryset, per_page, order_field='created'):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.order_field = order_field
+
+    def encode_cursor(self, direction, obj):
+        """
+        Кодирует позицию объекта в строку курсора для URL.
+        """
+        value = getattr(obj, self.order_field)
+        payload = json.dumps([direction, value.isoformat(), obj.pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """
+        Декодирует курсор. Возвращает (направление, значение, pk) или None,
+        если курсор отсутствует или поврежден.
+        """
+        if not cursor:
+            return None
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, value, pk = json.loads(base64.urlsafe_b64decode(padded))
+            value = parse_datetime(value)
+            pk = int(pk)
+        except (binascii.Error, TypeError, ValueError):
+            return None
+        if direction not in (self.NEXT, self.PREVIOUS) or value is None:
+            return None
+        return direction, value, pk
+
+    def page(self, cursor=None):
+        """
+        Возвращает страницу, следующую за курсором (или первую страницу).
+
+        Поврежденный курсор трактуется как запрос первой страницы.
+
+        Args:
+            cursor (str): Курсор из GET-параметра.
+
+        Returns:
+            KeysetPage: Страница результатов.
+        """
+        position = self.decode_cursor(cursor)
+        field = self.order_field
+        descending = (f'-{field}', '-pk')
+
+        if position is None:
+            rows = list(self.queryset.order_by(*descending)[:self.per_page + 1])
+            has_more, has_before = len(rows) > self.per_page, False
+            rows = rows[:self.per_page]
+        else:
+            direction, value, pk = position
+            if direction == self.NEXT:
+                # Объекты после курсора в порядке убывания
+                rows = list(
+                    self.queryset.filter(
+                        Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk})
+                    ).order_by(*descending)[:self.per_page + 1]
+                )
+                has_more, has_before = len(rows) > self.per_page, True
+                rows = rows[:self.per_page]
+            else:
+                # Объекты перед курсором: выбираем по возрастанию и разворачиваем
+                rows = list(
+                    self.queryset.filter(
+                        Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk})
+                    ).order_by(field, 'pk')[:self.per_page + 1]
+                )
+                has_more, has_before = True, len(rows) > self.per_page
+                rows = rows[:self.per_page][::-1]
+
+        if not rows:
+            return KeysetPage([])
+        return KeysetPage(
+            rows,
+            next_cursor=self.encode_cursor(self.NEXT, rows[-1]) if has_more else None,
+            previous_cursor=self.encode_cursor(self.PREVIOUS, rows[0]) if has_before else None
+        )
@@ -0,0 +1,274 @@
+"""
+Учет прогресса студентов по контенту с отложенной записью.
+
+События (просмотр, завершение) складываются в буфер в памяти процесса
+и объединяются по паре (студент, контент). Фоновый поток записывает буфер
+в Progress пачками INSERT ... ON CONFLICT DO UPDATE раз в
+PROGRESS_FLUSH_INTERVAL секунд или сразу после накопления
+PROGRESS_FLUSH_SIZE пар, поэтому запрос страницы не пишет в базу.
+При штатной остановке процесса буфер записывается обработчиком atexit.
+После записи поток обновляет дневную статистику (education.service.analytics).
+"""
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from ..models import Content, Progress
+from .analytics import update_stats
+from .utils import batched
+
+logger = logging.getLogger(__name__)
+
+VIEWED = 'viewed'
+COMPLETED = 'completed'
+EVENTS = (VIEWED, COMPLETED)
+# Количество строк в одном INSERT
+UPSERT_BATCH_SIZE = 500
+
+
+def merge_events(event, other):
+    """Объединяет накопленные события одной пары (студент, контент)."""
+    completed = [value for value in (event['completed_at'], other['completed_at']) if value]
+    return {
+        'first_viewed': min(event['first_viewed'], other['first_viewed']),
+        'last_viewed': max(event['last_viewed'], other['last_viewed']),
+        'views': event['views'] + other['views'],
+        'completed_at': min(completed) if completed else None,
+    }
+
+
+def upsert_progress(events):
+    """
+    Записывает накопленные события в Progress одним INSERT ... ON CONFLICT.
+
+    Счетчик просмотров увеличивается, дата последнего просмотра берется
+    наибольшая, а дата завершения сохраняется первая. События удаленных
+    за это время контента и студентов отбрасываются: иначе нарушение
+    внешнего ключа откатывало бы всю пачку, и она возвращалась бы
+    в буфер при каждой записи.
+
+    Args:
+        events (dict): Словарь {(user_id, content_id): событие}.
+
+    Returns:
+        int: Количество записанных пар.
+    """
+    content_ids = set(
+        Content.objects.filter(
+            pk__in={content_id for _, content_id in events}
+        ).values_list('pk', flat=True)
+    )
+    user_ids = set(
+        User.objects.filter(
+            pk__in={user_id for user_id, _ in events}
+        ).values_list('pk', flat=True)
+    )
+    rows = [
+        (key, event) for key, event in events.items()
+        if key[0] in user_ids and key[1] in content_ids
+    ]
+    if not rows:
+        return 0
+
+    ops = connection.ops
+    table = ops.quote_name(Progress._meta.db_table)
+    now = ops.adapt_datetimefield_value(timezone.now())
+    params = []
+    for (user_id, content_id), event in rows:
+        params += [
+            user_id,
+            content_id,
+            ops.adapt_datetimefield_value(event['first_viewed']),
+            ops.adapt_datetimefield_value(event['last_viewed']),
+            event['views'],
+            ops.adapt_datetimefield_value(event['completed_at']),
+            now,
+        ]
+    values = ', '.join(['(%s, %s, %s, %s, %s, %s, %s)'] * len(rows))
+    sql = (
+        f'INSERT INTO {table} '
+        f'(user_id, content_id, first_viewed, last_viewed, views, completed_at, updated) '
+        f'VALUES {values} '
+        f'ON CONFLICT (user_id, content_id) DO UPDATE SET '
+        f'views = {table}.views + EXCLUDED.views, '
+        f'last_viewed = CASE WHEN EXCLUDED.last_viewed > {table}.last_viewed '
+        f'THEN EXCLUDED.last_viewed ELSE {table}.last_viewed END, '
+        f'completed_at = COALESCE({table}.completed_at, EXCLUDED.completed_at), '
+        f'updated = EXCLUDED.updated'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+    return len(rows)
+
+
+class ProgressBuffer:
+    """
+    Буфер событий прогресса в памяти процесса.
+
+    Attributes:
+        flush_size (int): Количество пар, после которого буфер записывается
+         без ожидания интервала. По умолчанию PROGRESS_FLUSH_SIZE.
+        flush_interval (float): Интервал записи в секундах, 0 - писать
+         каждое событие сразу. По умолчанию PROGRESS_FLUSH_INTERVAL.
+    """
+
+    def __init__(self, flush_size=None, flush_interval=None):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._events = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def get_flush_size(self):
+        return self.flush_size if self.flush_size is not None else settings.PROGRESS_FLUSH_SIZE
+
+    def get_flush_interval(self):
+        if self.flush_interval is not None:
+            return self.flush_interval
+        return settings.PROGRESS_FLUSH_INTERVAL
+
+    def __len__(self):
+        return len(self._events)
+
+    def add(self, user_id, content_ids, event=VIEWED, at=None):
+        """
+        Добавляет в буфер события студента по одному или нескольким объектам контента.
+
+        Args:
+            user_id (int): Идентификатор студента.
+            content_ids (int | iterable): Идентификаторы записей Content.
+            event (str): VIEWED или COMPLETED.
+            at (datetime): Время события. По умолчанию текущее.
+        """
+        if event not in EVENTS:
+            raise ValueError(f'Неизвестное событие прогресса: {event}')
+        if isinstance(content_ids, int):
+            content_ids = [content_ids]
+        at = at or timezone.now()
+        new = {
+            'first_viewed': at,
+            'last_viewed': at,
+            'views': 1 if event == VIEWED else 0,
+            'completed_at': at if event == COMPLETED else None,
+        }
+        with self._lock:
+            for content_id in content_ids:
+                key = (user_id, content_id)
+                current = self._events.get(key)
+                self._events[key] = merge_events(current, new) if current else dict(new)
+            pending = len(self._events)
+
+        if not self.get_flush_interval():
+            self.flush()
+        else:
+            self.start()
+            if pending >= self.get_flush_size():
+                self._wakeup.set()
+
+    def flush(self):
+        """
+        Записывает накопленные события в базу.
+
+        Если запись не удалась, незаписанные события возвращаются в буфер
+        и будут записаны при следующей попытке.
+
+        Returns:
+            int: Количество записанных пар (студент, контент).
+        """
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, {}
+            written = 0
+            try:
+                for batch in batched(list(events), UPSERT_BATCH_SIZE):
+                    with transaction.atomic():
+                        written += upsert_progress({key: events[key] for key in batch})
+                    for key in batch:
+                        del events[key]
+            finally:
+                if events:
+                    self._restore(events)
+            return written
+
+    def clear(self):
+        """Отбрасывает накопленные события."""
+        with self._lock:
+            self._events = {}
+
+    def _restore(self, events):
+        with self._lock:
+            for key, event in events.items():
+                current = self._events.get(key)
+                self._events[key] = merge_events(current, event) if current else event
+
+    def start(self):
+        """Запускает фоновый поток записи, если он еще не запущен."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='progress-flush',
+                    daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def stop(self):
+        """Останавливает фоновый поток и записывает остаток буфера."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._stopping.clear()
+        self._flush_safely()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.get_flush_interval())
+            self._wakeup.clear()
+            if not self._stopping.is_set() and self._flush_safely():
+                self._update_stats_safely()
+
+    def _flush_safely(self):
+        try:
+            return self.flush()
+        except Exception:
+            logger.exception('Не удалось записать прогресс студентов')
+            return 0
+        finally:
+            # Поток записи не проходит через цикл запроса
+            close_old_connections()
+
+    def _update_stats_safely(self):
+        """Учитывает записанный прогресс в дневной статистике курсов."""
+        try:
+            update_stats()
+        except Exception:
+            logger.exception('Не удалось обновить статистику курсов')
+        finally:
+            close_old_connections()
+
+
+# Буфер процесса приложения
+progress_buffer = ProgressBuffer()
+
+
+def record_progress(user_id, content_ids, event=VIEWED, at=None):
+    """Добавляет события прогресса в буфер процесса."""
+    progress_buffer.add(user_id, content_ids, event, at)
+
+
+def flush_progress():
+    """Записывает буфер процесса в базу."""
+    return progress_buffer.flush()
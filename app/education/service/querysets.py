@@ -0,0 +1,120 @@
+from django.db import models, transaction
+from django.db.models import F
+
+from .fields import OrderedQuerySet
+
+
+class CourseManager(models.Manager):
+    """
+    Менеджер модели Course, по умолчанию не загружающий поисковый вектор.
+
+    Course.search_vector нужен только самому поиску, который обращается
+    к столбцу в SQL-выражениях. Остальным запросам tsvector не нужен,
+    а загружать его для каждой страницы со списком курсов дорого.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().defer('search_vector')
+
+
+class ContentQuerySet(OrderedQuerySet):
+    """
+    QuerySet для модели Content.
+    """
+
+    def with_items(self):
+        """Подгружает объекты контента (content.item) через prefetch_related."""
+        return self.prefetch_related('item')
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Создает записи Content пачкой и увеличивает Course.content_version их курсов.
+        """
+        from .versions import bump_module_courses
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            created = super().bulk_create(objs, *args, **kwargs)
+            bump_module_courses({content.module_id for content in created})
+        return created
+
+    def update(self, **kwargs):
+        """
+        Обновляет записи Content и увеличивает Course.content_version их курсов.
+
+        Через update проходят также reorder и bulk_update. Версии
+        увеличиваются одним UPDATE с подзапросом по тем же записям;
+        если подходящих записей нет, второй запрос не выполняется.
+        """
+        from ..models import Course
+        from .versions import bump
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            bumped = bump(Course.objects.using(self.db).filter(
+                pk__in=self.order_by().values('module__course_id')
+            ))
+            if not bumped:
+                return 0
+            return super().update(**kwargs)
+
+
+class ModuleQuerySet(OrderedQuerySet):
+    """
+    QuerySet для модели Module.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Создает модули пачкой и обновляет Course.total_modules затронутых курсов.
+
+        bulk_create не отправляет сигнал post_save, поэтому счетчики
+        пересчитываются здесь одним UPDATE, который заодно увеличивает
+        Course.content_version.
+        """
+        from .counters import recompute_course_counters
+
+        created = super().bulk_create(objs, *args, **kwargs)
+        recompute_course_counters(
+            {module.course_id for module in created},
+            content_version=F('content_version') + 1
+        )
+        return created
+
+    def update(self, **kwargs):
+        """
+        Обновляет модули и увеличивает Course.content_version затронутых курсов.
+
+        Через update проходят также reorder и bulk_update. Версии
+        увеличиваются одним UPDATE с подзапросом по тем же модулям;
+        если подходящих модулей нет, второй запрос не выполняется.
+        """
+        from ..models import Course
+        from .versions import bump
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            bumped = bump(Course.objects.using(self.db).filter(
+                pk__in=self.order_by().values('course_id')
+            ))
+            if not bumped:
+                return 0
+            return super().update(**kwargs)
+
+
+class ContentItemQuerySet(models.QuerySet):
+    """
+    QuerySet для моделей объектов контента (наследников ContentBase).
+    """
+
+    def update(self, **kwargs):
+        """
+        Обновляет объекты контента и увеличивает Course.content_version курсов,
+        в модули которых они входят.
+
+        Через update проходит также bulk_update (например, обновление
+        метаданных видео). Объекты, еще не добавленные в модули, курсов
+        не затрагивают, но обновляются как обычно.
+        """
+        from .versions import bump_item_courses
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            bump_item_courses(self.model, self.order_by().values('pk'))
+            return super().update(**kwargs)
@@ -0,0 +1,95 @@
+"""
+Кэш прорисованного HTML объектов контента (Text, Video, Image, File).
+
+Ключ кэша содержит версию разметки (settings.RENDER_CACHE_VERSION), имя
+модели, идентификатор объекта и дату его изменения (updated), поэтому после
+сохранения объекта или изменения шаблонов старая версия просто перестает
+запрашиваться. Кэш двухуровневый:
+    - 'content_render' - локальный LRU-кэш процесса (LocMemCache);
+    - 'content_render_shared' - необязательный общий кэш (Redis), если он
+      описан в settings.CACHES.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.safestring import mark_safe
+
+LOCAL_CACHE_ALIAS = 'content_render'
+SHARED_CACHE_ALIAS = 'content_render_shared'
+
+
+def get_cache_tiers():
+    """
+    Возвращает список уровней кэша: сначала локальный, затем общий (если настроен).
+    """
+    return [
+        caches[alias] for alias in (LOCAL_CACHE_ALIAS, SHARED_CACHE_ALIAS)
+        if alias in settings.CACHES
+    ]
+
+
+def render_cache_key(item):
+    """
+    Ключ кэша для версии объекта контента: (версия разметки, имя модели, pk, updated).
+    """
+    version = int(item.updated.timestamp() * 1_000_000) if item.updated else 0
+    return (
+        f'education:content:v{settings.RENDER_CACHE_VERSION}:'
+        f'{item._meta.model_name}:{item.pk}:{version}'
+    )
+
+
+def render_items(items):
+    """
+    Прорисовывает пачку объектов контента с одним get_many на каждый уровень кэша.
+
+    Отсутствующие в локальном кэше объекты ищутся в общем, остальные
+    прорисовываются и записываются во все уровни одним set_many.
+
+    Args:
+        items (list): Объекты моделей-наследников ContentBase.
+
+    Returns:
+        list: HTML каждого объекта в порядке items.
+    """
+    keys = [render_cache_key(item) for item in items]
+    found = {}
+    missed_tiers = []
+    for tier in get_cache_tiers():
+        missing = [key for key in keys if key not in found]
+        if not missing:
+            break
+        hits = tier.get_many(missing)
+        found.update(hits)
+        # Уровень, в котором не нашлось части ключей, нужно дозаполнить
+        missed_tiers.append((tier, [key for key in missing if key not in hits]))
+
+    rendered = {}
+    for key, item in zip(keys, items):
+        if key not in found and key not in rendered:
+            rendered[key] = item.render_template()
+    found.update(rendered)
+
+    for tier, missing in missed_tiers:
+        values = {key: found[key] for key in missing}
+        if values:
+            tier.set_many(values)
+
+    return [mark_safe(found[key]) for key in keys]
+
+
+def render_item(item):
+    """
+    Прорисовывает один объект контента через кэш.
+    """
+    return render_items([item])[0]
+
+
+def invalidate_item(item):
+    """
+    Удаляет из всех уровней кэша текущую версию объекта контента.
+    """
+    if item.pk is None:
+        return
+    key = render_cache_key(item)
+    for tier in get_cache_tiers():
+        tier.delete(key)
@@ -0,0 +1,135 @@
+"""
+Полнотекстовый поиск по курсам (PostgreSQL).
+
+Course.search_vector хранит tsvector, собранный из заголовка (вес A),
+обзора курса (B), заголовков модулей (C) и текстового контента (D).
+Столбец покрыт GIN-индексом и пересчитывается одним UPDATE для
+измененных курсов после фиксации транзакции (см. schedule_search_update).
+"""
+import threading
+
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, transaction
+from django.db.models import F, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+
+from ..models import Content, Course, Module, Text
+
+# Конфигурация PostgreSQL: русская морфология, латиница стеммится как английский
+SEARCH_CONFIG = 'russian'
+
+_pending = threading.local()
+
+
+def search_enabled():
+    """Полнотекстовый поиск доступен только на PostgreSQL."""
+    return connection.vendor == 'postgresql'
+
+
+def _joined_text(queryset, field):
+    """
+    Подзапрос, склеивающий значения field всех строк queryset в одну строку.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .annotate(joined=StringAgg(field, delimiter=' '))
+            .values('joined')[:1]
+        ),
+        Value(''),
+        output_field=TextField()
+    )
+
+
+def build_search_vector():
+    """
+    Выражение tsvector для курса, вычисляемое внутри UPDATE.
+    """
+    modules = Module.objects.filter(course=OuterRef('pk')).values('course')
+    text_ids = Content.objects.filter(
+        module__course=OuterRef(OuterRef('pk')),
+        content_type=ContentType.objects.get_for_model(Text)
+    ).values('object_id')
+    # Группировка по константе дает одну строку на весь набор текстов
+    texts = Text.objects.filter(pk__in=Subquery(text_ids)).annotate(
+        group=Value(1)
+    ).values('group')
+
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('overview', weight='B', config=SEARCH_CONFIG)
+        + SearchVector(_joined_text(modules, 'title'), weight='C', config=SEARCH_CONFIG)
+        + SearchVector(_joined_text(texts, 'content'), weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(course_ids=None):
+    """
+    Пересчитывает Course.search_vector одним UPDATE.
+
+    Args:
+        course_ids (iterable): Идентификаторы курсов, None - все курсы.
+
+    Returns:
+        int: Количество обновленных курсов.
+    """
+    if not search_enabled():
+        return 0
+    qs = Course.objects.all()
+    if course_ids is not None:
+        qs = qs.filter(pk__in=course_ids)
+    return qs.update(search_vector=build_search_vector())
+
+
+def _flush_search_updates():
+    """Пересчитывает векторы курсов, накопленных за транзакцию."""
+    course_ids = getattr(_pending, 'course_ids', None)
+    _pending.course_ids = None
+    if course_ids:
+        update_search_vectors(course_ids)
+
+
+def schedule_search_update(*course_ids):
+    """
+    Откладывает пересчет векторов курсов до фиксации текущей транзакции.
+
+    Идентификаторы копятся в общем наборе, а первый сработавший после
+    фиксации обработчик пересчитывает их все, поэтому изменения многих
+    модулей и объектов контента в одной транзакции дают один UPDATE.
+    """
+    course_ids = {pk for pk in course_ids if pk is not None}
+    if not course_ids or not search_enabled():
+        return
+    pending = getattr(_pending, 'course_ids', None)
+    if pending is None:
+        _pending.course_ids = pending = set()
+    pending.update(course_ids)
+    transaction.on_commit(_flush_search_updates)
+
+
+def search_courses(query, queryset=None):
+    """
+    Ищет курсы по запросу и упорядочивает их по релевантности.
+
+    Запрос разбирается как в веб-поисковиках: поддерживаются кавычки,
+    OR и исключение слов через минус.
+
+    Args:
+        query (str): Поисковый запрос пользователя.
+        queryset (QuerySet): Исходный QuerySet курсов. По умолчанию все курсы.
+
+    Returns:
+        QuerySet: Найденные курсы с аннотацией rank.
+    """
+    if queryset is None:
+        queryset = Course.objects.all()
+    if not search_enabled():
+        return queryset.none()
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    return queryset.filter(
+        search_vector=search_query
+    ).annotate(
+        rank=SearchRank(F('search_vector'), search_query)
+    ).order_by('-rank', '-created', '-id')
@@ -0,0 +1,337 @@
+"""
+Потоковый экспорт и импорт курсов в формате NDJSON (одна JSON-запись на строку).
+
+Записи идут в порядке Subject -> Course -> Module -> Content, объект
+контента (Text, Video, Image, File) вложен в запись Content:
+
+    {"type": "subject", "slug": "python", "title": "Python"}
+    {"type": "course", "slug": "django", "subject": "python", "owner": "ivan", ...}
+    {"type": "module", "course": "django", "order": 0, "title": "...", ...}
+    {"type": "content", "course": "django", "module": 0, "order": 0,
+     "item_type": "text", "item": {"owner": "ivan", "title": "...", "content": "..."}}
+
+Модуль внутри курса определяется порядковым номером. Файлы File/Image
+экспортируются именем в хранилище: медиафайлы переносятся отдельно.
+"""
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from ..models import Content, Course, File, Image, Module, Subject, Text, Video
+from .cloning import acquire_stored_files
+from .counters import recompute_subject_counters
+from .search import update_search_vectors
+from .utils import batched
+
+User = get_user_model()
+
+# Модели контента по имени типа в записи Content
+CONTENT_MODELS = {model._meta.model_name: model for model in (Text, Video, Image, File)}
+# Служебные поля объектов контента, которые не переносятся
+SKIPPED_ITEM_FIELDS = ('id', 'owner', 'created', 'updated')
+
+
+def item_fields(model):
+    """Возвращает переносимые поля объекта контента."""
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if field.name not in SKIPPED_ITEM_FIELDS
+    ]
+
+
+def write_record(stream, record):
+    """Записывает одну запись NDJSON."""
+    stream.write(json.dumps(record, ensure_ascii=False, default=str))
+    stream.write('\n')
+
+
+def export_courses(stream, courses, chunk_size=2000):
+    """
+    Экспортирует курсы в поток NDJSON.
+
+    Все выборки читаются через iterator(chunk_size=...), поэтому память
+    не растет с размером экспорта.
+
+    Args:
+        stream: Текстовый поток для записи.
+        courses (QuerySet): Экспортируемые курсы.
+        chunk_size (int): Размер порции чтения из базы.
+
+    Returns:
+        dict: Количество записей по типам.
+    """
+    counts = dict.fromkeys(('subject', 'course', 'module', 'content'), 0)
+
+    subjects = Subject.objects.filter(
+        pk__in=courses.values('subject')
+    ).order_by('pk').values('slug', 'title')
+    for subject in subjects.iterator(chunk_size=chunk_size):
+        write_record(stream, {'type': 'subject', **subject})
+        counts['subject'] += 1
+
+    course_rows = courses.order_by('pk').values(
+        'slug', 'title', 'overview', 'subject__slug', 'owner__username'
+    )
+    for course in course_rows.iterator(chunk_size=chunk_size):
+        write_record(stream, {
+            'type': 'course',
+            'slug': course['slug'],
+            'subject': course['subject__slug'],
+            'owner': course['owner__username'],
+            'title': course['title'],
+            'overview': course['overview'],
+        })
+        counts['course'] += 1
+
+    modules = Module.objects.filter(course__in=courses).order_by(
+        'course', 'order'
+    ).values('course__slug', 'order', 'title', 'description')
+    for module in modules.iterator(chunk_size=chunk_size):
+        write_record(stream, {
+            'type': 'module',
+            'course': module.pop('course__slug'),
+            **module
+        })
+        counts['module'] += 1
+
+    contents = Content.objects.filter(module__course__in=courses).order_by(
+        'module__course', 'module__order', 'order'
+    ).values('module__course__slug', 'module__order', 'order', 'content_type_id', 'object_id')
+    for chunk in batched(contents.iterator(chunk_size=chunk_size), chunk_size):
+        items = load_items(chunk)
+        for content in chunk:
+            item_type, item = items.get((content['content_type_id'], content['object_id']), (None, None))
+            if item is None:
+                # Запись с потерянным объектом контента не экспортируется
+                continue
+            write_record(stream, {
+                'type': 'content',
+                'course': content['module__course__slug'],
+                'module': content['module__order'],
+                'order': content['order'],
+                'item_type': item_type,
+                'item': item,
+            })
+            counts['content'] += 1
+    return counts
+
+
+def load_items(contents):
+    """
+    Загружает объекты контента порции записей Content - один запрос на тип.
+
+    Returns:
+        dict: Словарь {(content_type_id, object_id): (имя типа, поля объекта)}.
+    """
+    ids_by_type = {}
+    for content in contents:
+        ids_by_type.setdefault(content['content_type_id'], []).append(content['object_id'])
+
+    items = {}
+    for content_type_id, object_ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        rows = model.objects.filter(pk__in=object_ids).values(
+            'pk', 'owner__username', *item_fields(model)
+        )
+        for row in rows:
+            pk = row.pop('pk')
+            row['owner'] = row.pop('owner__username')
+            items[(content_type_id, pk)] = (model._meta.model_name, row)
+    return items
+
+
+class CourseImporter:
+    """
+    Потоковый импорт курсов из NDJSON.
+
+    Записи буферизуются и сохраняются пачками через bulk_create. Субъекты
+    и курсы сопоставляются по слагу: существующий субъект используется
+    повторно, а существующий курс (вместе с его модулями и контентом)
+    пропускается, поэтому повторный импорт того же файла ничего не дублирует.
+
+    Args:
+        batch_size (int): Размер пачки bulk_create.
+        default_owner (User): Автор для записей, чей пользователь не найден.
+    """
+    ORDER = ('subject', 'course', 'module', 'content')
+
+    def __init__(self, batch_size=1000, default_owner=None):
+        self.batch_size = batch_size
+        self.default_owner = default_owner
+        self.subjects = {}
+        self.courses = {}
+        self.skipped_courses = set()
+        self.modules = {}
+        self.users = {}
+        self.buffers = {record_type: [] for record_type in self.ORDER}
+        self.counts = {record_type: 0 for record_type in self.ORDER}
+        self.counts['skipped'] = 0
+
+    def import_stream(self, stream):
+        """
+        Импортирует записи из текстового потока.
+
+        Returns:
+            dict: Количество созданных записей по типам, пропущенных записей,
+             общее время и скорость в строках в секунду.
+        """
+        started = time.monotonic()
+        rows = 0
+        with transaction.atomic():
+            for line in stream:
+                if not line.strip():
+                    continue
+                self.add(json.loads(line))
+                rows += 1
+            for record_type in self.ORDER:
+                self.flush(record_type)
+            self.finish()
+        elapsed = time.monotonic() - started
+        return {
+            **self.counts,
+            'rows': rows,
+            'seconds': elapsed,
+            'rows_per_second': rows / elapsed if elapsed else float(rows),
+        }
+
+    def add(self, record):
+        """Добавляет запись в буфер и сохраняет буферы, которые пора сбросить."""
+        record_type = record['type']
+        if record_type not in self.buffers:
+            raise ValueError(f'Неизвестный тип записи: {record_type}')
+        # Записи зависят от предыдущих типов, поэтому их буферы сбрасываются первыми
+        for previous_type in self.ORDER[:self.ORDER.index(record_type)]:
+            self.flush(previous_type)
+        buffer = self.buffers[record_type]
+        buffer.append(record)
+        if len(buffer) >= self.batch_size:
+            self.flush(record_type)
+
+    def flush(self, record_type):
+        """Сохраняет буфер записей указанного типа."""
+        records = self.buffers[record_type]
+        if records:
+            self.buffers[record_type] = []
+            getattr(self, f'save_{record_type}s')(records)
+
+    def get_users(self, usernames):
+        """Загружает пользователей по именам одним запросом с кэшированием."""
+        missing = set(usernames) - set(self.users)
+        if missing:
+            for user in User.objects.filter(username__in=missing):
+                self.users[user.username] = user
+            for username in missing - set(self.users):
+                if self.default_owner is None:
+                    raise ValueError(f'Пользователь {username} не найден')
+                self.users[username] = self.default_owner
+        return self.users
+
+    def save_subjects(self, records):
+        """Создает новые субъекты пачки, существующие находит по слагу."""
+        slugs = [record['slug'] for record in records]
+        existing = Subject.objects.in_bulk(slugs, field_name='slug')
+        new = [
+            Subject(slug=record['slug'], title=record['title'])
+            for record in records if record['slug'] not in existing
+        ]
+        Subject.objects.bulk_create(new)
+        self.counts['subject'] += len(new)
+        self.subjects.update({subject.slug: subject for subject in existing.values()})
+        self.subjects.update({subject.slug: subject for subject in new})
+
+    def save_courses(self, records):
+        """Создает новые курсы пачки, существующие по слагу пропускает."""
+        slugs = [record['slug'] for record in records]
+        existing = set(
+            Course.objects.filter(slug__in=slugs).values_list('slug', flat=True)
+        )
+        self.skipped_courses.update(existing)
+        self.counts['skipped'] += len(existing)
+        missing_subjects = {record['subject'] for record in records} - set(self.subjects)
+        if missing_subjects:
+            self.subjects.update(Subject.objects.in_bulk(missing_subjects, field_name='slug'))
+        users = self.get_users(record['owner'] for record in records)
+
+        new = [
+            Course(
+                slug=record['slug'],
+                subject=self.subjects[record['subject']],
+                owner=users[record['owner']],
+                title=record['title'],
+                overview=record['overview']
+            )
+            for record in records if record['slug'] not in existing
+        ]
+        Course.objects.bulk_create(new)
+        self.counts['course'] += len(new)
+        self.courses.update({course.slug: course.pk for course in new})
+
+    def save_modules(self, records):
+        """Создает модули пачки с сохранением порядковых номеров."""
+        new = []
+        for record in records:
+            if record['course'] in self.skipped_courses:
+                self.counts['skipped'] += 1
+                continue
+            new.append(Module(
+                course_id=self.courses[record['course']],
+                order=record['order'],
+                title=record['title'],
+                description=record['description']
+            ))
+        Module.objects.bulk_create(new)
+        self.counts['module'] += len(new)
+        self.modules.update({(module.course_id, module.order): module.pk for module in new})
+
+    def save_contents(self, records):
+        """Создает объекты контента по типам и записи Content пачки."""
+        kept = [
+            record for record in records
+            if record['course'] not in self.skipped_courses
+        ]
+        self.counts['skipped'] += len(records) - len(kept)
+        records = kept
+        users = self.get_users(record['item']['owner'] for record in records)
+
+        items_by_type = {}
+        for record in records:
+            model = CONTENT_MODELS[record['item_type']]
+            # Поля, которых нет в файле старого формата, получают значения по умолчанию
+            fields = {
+                name: record['item'][name]
+                for name in item_fields(model) if name in record['item']
+            }
+            item = model(owner=users[record['item']['owner']], **fields)
+            items_by_type.setdefault(model, []).append(item)
+            record['_item'] = item
+        for model, items in items_by_type.items():
+            model.objects.bulk_create(items)
+            acquire_stored_files(model, items)
+
+        Content.objects.bulk_create([
+            Content(
+                module_id=self.modules[(self.courses[record['course']], record['module'])],
+                content_type=ContentType.objects.get_for_model(record['_item']),
+                object_id=record['_item'].pk,
+                order=record['order']
+            )
+            for record in records
+        ])
+        self.counts['content'] += len(records)
+
+    def finish(self):
+        """
+        Обновляет производные данные импортированных курсов.
+
+        bulk_create не отправляет сигналы, поэтому счетчики субъектов и
+        поисковые векторы пересчитываются здесь одним UPDATE на каждый.
+        """
+        if self.courses:
+            course_ids = list(self.courses.values())
+            recompute_subject_counters(
+                Course.objects.filter(pk__in=course_ids).values('subject')
+            )
+            update_search_vectors(course_ids)
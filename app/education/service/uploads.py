@@ -0,0 +1,200 @@
+"""
+Возобновляемая загрузка файлов File/Image по частям.
+
+Клиент создает загрузку (start_upload), затем отправляет части по порядку
+с заголовками Content-Range и X-Chunk-SHA256. Каждая часть потоком
+дописывается прямо в файл загрузки в хранилище и сверяется с контрольной
+суммой, поэтому после приема последней части файл уже собран и
+копировать его не нужно - хранилище принимает его жесткой ссылкой.
+Прерванную загрузку клиент продолжает со смещения Upload.offset.
+
+Запись по смещению требует локального хранилища (FileSystemStorage).
+"""
+import hashlib
+import os
+import re
+
+from django.db import transaction
+from django.utils.text import get_valid_filename
+
+from core.storage import ContentAddressedStorage
+
+from ..models import Content, File, Image, Upload
+
+# Модели контента по имени, которое передается в URL
+UPLOAD_MODELS = {
+    Upload.ModelName.FILE: File,
+    Upload.ModelName.IMAGE: Image,
+}
+# Рекомендуемый клиенту размер части
+CHUNK_SIZE = 5 * 1024 * 1024
+# Максимальный размер загружаемого файла
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024 * 1024
+# Каталог хранилища для файлов незавершенных загрузок
+UPLOAD_DIR = 'uploads'
+# Размер блока при чтении части из тела запроса
+READ_SIZE = 64 * 1024
+
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+class ChunkError(ValueError):
+    """Часть загрузки отклонена и не записана."""
+
+
+def get_storage(upload):
+    """Хранилище поля file модели контента загрузки."""
+    return UPLOAD_MODELS[upload.model_name]._meta.get_field('file').storage
+
+
+def parse_content_range(header):
+    """
+    Разбирает заголовок 'Content-Range: bytes <start>-<end>/<total>'.
+
+    Returns:
+        tuple: Смещение начала части, ее длина и полный размер файла.
+    """
+    match = CONTENT_RANGE_RE.match(header or '')
+    if not match:
+        raise ChunkError('Некорректный заголовок Content-Range')
+    start, end, total = map(int, match.groups())
+    if end < start:
+        raise ChunkError('Некорректный заголовок Content-Range')
+    return start, end - start + 1, total
+
+
+def start_upload(owner, module, model_name, filename, size, title=''):
+    """
+    Создает загрузку и пустой файл, в который будут записаны части.
+
+    Args:
+        owner (User): Автор загружаемого контента.
+        module (Module): Модуль, в который будет добавлен контент.
+        model_name (str): 'file' или 'image'.
+        filename (str): Исходное имя файла на стороне клиента.
+        size (int): Полный размер файла в байтах.
+        title (str): Заголовок контента. По умолчанию имя файла.
+
+    Returns:
+        Upload: Созданная загрузка.
+    """
+    if model_name not in UPLOAD_MODELS:
+        raise ValueError(f'Загрузка по частям не поддерживается для {model_name}')
+    size = int(size)
+    if not 0 < size <= MAX_UPLOAD_SIZE:
+        raise ValueError('Недопустимый размер файла')
+    filename = get_valid_filename(os.path.basename(str(filename)))
+
+    upload = Upload(
+        owner=owner,
+        module=module,
+        model_name=model_name,
+        title=(title or filename)[:250],
+        size=size
+    )
+    # Части пишутся в отдельный файл загрузки, итоговое имя в хранилище
+    # определяется после приема последней части
+    upload.file_name = f'{UPLOAD_DIR}/{upload.pk}/{filename}'
+    path = get_storage(upload).path(upload.file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'xb').close()
+    upload.save(force_insert=True)
+    return upload
+
+
+def write_chunk(upload, stream, content_range, checksum):
+    """
+    Принимает очередную часть загрузки.
+
+    Часть читается из потока блоками и сразу пишется в файл хранилища
+    с позиции start. Если длина или SHA-256 не совпали, файл обрезается
+    до прежнего смещения и часть нужно отправить повторно. Загрузка
+    блокируется на время записи, поэтому параллельные запросы
+    не пишут в файл одновременно.
+
+    Args:
+        upload (Upload): Загрузка.
+        stream: Поток тела запроса.
+        content_range (str): Значение заголовка Content-Range.
+        checksum (str): Шестнадцатеричный SHA-256 части.
+
+    Returns:
+        Upload: Загрузка с обновленным смещением. После последней части
+         у нее заполнено поле content.
+    """
+    start, length, total = parse_content_range(content_range)
+    with transaction.atomic():
+        upload = Upload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status == Upload.Status.COMPLETE:
+            raise ChunkError('Загрузка уже завершена')
+        if total != upload.size or start + length > upload.size:
+            raise ChunkError('Часть выходит за пределы файла')
+        if start != upload.offset:
+            raise ChunkError(f'Ожидается часть со смещения {upload.offset}')
+
+        digest = hashlib.sha256()
+        received = 0
+        with open(get_storage(upload).path(upload.file_name), 'r+b') as target:
+            target.seek(start)
+            # Хвост от прерванной ранее части отбрасывается
+            target.truncate()
+            while received < length:
+                data = stream.read(min(READ_SIZE, length - received))
+                if not data:
+                    break
+                digest.update(data)
+                target.write(data)
+                received += len(data)
+            if received != length or digest.hexdigest() != (checksum or '').lower():
+                target.truncate(start)
+                raise ChunkError('Контрольная сумма или длина части не совпадает')
+
+        upload.offset = start + length
+        if upload.offset == upload.size:
+            complete_upload(upload)
+        else:
+            upload.save(update_fields=['offset', 'updated'])
+    return upload
+
+
+def complete_upload(upload):
+    """
+    Привязывает собранный файл к новому объекту File/Image и записи Content.
+
+    Хранилище с адресацией по содержимому принимает файл жесткой ссылкой
+    (ingest), иначе файл остается на месте. Полю file присваивается имя
+    уже записанного файла, поэтому повторно он не сохраняется. Файл
+    загрузки удаляется только после фиксации транзакции: при откате
+    загрузка остается незавершенной вместе со своим файлом, и последнюю
+    часть можно отправить повторно.
+    """
+    model = UPLOAD_MODELS[upload.model_name]
+    storage = get_storage(upload)
+    if isinstance(storage, ContentAddressedStorage):
+        upload_file = (upload.model_name, upload.file_name)
+        upload.file_name = storage.ingest(upload.file_name)
+        transaction.on_commit(lambda: delete_upload_files([upload_file]))
+    item = model.objects.create(
+        owner=upload.owner,
+        title=upload.title,
+        file=upload.file_name
+    )
+    upload.content = Content.objects.create(module=upload.module, item=item)
+    upload.status = Upload.Status.COMPLETE
+    upload.save(update_fields=['offset', 'file_name', 'status', 'content', 'updated'])
+    return upload.content
+
+
+def delete_upload_files(uploads):
+    """
+    Удаляет файлы незавершенных загрузок вместе с их каталогами.
+
+    Args:
+        uploads (iterable): Пары (model_name, file_name) загрузок.
+    """
+    for model_name, file_name in uploads:
+        storage = UPLOAD_MODELS[model_name]._meta.get_field('file').storage
+        storage.delete(file_name)
+        upload_dir = os.path.dirname(storage.path(file_name))
+        if os.path.isdir(upload_dir) and not os.listdir(upload_dir):
+            os.rmdir(upload_dir)
@@ -0,0 +1,11 @@
+"""
+Общие вспомогательные функции сервисов education.
+"""
+from itertools import islice
+
+
+def batched(iterable, size):
+    """Разбивает итератор на списки длиной не более size."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
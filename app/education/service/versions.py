@@ -0,0 +1,68 @@
+"""
+Версия содержимого курса (Course.content_version).
+
+Версия - монотонный счетчик, который увеличивается одним атомарным UPDATE
+при любом создании, изменении, перестановке и удалении модулей, записей
+Content и объектов контента (Text, Video, Image, File):
+    - save и delete - обработчиками сигналов (education/signals.py);
+    - update (через него проходят reorder и bulk_update) и bulk_create -
+      QuerySet'ами моделей (education/service/querysets.py);
+    - построение копий изображений (srcset в разметке) - обработчиком
+      сигнала derivatives_ready.
+Кэши, ETag и выгрузки сравнивают одно число вместо просмотра дочерних таблиц.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F
+
+from ..models import Content, Course, Module
+
+
+def bump(courses, **updates):
+    """
+    Увеличивает content_version курсов QuerySet'а courses одним UPDATE.
+
+    Args:
+        courses (QuerySet): Курсы.
+        **updates: Другие поля курса, изменяемые тем же UPDATE
+         (например, счетчик модулей).
+
+    Returns:
+        int: Количество обновленных курсов.
+    """
+    return courses.update(content_version=F('content_version') + 1, **updates)
+
+
+def bump_course_versions(course_ids, **updates):
+    """Увеличивает content_version курсов с идентификаторами course_ids."""
+    course_ids = {pk for pk in course_ids if pk is not None}
+    if not course_ids:
+        return 0
+    return bump(Course.objects.filter(pk__in=course_ids), **updates)
+
+
+def bump_module_courses(module_ids):
+    """
+    Увеличивает content_version курсов, которым принадлежат модули.
+
+    Args:
+        module_ids (iterable | QuerySet): Идентификаторы модулей или подзапрос.
+    """
+    return bump(Course.objects.filter(
+        pk__in=Module.objects.filter(pk__in=module_ids).values('course_id')
+    ))
+
+
+def bump_item_courses(model, item_ids):
+    """
+    Увеличивает content_version курсов, в модули которых входят объекты контента.
+
+    Args:
+        model (Model): Модель объектов контента (наследник ContentBase).
+        item_ids (iterable | QuerySet): Идентификаторы объектов или подзапрос.
+    """
+    return bump(Course.objects.filter(
+        pk__in=Content.objects.filter(
+            content_type=ContentType.objects.get_for_model(model),
+            object_id__in=item_ids
+        ).values('module__course_id')
+    ))
@@ -0,0 +1,153 @@
+"""
+Определение метаданных встраивания видео (провайдер, ссылка для iframe,
+превью, длительность) при сохранении Video.
+
+Бэкенды django-embed-video определяют провайдера и ссылку для
+встраивания, превью и длительность берутся из oEmbed провайдера.
+Результат хранится в строке Video, поэтому шаблон courses/content/video.html
+не обращается к провайдерам при показе.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from ..models import Video
+
+logger = logging.getLogger(__name__)
+
+# oEmbed-адреса провайдеров по имени класса бэкенда
+OEMBED_ENDPOINTS = {
+    'YoutubeBackend': 'https://www.youtube.com/oembed',
+    'VimeoBackend': 'https://vimeo.com/api/oembed.json',
+    'SoundCloudBackend': 'https://soundcloud.com/oembed',
+}
+# Ссылка на превью длиннее поля Video.thumbnail_url обрезается
+THUMBNAIL_URL_MAX_LENGTH = Video._meta.get_field('thumbnail_url').max_length
+# Наибольшее значение PositiveIntegerField Video.duration во всех СУБД
+DURATION_MAX = 2147483647
+# Поля Video, которые заполняет resolve_video
+EMBED_FIELDS = ('provider', 'embed_url', 'thumbnail_url', 'duration', 'embed_resolved')
+
+
+def get_backend(url):
+    """
+    Находит бэкенд django-embed-video для ссылки.
+
+    Список бэкендов читается из настройки VIDEO_EMBED_BACKENDS при каждом
+    вызове (в отличие от EMBED_VIDEO_BACKENDS, которую пакет читает один раз).
+    """
+    for backend_path in settings.VIDEO_EMBED_BACKENDS:
+        backend_class = import_string(backend_path)
+        if backend_class.is_valid(url):
+            return backend_class(url)
+    return None
+
+
+def fetch_oembed(endpoint, url):
+    """Запрашивает oEmbed-описание видео, None - при ошибке."""
+    try:
+        response = requests.get(
+            endpoint,
+            params={'url': url, 'format': 'json'},
+            timeout=settings.VIDEO_EMBED_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError):
+        logger.warning('Не удалось получить oEmbed для %s', url, exc_info=True)
+        return None
+
+
+def parse_duration(value):
+    """Длительность из oEmbed в целых секундах, None - если она не указана или некорректна."""
+    try:
+        duration = int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return duration if 0 < duration <= DURATION_MAX else None
+
+
+def resolve_embed(url):
+    """
+    Определяет метаданные встраивания видео по ссылке.
+
+    Returns:
+        dict: Значения полей provider, embed_url, thumbnail_url и duration.
+         Для неизвестного провайдера все поля пустые.
+    """
+    metadata = {'provider': '', 'embed_url': '', 'thumbnail_url': '', 'duration': None}
+    backend = get_backend(url)
+    if backend is None:
+        return metadata
+    metadata['provider'] = backend.backend
+
+    endpoint = getattr(backend, 'oembed_endpoint', None) or OEMBED_ENDPOINTS.get(backend.backend)
+    oembed = fetch_oembed(endpoint, url) if endpoint else None
+    # Ответ провайдера не проверен: это может быть любой JSON
+    if isinstance(oembed, dict):
+        thumbnail_url = oembed.get('thumbnail_url')
+        metadata['thumbnail_url'] = thumbnail_url if isinstance(thumbnail_url, str) else ''
+        metadata['duration'] = parse_duration(oembed.get('duration'))
+    try:
+        metadata['embed_url'] = str(backend.url)
+        if not metadata['thumbnail_url']:
+            metadata['thumbnail_url'] = backend.thumbnail or ''
+    except Exception:
+        # Бэкенды обращаются к сети и бросают свои исключения
+        logger.warning('Не удалось определить ссылку для встраивания %s', url, exc_info=True)
+    metadata['thumbnail_url'] = metadata['thumbnail_url'][:THUMBNAIL_URL_MAX_LENGTH]
+    return metadata
+
+
+def resolve_video(video):
+    """
+    Заполняет метаданные встраивания объекта Video без сохранения.
+    """
+    for field, value in resolve_embed(video.url).items():
+        setattr(video, field, value)
+    video.embed_resolved = timezone.now()
+    return video
+
+
+def refresh_videos(videos, workers=4, batch_size=100):
+    """
+    Обновляет метаданные встраивания видео.
+
+    Запросы к провайдерам выполняются параллельно в потоках, а
+    результаты сохраняются одним bulk_update на пачку. bulk_update
+    сам не меняет Video.updated, поэтому оно записывается явно: от него
+    зависит ключ кэша прорисовки во всех процессах.
+
+    Args:
+        videos (QuerySet): Обновляемые видео.
+        workers (int): Количество параллельных запросов.
+        batch_size (int): Размер пачки.
+
+    Returns:
+        int: Количество обновленных видео.
+    """
+    refreshed = 0
+    batch = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for video in videos.iterator(chunk_size=batch_size):
+            batch.append(video)
+            if len(batch) >= batch_size:
+                refreshed += save_batch(executor, batch)
+                batch = []
+        if batch:
+            refreshed += save_batch(executor, batch)
+    return refreshed
+
+
+def save_batch(executor, videos):
+    """Определяет метаданные пачки видео и сохраняет их."""
+    list(executor.map(resolve_video, videos))
+    now = timezone.now()
+    for video in videos:
+        video.updated = now
+    Video.objects.bulk_update(videos, (*EMBED_FIELDS, 'updated'))
+    return len(videos)
@@ -0,0 +1,207 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.derivatives import derivatives_ready
+
+from .models import Content, Course, Enrollment, File, Image, Module, Subject, Text, Video
+from .service import counters
+from .service.render_cache import invalidate_item
+from .service.search import schedule_search_update
+from .service.versions import bump_course_versions, bump_item_courses, bump_module_courses
+from .service.video_embeds import resolve_video
+
+# Модели контента, прорисовка которых кэшируется
+CONTENT_MODELS = (Text, Video, Image, File)
+
+
+def invalidate_content_render(sender, instance, **kwargs):
+    """
+    Сбрасывает кэш прорисовки объекта контента при его изменении или удалении.
+
+    В pre_save у объекта еще старое значение updated, поэтому удаляется
+    именно устаревшая версия.
+    """
+    invalidate_item(instance)
+
+
+def bump_course_version_on_item_change(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Увеличивает Course.content_version курсов, в которые входит
+    измененный или удаленный объект контента.
+
+    Новый объект еще не привязан к модулю - версию увеличит обработчик Content.
+    """
+    if not (created or raw):
+        bump_item_courses(sender, [instance.pk])
+
+
+for content_model in CONTENT_MODELS:
+    pre_save.connect(invalidate_content_render, sender=content_model)
+    post_delete.connect(invalidate_content_render, sender=content_model)
+    post_save.connect(bump_course_version_on_item_change, sender=content_model)
+    post_delete.connect(bump_course_version_on_item_change, sender=content_model)
+
+
+@receiver(derivatives_ready)
+def invalidate_image_render(sender, source, **kwargs):
+    """
+    Обновляет Image.updated изображений, для которых построены копии.
+
+    От updated зависит ключ кэша прорисовки, поэтому разметка с srcset
+    строится заново во всех процессах, а не только в том, где построены
+    копии. Тот же UPDATE увеличивает Course.content_version их курсов
+    (ContentItemQuerySet.update), и ETag страниц меняется.
+    """
+    Image.objects.filter(file=source).update(updated=timezone.now())
+
+
+@receiver(post_init, sender=Video)
+def remember_video_url(sender, instance, **kwargs):
+    """
+    Запоминает исходную ссылку видео, чтобы определять метаданные
+    встраивания только при ее изменении.
+    """
+    instance._loaded_url = instance.__dict__.get('url')
+
+
+@receiver(pre_save, sender=Video)
+def resolve_video_embed(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Определяет провайдера, ссылку для встраивания, превью и длительность
+    видео при сохранении новой ссылки, чтобы не делать этого при показе.
+    """
+    if raw or update_fields is not None:
+        # При частичном сохранении метаданные все равно не записались бы,
+        # их обновляет команда refresh_video_embeds
+        return
+    if instance.embed_resolved is None or instance.url != instance._loaded_url:
+        resolve_video(instance)
+    instance._loaded_url = instance.url
+
+
+@receiver(post_init, sender=Course)
+def remember_course_subject(sender, instance, **kwargs):
+    """
+    Запоминает исходный субъект курса, чтобы при смене субъекта
+    поправить счетчики без дополнительного запроса.
+    """
+    instance._loaded_subject_id = instance.subject_id
+
+
+@receiver(post_save, sender=Course)
+def update_subject_counter_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Увеличивает Subject.total_courses при создании курса
+    и переносит его между субъектами при смене субъекта.
+    """
+    if raw:
+        return
+    if created:
+        counters.increment(Subject, instance.subject_id, 'total_courses', 1)
+    elif instance._loaded_subject_id != instance.subject_id:
+        counters.increment(Subject, instance._loaded_subject_id, 'total_courses', -1)
+        counters.increment(Subject, instance.subject_id, 'total_courses', 1)
+    instance._loaded_subject_id = instance.subject_id
+
+
+@receiver(post_delete, sender=Course)
+def update_subject_counter_on_delete(sender, instance, **kwargs):
+    """Уменьшает Subject.total_courses при удалении курса."""
+    counters.increment(Subject, instance.subject_id, 'total_courses', -1)
+
+
+@receiver(post_save, sender=Module)
+def update_module_counter_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Увеличивает Course.content_version при сохранении модуля,
+    а при создании - и Course.total_modules тем же UPDATE.
+    """
+    if raw:
+        return
+    counter = {'total_modules': F('total_modules') + 1} if created else {}
+    bump_course_versions([instance.course_id], **counter)
+
+
+@receiver(post_delete, sender=Module)
+def update_module_counter_on_delete(sender, instance, **kwargs):
+    """Уменьшает Course.total_modules и увеличивает Course.content_version при удалении модуля."""
+    bump_course_versions([instance.course_id], total_modules=F('total_modules') - 1)
+
+
+@receiver(m2m_changed, sender=Enrollment)
+def update_student_counter(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Пересчитывает Course.total_students затронутых курсов после изменения участников.
+
+    При записи со стороны пользователя (user.courses_joined) затронутые
+    курсы перечислены в pk_set, а для clear() запоминаются в pre_clear.
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            counters.recompute_course_counters([instance.pk])
+        return
+
+    if action == 'pre_clear':
+        instance._cleared_course_ids = list(
+            instance.courses_joined.values_list('pk', flat=True)
+        )
+    elif action == 'post_clear':
+        counters.recompute_course_counters(instance.__dict__.pop('_cleared_course_ids', []))
+    elif action in ('post_add', 'post_remove') and pk_set:
+        counters.recompute_course_counters(pk_set)
+
+
+@receiver(post_save, sender=Course)
+def update_course_search_vector(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Пересчитывает поисковый вектор курса после изменения его заголовка или обзора."""
+    if raw:
+        return
+    if update_fields is None or {'title', 'overview'} & set(update_fields):
+        schedule_search_update(instance.pk)
+
+
+@receiver(post_save, sender=Module)
+@receiver(post_delete, sender=Module)
+def update_search_vector_on_module_change(sender, instance, raw=False, **kwargs):
+    """Пересчитывает поисковый вектор курса после изменения его модулей."""
+    if not raw:
+        schedule_search_update(instance.course_id)
+
+
+@receiver(post_save, sender=Content)
+@receiver(post_delete, sender=Content)
+def bump_course_version_on_content_change(sender, instance, raw=False, **kwargs):
+    """Увеличивает Course.content_version после добавления, изменения или удаления контента модуля."""
+    if not raw:
+        bump_module_courses([instance.module_id])
+
+
+@receiver(post_save, sender=Content)
+@receiver(post_delete, sender=Content)
+def update_search_vector_on_content_change(sender, instance, raw=False, **kwargs):
+    """Пересчитывает поисковый вектор курса после добавления или удаления текста."""
+    if raw or instance.content_type_id != ContentType.objects.get_for_model(Text).id:
+        return
+    schedule_search_update(
+        Module.objects.filter(pk=instance.module_id).values_list('course_id', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Text)
+def update_search_vector_on_text_change(sender, instance, created, raw=False, **kwargs):
+    """
+    Пересчитывает поисковые векторы курсов, в которые входит измененный текст.
+
+    Новый текст еще не привязан к модулю - его учтет обработчик Content.
+    """
+    if created or raw:
+        return
+    schedule_search_update(
+        *Content.objects.filter(
+            content_type=ContentType.objects.get_for_model(Text),
+            object_id=instance.pk
+        ).values_list('module__course_id', flat=True)
+    )
@@ -0,0 +1,39 @@
+import pytest
+from django.contrib.auth.models import User
+
+from account.models import Profile
+from education.models import Course, Subject
+from education.service.progress import progress_buffer
+from education.service.render_cache import get_cache_tiers
+
+
+@pytest.fixture(autouse=True)
+def clear_progress_buffer():
+    """События прогресса одного теста не попадают в другие тесты."""
+    yield
+    progress_buffer.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_render_caches():
+    """Идентификаторы курсов повторяются между тестами, а с ними и ключи оглавлений."""
+    yield
+    for cache in get_cache_tiers():
+        cache.clear()
+
+
+@pytest.fixture
+def course():
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    return Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+
+
+@pytest.fixture
+def student(client, course):
+    """Студент курса, вошедший в систему через client."""
+    user = User.objects.create_user(username='student', password='testpassword')
+    Profile.objects.create(user=user)
+    course.students.add(user)
+    client.force_login(user)
+    return user
@@ -0,0 +1,57 @@
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from education.models import Course, Subject
+from education.service.pagination import KeysetPaginator
+from education.views import CourseListView
+
+
+@pytest.fixture
+def courses():
+    owner = User.objects.create(username='owner', first_name='Ivan', last_name='Petrov')
+    subject = Subject.objects.create(title='Python', slug='python')
+    courses = [
+        Course.objects.create(subject=subject, owner=owner, title=f'Course {i}', slug=f'course{i}')
+        for i in range(7)
+    ]
+    # Одинаковая дата у части курсов проверяет разрешение ничьих по id
+    Course.objects.filter(pk__in=[c.pk for c in courses[:4]]).update(created=courses[0].created)
+    return list(Course.objects.order_by('-created', '-id'))
+
+
+@pytest.mark.django_db
+def test_keyset_pages_cover_catalog_once(courses):
+    paginator = KeysetPaginator(Course.objects.all(), per_page=3)
+
+    seen = []
+    pages = []
+    page = paginator.page()
+    while True:
+        pages.append(page)
+        seen += page.object_list
+        if not page.has_next():
+            break
+        page = paginator.page(page.next_cursor)
+
+    assert seen == courses
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert not pages[0].has_previous()
+
+    previous = paginator.page(pages[2].previous_cursor)
+    assert previous.object_list == pages[1].object_list
+    assert paginator.page('broken-cursor').object_list == pages[0].object_list
+
+
+@pytest.mark.django_db
+def test_course_list_queries_do_not_depend_on_page(client, courses, monkeypatch,
+                                                     django_assert_num_queries):
+    monkeypatch.setattr(CourseListView, 'paginate_by', 3)
+    url = reverse('education:course_list')
+    first = client.get(url)
+    assert first.status_code == 200
+    assert 'Ivan Petrov' in first.content.decode()
+
+    # Субъекты и одна выборка курсов вместе с субъектом и автором
+    with django_assert_num_queries(2):
+        client.get(url, {'cursor': first.context['page'].next_cursor})
@@ -0,0 +1,45 @@
+import pytest
+from django.contrib.auth.models import User
+
+from education.models import Content, Course, File, Module, Subject
+from education.service.cloning import clone_course
+from education.tests.test_content_items import create_module_contents
+
+
+@pytest.mark.django_db
+def test_clone_course_copies_structure_in_bulk(django_assert_max_num_queries):
+    owner = User.objects.create(username='owner', password='testpassword')
+    author = User.objects.create(username='author', password='testpassword')
+    subject = Subject.objects.create(title='Python', slug='python')
+    target = Subject.objects.create(title='Projects', slug='projects')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course', slug='course')
+    for title in ('Module 1', 'Module 2', 'Module 3'):
+        create_module_contents(Module.objects.create(course=course, title=title), owner, 5)
+    Module.objects.filter(course=course, title='Module 3').update(order=10)
+
+    # Количество запросов не зависит от числа модулей и объектов контента
+    # (включая увеличение версии курса после bulk_create записей Content)
+    with django_assert_max_num_queries(21):
+        clone = clone_course(course, author, target)
+
+    assert (clone.owner, clone.subject, clone.slug) == (author, target, 'course-copy')
+    assert list(clone.modules.values_list('title', 'order')) == [
+        ('Module 1', 0), ('Module 2', 1), ('Module 3', 10)
+    ]
+    original = list(Content.objects.filter(module__course=course).values_list(
+        'module__title', 'order', 'content_type'))
+    copied = list(Content.objects.filter(module__course=clone).values_list(
+        'module__title', 'order', 'content_type'))
+    assert copied == original
+
+    copied_items = [content.item for content in Content.objects.filter(module__course=clone)]
+    assert {item.owner for item in copied_items} == {author}
+    assert not {item.pk for item in copied_items if isinstance(item, File)} & set(
+        File.objects.filter(owner=owner).values_list('pk', flat=True))
+    # Файлы не копируются в хранилище - копии ссылаются на те же имена
+    assert set(File.objects.filter(owner=author).values_list('file', flat=True)) == {'files/file.pdf'}
+
+    clone.refresh_from_db()
+    target.refresh_from_db()
+    assert (clone.total_modules, target.total_courses) == (3, 1)
+    assert clone_course(course, author).slug == 'course-copy-2'
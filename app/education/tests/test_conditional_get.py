@@ -0,0 +1,61 @@
+import pytest
+from django.urls import reverse
+
+from education.models import Content, Module
+from education.service.progress import progress_buffer
+
+from .test_content_items import create_module_contents
+
+
+@pytest.mark.django_db
+def test_student_course_not_modified(client, course, student, django_assert_num_queries):
+    module = Module.objects.create(course=course, title='Module 1')
+    create_module_contents(module, course.owner, 1)
+    url = reverse('account:student_course_detail_module', args=[course.pk, module.pk])
+    etag = client.get(url)['ETag']
+    progress_buffer.clear()
+
+    # Сессия, пользователь, курс, отметка посещения и записи Content модуля для
+    # прогресса; оглавление берется из кэша, шаблон и контент не читаются
+    with django_assert_num_queries(5):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    # Повторный просмотр тоже попадает в прогресс
+    assert len(progress_buffer) == 4
+
+    text = Content.objects.filter(module=module, content_type__model='text').first().item
+    text.title = 'Changed'
+    text.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+
+
+@pytest.mark.django_db
+def test_student_course_module_change(client, course, student):
+    module = Module.objects.create(course=course, title='Module 1')
+    url = reverse('account:student_course_detail', args=[course.pk])
+    etag = client.get(url)['ETag']
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    module.title = 'Module 1 (edited)'
+    module.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+    # Заголовок курса в версию содержимого не входит, но показывается на странице
+    etag = response['ETag']
+    course.title = 'Course 1 (renamed)'
+    course.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_course_detail_not_modified(client, course):
+    url = reverse('education:course_detail', args=[course.slug])
+    etag = client.get(url)['ETag']
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    course.overview = 'New overview'
+    course.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
@@ -0,0 +1,40 @@
+import pytest
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+
+from education.models import Content, Course, File, Image, Module, Subject, Text, Video
+
+
+def create_module_contents(module, owner, copies):
+    """Создает в модуле по copies объектов каждого типа контента."""
+    items = []
+    for i in range(copies):
+        items += [
+            Text.objects.create(owner=owner, title=f'Text {i}', content='text'),
+            File.objects.create(owner=owner, title=f'File {i}', file='files/file.pdf'),
+            Image.objects.create(owner=owner, title=f'Image {i}', file='images/image.jpg'),
+            Video.objects.create(owner=owner, title=f'Video {i}', url='https://example.com/v.mp4'),
+        ]
+    Content.objects.bulk_create([Content(module=module, item=item) for item in items])
+    return items
+
+
+@pytest.fixture
+def module():
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+    return Module.objects.create(course=course, title='Module 1')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('copies', [1, 10])
+def test_with_items_constant_queries(module, copies, django_assert_num_queries):
+    items = create_module_contents(module, module.course.owner, copies)
+    ContentType.objects.get_for_models(Text, File, Image, Video)
+
+    # Один запрос на Content и по одному на каждую таблицу контента
+    with django_assert_num_queries(5):
+        loaded = [content.item for content in module.contents.with_items()]
+
+    assert loaded == items
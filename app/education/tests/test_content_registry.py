@@ -0,0 +1,51 @@
+import pytest
+from django import forms
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from account.models import Profile
+from education.models import Content, Course, Module, Subject, Text
+from education.service.content_registry import ContentRegistry, content_registry
+
+
+@pytest.fixture
+def module(client):
+    owner = User.objects.create_user(username='owner', password='testpassword')
+    Profile.objects.create(user=owner)
+    client.force_login(owner)
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+    return Module.objects.create(course=course, title='Module 1')
+
+
+def test_builtin_content_types_registered():
+    assert list(content_registry) == ['text', 'video', 'image', 'file']
+    form_class = content_registry.get_form_class('text')
+    assert form_class is content_registry.get_form_class('text')
+    assert list(form_class.base_fields) == ['title', 'content']
+    assert content_registry.get_model('quiz') is None
+
+
+def test_register_custom_form():
+    class TextForm(forms.ModelForm):
+        class Meta:
+            model = Text
+            fields = ['title']
+
+    registry = ContentRegistry()
+    registry.register(Text, form=TextForm)
+    assert 'text' in registry
+    assert registry.get_form_class('text') is TextForm
+
+
+@pytest.mark.django_db
+def test_content_editor_uses_registry(client, module):
+    url = reverse('education:module_content_create', args=[module.pk, 'text'])
+    response = client.get(url)
+    assert type(response.context['form']) is content_registry.get_form_class('text')
+
+    response = client.post(url, {'title': 'Intro', 'content': 'Hello'})
+    assert response.status_code == 302
+    assert Content.objects.get(module=module).item.title == 'Intro'
+
+    assert client.get(reverse('education:module_content_create', args=[module.pk, 'quiz'])).status_code == 404
@@ -0,0 +1,59 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+from education.models import Course, Module, Subject
+
+
+@pytest.fixture
+def owner():
+    return User.objects.create(username='owner', password='testpassword')
+
+
+@pytest.mark.django_db
+def test_counters_follow_courses_modules_and_students(owner):
+    python = Subject.objects.create(title='Python', slug='python')
+    django = Subject.objects.create(title='Django', slug='django')
+    course = Course.objects.create(subject=python, owner=owner, title='Course 1', slug='course1')
+    Module.objects.create(course=course, title='Module 1')
+    Module.objects.bulk_create([Module(course=course, title='Module 2')])
+    students = [User.objects.create(username=f'student{i}') for i in range(3)]
+    course.students.add(*students)
+    students[0].courses_joined.remove(course)
+
+    course.refresh_from_db()
+    python.refresh_from_db()
+    assert python.total_courses == 1
+    assert course.total_modules == 2
+    assert course.total_students == 2
+
+    course.subject = django
+    course.save()
+    course.modules.first().delete()
+    students[1].courses_joined.clear()
+
+    course.refresh_from_db()
+    python.refresh_from_db()
+    django.refresh_from_db()
+    assert (python.total_courses, django.total_courses) == (0, 1)
+    assert course.total_modules == 1
+    assert course.total_students == 1
+
+    course.delete()
+    django.refresh_from_db()
+    assert django.total_courses == 0
+
+
+@pytest.mark.django_db
+def test_recompute_counters_command(owner):
+    subject = Subject.objects.create(title='Python', slug='python')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+    Module.objects.create(course=course, title='Module 1')
+    Subject.objects.update(total_courses=10)
+    Course.objects.update(total_modules=10, total_students=10)
+
+    call_command('recompute_counters')
+
+    subject.refresh_from_db()
+    course.refresh_from_db()
+    assert (subject.total_courses, course.total_modules, course.total_students) == (1, 1, 0)
@@ -0,0 +1,69 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+
+from education.models import (
+    Content, Course, File, Image, Module, ModuleDailyStats, Progress, Subject, Text, Upload, Video
+)
+from education.service.deletion import CONTENT_MODELS, delete_course
+from education.service.uploads import start_upload
+from education.tests.test_content_items import create_module_contents
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_delete_course_removes_items_and_files(media_root, django_capture_on_commit_callbacks):
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Python', slug='python')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+    other = Course.objects.create(subject=subject, owner=owner, title='Course 2', slug='course2')
+    for title in ('Module 1', 'Module 2'):
+        create_module_contents(Module.objects.create(course=course, title=title), owner, 2)
+    create_module_contents(Module.objects.create(course=other, title='Module 1'), owner, 1)
+
+    own_file = File(owner=owner, title='Own')
+    own_file.file.save('own.pdf', ContentFile(b'own'))
+    Content.objects.create(module=course.modules.first(), item=own_file)
+    # Файл, который используют оба курса, должен остаться в хранилище
+    shared_file = File(owner=owner, title='Shared')
+    shared_file.file.save('shared.pdf', ContentFile(b'shared'))
+    Content.objects.create(module=course.modules.first(), item=shared_file)
+    File.objects.create(owner=owner, title='Shared copy', file=shared_file.file.name)
+    upload = start_upload(owner, course.modules.first(), 'file', 'draft.pdf', 100)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        deleted = delete_course(course)
+
+    assert deleted['education.Content'] == 18
+    assert not Course.objects.filter(pk=course.pk).exists()
+    assert Module.objects.filter(course=other).count() == 1
+    assert Content.objects.count() == 4
+    assert [Text.objects.count(), Video.objects.count(), Image.objects.count()] == [1, 1, 1]
+    assert File.objects.count() == 2
+    assert not (media_root / own_file.file.name).exists()
+    assert (media_root / shared_file.file.name).exists()
+    assert deleted['education.Upload'] == 1
+    assert not (media_root / upload.file_name).parent.exists()
+    subject.refresh_from_db()
+    assert subject.total_courses == 1
+
+
+# Связи, которые delete_course удаляет сам в обход сборщика каскада
+HANDLED_RELATIONS = {
+    Module: {Content, Upload, ModuleDailyStats},
+    Content: {Upload, Progress},
+    **{model: set() for model in CONTENT_MODELS},
+}
+
+
+@pytest.mark.parametrize('model', list(HANDLED_RELATIONS), ids=lambda model: model.__name__)
+def test_delete_course_handles_all_reverse_relations(model):
+    # Новая ссылка на модуль, контент или объект контента должна
+    # удаляться в delete_course, иначе DELETE нарушит внешний ключ
+    related = {relation.related_model for relation in model._meta.related_objects}
+    assert related == HANDLED_RELATIONS[model]
@@ -0,0 +1,125 @@
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.urls import reverse
+from PIL import Image as PillowImage
+
+from education.models import Content, Course, File, Image, Module, Subject
+from education.service.downloads import get_signed_download_url
+
+PAYLOAD = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def course_file(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = None
+    owner = User.objects.create(username='owner', password='testpassword')
+    student = User.objects.create(username='student', password='testpassword')
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+    course.students.add(student)
+    module = Module.objects.create(course=course, title='Module 1')
+    item = File(owner=owner, title='Лекция 1')
+    item.file.save('lecture.pdf', ContentFile(PAYLOAD))
+    Content.objects.create(module=module, item=item)
+    return item, student
+
+
+def download_url(item):
+    return reverse('education:content_download', args=['file', item.id])
+
+
+@pytest.mark.django_db
+def test_enrolled_student_downloads_with_ranges(client, course_file):
+    item, student = course_file
+    client.force_login(student)
+
+    response = client.get(download_url(item))
+    assert response.status_code == 200
+    assert response['Accept-Ranges'] == 'bytes'
+    assert 'attachment' in response['Content-Disposition']
+    assert b''.join(response.streaming_content) == PAYLOAD
+
+    response = client.get(download_url(item), headers={'Range': 'bytes=10-19'})
+    assert response.status_code == 206
+    assert response['Content-Range'] == f'bytes 10-19/{len(PAYLOAD)}'
+    assert b''.join(response.streaming_content) == PAYLOAD[10:20]
+
+    response = client.get(download_url(item), headers={'Range': 'bytes=-5'})
+    assert b''.join(response.streaming_content) == PAYLOAD[-5:]
+
+    response = client.get(download_url(item), headers={'Range': 'bytes=5000-'})
+    assert response.status_code == 416
+    assert response['Content-Range'] == f'bytes */{len(PAYLOAD)}'
+
+    # Некорректный диапазон игнорируется, файл отдается целиком
+    response = client.get(download_url(item), headers={'Range': 'bytes=5-3'})
+    assert response.status_code == 200
+    assert b''.join(response.streaming_content) == PAYLOAD
+
+
+@pytest.mark.django_db
+def test_download_requires_enrollment_or_signed_url(client, course_file):
+    item, student = course_file
+    assert client.get(download_url(item)).status_code == 302
+
+    client.force_login(User.objects.create(username='outsider', password='testpassword'))
+    assert client.get(download_url(item)).status_code == 403
+    link_url = reverse('education:content_download_link', args=['file', item.id])
+    assert client.get(link_url).status_code == 404
+
+    client.force_login(student)
+    signed_url = client.get(link_url).json()['url']
+    client.logout()
+    assert client.get(signed_url).status_code == 200
+
+    expired_url, _ = get_signed_download_url(item, expires_in=-1)
+    assert client.get(expired_url).status_code == 403
+
+
+@pytest.mark.django_db
+def test_download_offloaded_to_nginx(client, course_file, settings):
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+    item, student = course_file
+    client.force_login(student)
+
+    response = client.get(download_url(item))
+    assert response.status_code == 200
+    assert response['X-Accel-Redirect'] == f'/protected-media/{item.file.name}'
+    assert response['Content-Disposition'].startswith('attachment')
+    assert response.content == b''
+
+
+@pytest.mark.django_db
+def test_course_image_and_derivatives_served_with_access_check(client, course_file, settings,
+                                                                django_capture_on_commit_callbacks):
+    settings.IMAGE_DERIVATIVE_WIDTHS = (320,)
+    settings.IMAGE_DERIVATIVE_FORMATS = ('webp',)
+    settings.IMAGE_DERIVATIVE_WORKERS = 0
+    item, student = course_file
+    buffer = io.BytesIO()
+    PillowImage.new('RGB', (800, 400), (200, 10, 10)).save(buffer, 'PNG')
+    image = Image(owner=item.owner, title='Схема')
+    with django_capture_on_commit_callbacks(execute=True):
+        image.file.save('scheme.png', ContentFile(buffer.getvalue()))
+    Content.objects.create(module=Content.objects.get().module, item=image)
+
+    # Разметка ссылается только на представление с проверкой доступа
+    url = reverse('education:content_download', args=['image', image.id])
+    html = image.render()
+    assert f'src="{url}"' in html
+    assert f'{url}?format=webp&amp;width=320 320w' in html
+    assert image.file.url not in html
+
+    assert client.get(f'{url}?format=webp&width=320').status_code == 302
+    client.force_login(student)
+    response = client.get(f'{url}?format=webp&width=320')
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'image/webp'
+    assert response['Content-Disposition'].startswith('inline')
+    assert b''.join(response.streaming_content).startswith(b'RIFF')
+    assert client.get(f'{url}?format=webp&width=640').status_code == 404
+    assert client.get(url)['Content-Disposition'].startswith('inline')
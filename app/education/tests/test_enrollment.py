@@ -0,0 +1,106 @@
+import io
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+
+from account.models import Profile
+from education.models import Course, Enrollment, Subject
+from education.service.enrollment import enroll_from_csv, enroll_users, touch_enrollment
+
+
+@pytest.fixture
+def courses():
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Python', slug='python')
+    return [
+        Course.objects.create(subject=subject, owner=owner, title=f'Course {i}', slug=f'course{i}')
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def users():
+    return User.objects.bulk_create([
+        User(username=f'user{i}', email=f'User{i}@example.com') for i in range(5)
+    ])
+
+
+@pytest.mark.django_db
+def test_enroll_users_in_batches(courses, users, django_assert_max_num_queries):
+    courses[0].students.add(users[0])
+
+    # На пачку: проверка существующих записей, вставка, пересчет счетчиков и точка сохранения
+    with django_assert_max_num_queries(4 * 5):
+        counts = enroll_users(courses, users, batch_size=4)
+    assert counts == {'added': 14, 'already_enrolled': 1}
+    assert [course.students.count() for course in courses] == [5, 5, 5]
+    assert list(Course.objects.order_by('pk').values_list('total_students', flat=True)) == [5, 5, 5]
+
+    assert enroll_users(courses, users) == {'added': 0, 'already_enrolled': 15}
+
+
+@pytest.mark.django_db
+def test_enroll_from_csv(courses, users):
+    stream = io.StringIO(
+        'Username,Email,Course\n'
+        'user0,,course0\n'
+        ',user1@EXAMPLE.com,course1\n'
+        f'user2,,{courses[2].pk}\n'
+        'ghost,,course0\n'
+        'user3,,missing\n'
+    )
+    counts = enroll_from_csv(stream)
+    assert counts == {'added': 3, 'already_enrolled': 0, 'unknown_users': 1, 'unknown_courses': 1}
+    assert list(courses[1].students.values_list('username', flat=True)) == ['user1']
+    assert Course.objects.get(pk=courses[2].pk).total_students == 1
+
+
+@pytest.mark.django_db
+def test_enroll_students_command(courses, users, tmp_path):
+    csv_path = tmp_path / 'students.csv'
+    csv_path.write_text('username\n' + '\n'.join(user.username for user in users) + '\n')
+    out = io.StringIO()
+
+    call_command('enroll_students', str(csv_path), '--course', 'course0', '--course', 'course1', stdout=out)
+    assert 'Записано: 10' in out.getvalue()
+    assert Course.objects.get(slug='course1').total_students == 5
+    assert Course.objects.get(slug='course2').total_students == 0
+
+
+@pytest.mark.django_db
+def test_admin_enroll_csv_view(admin_client, courses, users):
+    url = '/admin/education/course/enroll-csv/'
+    assert admin_client.get(url, {'ids': courses[0].pk}).status_code == 200
+
+    csv_file = io.BytesIO(b'email\nuser0@example.com\nuser4@example.com\n')
+    csv_file.name = 'students.csv'
+    response = admin_client.post(url, {'csv_file': csv_file, 'courses': [courses[0].pk]})
+    assert response.status_code == 302
+    assert Course.objects.get(pk=courses[0].pk).total_students == 2
+
+
+@pytest.mark.django_db
+def test_enrollment_timestamps(courses, users):
+    courses[0].students.add(users[0])
+    enrollment = Enrollment.objects.get(course=courses[0], user=users[0])
+    assert enrollment.enrolled_at is not None
+    assert enrollment.last_accessed is None
+    assert list(users[0].courses_joined.all()) == [courses[0]]
+
+    assert touch_enrollment(courses[0].pk, users[0].pk)
+    # Повторное посещение в пределах интервала ничего не пишет
+    assert not touch_enrollment(courses[0].pk, users[0].pk)
+    assert not touch_enrollment(courses[1].pk, users[0].pk)
+    assert Enrollment.objects.get(pk=enrollment.pk).last_accessed is not None
+
+
+@pytest.mark.django_db
+def test_student_course_list(client, courses):
+    student = User.objects.create_user(username='student', password='testpassword')
+    Profile.objects.create(user=student)
+    enroll_users(courses[:2], [student])
+    client.force_login(student)
+    response = client.get(reverse('account:student_course_list'))
+    assert set(response.context['object_list']) == set(courses[:2])
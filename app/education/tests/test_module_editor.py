@@ -0,0 +1,106 @@
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from account.models import Profile
+from education.forms import ModuleFormSet
+from education.models import Course, Module, Subject
+
+
+@pytest.fixture
+def course(client):
+    owner = User.objects.create_user(username='owner', password='testpassword')
+    Profile.objects.create(user=owner)
+    client.force_login(owner)
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+    Module.objects.bulk_create([Module(course=course, title=f'Module {i}') for i in range(120)])
+    return course
+
+
+def formset_data(modules, extra=()):
+    """Данные POST набора форм: существующие модули и новые заголовки."""
+    data = {
+        'modules-TOTAL_FORMS': len(modules) + len(extra),
+        'modules-INITIAL_FORMS': len(modules),
+        'modules-MIN_NUM_FORMS': 0,
+        'modules-MAX_NUM_FORMS': 1000,
+    }
+    for index, module in enumerate(modules):
+        data.update({
+            f'modules-{index}-id': module.pk,
+            f'modules-{index}-course': module.course_id,
+            f'modules-{index}-title': module.title,
+            f'modules-{index}-description': module.description,
+        })
+    for index, title in enumerate(extra, start=len(modules)):
+        data[f'modules-{index}-title'] = title
+    return data
+
+
+@pytest.mark.django_db
+def test_module_editor_windows(client, course):
+    url = reverse('education:course_module_update', args=[course.pk])
+    response = client.get(url)
+    assert len(response.context['formset'].initial_forms) == 50
+    response = client.get(url, {'page': 3})
+    assert [form.instance.title for form in response.context['formset'].initial_forms][:2] == [
+        'Module 100', 'Module 101'
+    ]
+
+
+@pytest.mark.django_db
+def test_module_editor_saves_only_changes(client, course, django_assert_max_num_queries):
+    url = reverse('education:course_module_update', args=[course.pk])
+    window = list(course.modules.all()[:50])
+    data = formset_data(window, extra=['New module'])
+    data['modules-1-title'] = 'Renamed'
+    data['modules-2-DELETE'] = 'on'
+
+    # Число запросов не зависит от числа неизмененных форм в окне:
+    # один UPDATE, вставка с номером, удаление с каскадом и счетчики
+    with django_assert_max_num_queries(20):
+        response = client.post(url, data)
+    assert response.status_code == 302
+
+    course.refresh_from_db()
+    assert course.total_modules == 120
+    assert Module.objects.get(pk=window[1].pk).title == 'Renamed'
+    assert not Module.objects.filter(pk=window[2].pk).exists()
+    new = Module.objects.get(title='New module')
+    assert new.order == 120
+
+
+@pytest.mark.django_db
+def test_module_editor_rejects_foreign_modules(client, course):
+    other = Course.objects.create(
+        subject=course.subject, owner=course.owner, title='Course 2', slug='course2'
+    )
+    foreign = Module.objects.create(course=other, title='Foreign')
+    url = reverse('education:course_module_update', args=[course.pk])
+    data = formset_data([foreign])
+    data['modules-0-title'] = 'Hijacked'
+
+    response = client.post(url, data)
+    assert response.status_code == 200
+    assert Module.objects.get(pk=foreign.pk).title == 'Foreign'
+
+
+
+@pytest.mark.django_db
+def test_module_formset_skips_forms_without_module(course):
+    other = Course.objects.create(
+        subject=course.subject, owner=course.owner, title='Course 2', slug='course2'
+    )
+    foreign = Module.objects.create(course=other, title='Foreign')
+    module = course.modules.first()
+    data = formset_data([module, foreign])
+    data['modules-0-title'] = 'Renamed'
+    # Удаляемая форма не проверяется, и модуль для нее не находится
+    data['modules-1-DELETE'] = 'on'
+
+    formset = ModuleFormSet(instance=course, queryset=Module.objects.filter(pk=module.pk), data=data)
+    assert formset.is_valid()
+    assert formset.save_bulk() == {'updated': 1, 'created': 0, 'deleted': 0}
+    assert Module.objects.get(pk=module.pk).title == 'Renamed'
+    assert Module.objects.filter(pk=foreign.pk).exists()
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.urls import reverse
+
+from education.models import Course, Module, Subject
+
+
+@pytest.fixture
+def course_with_modules():
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+    modules = Module.objects.bulk_create(
+        [Module(course=course, title=f'Module {i}') for i in range(4)]
+    )
+    return owner, course, modules
+
+
+@pytest.mark.django_db
+def test_module_reorder_single_update(client, course_with_modules, django_assert_num_queries):
+    owner, course, modules = course_with_modules
+    client.force_login(owner)
+    new_orders = {str(m.id): order for m, order in zip(modules, [3, 1, 2, 0])}
+
+    response = client.post(
+        reverse('education:module_order'),
+        data=json.dumps(new_orders),
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    # Изменились только позиции первого и последнего модуля
+    assert response.json() == {'saved': 'OK', 'updated': 2}
+    assert list(course.modules.values_list('title', flat=True)) == [
+        'Module 3', 'Module 1', 'Module 2', 'Module 0'
+    ]
+
+    with django_assert_num_queries(1):
+        assert Module.objects.filter(course__owner=owner).reorder(new_orders) == 0
+
+
+@pytest.mark.django_db
+def test_module_reorder_ignores_foreign_modules(client, course_with_modules):
+    owner, course, modules = course_with_modules
+    stranger = User.objects.create(username='stranger', password='testpassword')
+    client.force_login(stranger)
+
+    response = client.post(
+        reverse('education:module_order'),
+        data=json.dumps({str(modules[0].id): 3, str(modules[3].id): 0}),
+        content_type='application/json'
+    )
+    assert response.status_code == 200
+    assert response.json()['updated'] == 0
+    assert list(course.modules.values_list('order', flat=True)) == [0, 1, 2, 3]
+
+
+@pytest.mark.django_db
+def test_module_reorder_rejects_invalid_orders(client, course_with_modules):
+    owner, course, modules = course_with_modules
+    client.force_login(owner)
+
+    response = client.post(
+        reverse('education:module_order'),
+        data=json.dumps({str(modules[0].id): -1}),
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    not connection.features.supports_deferrable_unique_constraints,
+    reason='Ограничение уникальности номеров отложенное только в PostgreSQL'
+)
+def test_module_reorder_rejects_colliding_orders(client, course_with_modules):
+    owner, course, modules = course_with_modules
+    client.force_login(owner)
+
+    # Номер 1 уже занят вторым модулем, который в запрос не попал
+    response = client.post(
+        reverse('education:module_order'),
+        data=json.dumps({str(modules[0].id): 1}),
+        content_type='application/json'
+    )
+    assert response.status_code == 400
+    assert list(course.modules.values_list('order', flat=True)) == [0, 1, 2, 3]
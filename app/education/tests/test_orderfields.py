@@ -1,6 +1,7 @@
 import pytest
 from django.core.exceptions import ObjectDoesNotExist
 from django.contrib.auth.models import User
+from django.db import connection
 from django.contrib.contenttypes.models import ContentType
 from education.models import Module, Content, Subject, Course, Text, File, Image, Video
 
@@ -96,3 +97,42 @@ def test_content_order():
     assert content2.order == 1
     assert content3.order == 2
     assert content4.order == 3
+
+
+@pytest.mark.django_db
+def test_order_computed_inside_insert(django_assert_num_queries):
+    user = User.objects.create(username='testuser', password='testpassword')
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    course = Course.objects.create(subject=subject, owner=user, title='Course 1', slug='course1')
+    Module.objects.create(course=course, title='Module 1')
+
+    # Номер вычисляется в самом INSERT, без отдельного SELECT;
+    # второй запрос - увеличение счетчика модулей курса. Тест выполняется
+    # в транзакции, поэтому там, где это поддерживается, курс блокируется
+    lock_queries = int(connection.features.has_select_for_update)
+    with django_assert_num_queries(2 + lock_queries):
+        module = Module.objects.create(course=course, title='Module 2')
+    assert module.order == 1
+
+
+@pytest.mark.django_db
+def test_bulk_create_assigns_consecutive_orders(django_assert_max_num_queries):
+    user = User.objects.create(username='testuser', password='testpassword')
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    c1 = Course.objects.create(subject=subject, owner=user, title='Course 1', slug='course1')
+    c2 = Course.objects.create(subject=subject, owner=user, title='Course 2', slug='course2')
+    Module.objects.create(course=c1, title='Existing', order=3)
+
+    modules = [Module(course=c1, title=f'C1 {i}') for i in range(3)]
+    modules += [Module(course=c2, title=f'C2 {i}') for i in range(2)]
+    modules.append(Module(course=c2, title='Explicit', order=10))
+
+    # Блокировка курсов, один агрегирующий запрос на пачку,
+    # сама вставка и пересчет счетчиков курсов
+    lock_queries = int(connection.features.has_select_for_update)
+    with django_assert_max_num_queries(3 + lock_queries):
+        Module.objects.bulk_create(modules)
+
+    assert [m.order for m in modules] == [4, 5, 6, 0, 1, 10]
+    assert list(c1.modules.values_list('order', flat=True)) == [3, 4, 5, 6]
+    assert list(c2.modules.values_list('order', flat=True)) == [0, 1, 10]
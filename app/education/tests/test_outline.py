@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from account.models import Profile
+from education.models import Course, Module, Subject
+from education.service.outline import get_outline
+
+
+@pytest.fixture
+def course():
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    return Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+
+
+def version(course):
+    return Course.objects.values_list('content_version', flat=True).get(pk=course.pk)
+
+
+@pytest.mark.django_db
+def test_module_changes_bump_course_version(course):
+    first = Module.objects.create(course=course, title='Module 1')
+    assert version(course) == 1
+    Module.objects.bulk_create([Module(course=course, title='Module 2')])
+    assert version(course) == 2
+
+    first.title = 'Module 1 (edited)'
+    first.save()
+    assert version(course) == 3
+    Module.objects.filter(course=course).reorder({first.pk: 5})
+    assert version(course) == 4
+    # Перестановка без изменений курс не затрагивает
+    Module.objects.filter(course=course).reorder({first.pk: 5})
+    assert version(course) == 4
+
+    first.delete()
+    assert version(course) == 5
+    assert Course.objects.get(pk=course.pk).total_modules == 1
+
+
+@pytest.mark.django_db
+def test_outline_cached_per_version(course, django_assert_num_queries):
+    modules = Module.objects.bulk_create(
+        [Module(course=course, title=f'Module {i}') for i in range(3)]
+    )
+    course.refresh_from_db()
+    outline = get_outline(course)
+    assert outline == [{'id': m.pk, 'order': m.order, 'title': m.title} for m in modules]
+    with django_assert_num_queries(0):
+        assert get_outline(course) == outline
+
+    # Перестановка модулей из редактора курса сбрасывает оглавление
+    orders = {str(modules[0].pk): 2, str(modules[2].pk): 0}
+    Module.objects.filter(course__owner=course.owner).reorder(orders)
+    course.refresh_from_db()
+    assert [m['title'] for m in get_outline(course)] == ['Module 2', 'Module 1', 'Module 0']
+
+
+@pytest.mark.django_db
+def test_content_list_uses_outline(client, course):
+    Profile.objects.create(user=course.owner)
+    client.force_login(course.owner)
+    modules = Module.objects.bulk_create(
+        [Module(course=course, title=f'Module {i}') for i in range(2)]
+    )
+    url = reverse('education:module_content_list', args=[modules[1].pk])
+    assert client.get(url).status_code == 200
+
+    client.post(
+        reverse('education:module_order'),
+        data=json.dumps({str(modules[0].pk): 1, str(modules[1].pk): 0}),
+        content_type='application/json'
+    )
+    response = client.get(url)
+    assert [m['id'] for m in response.context['outline']] == [modules[1].pk, modules[0].pk]
+    assert b'class="selected"' in response.content
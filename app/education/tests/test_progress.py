@@ -0,0 +1,113 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+
+from education.models import Content, Course, Module, Progress, Subject, Text
+from education.service.progress import COMPLETED, ProgressBuffer, flush_progress
+
+
+@pytest.fixture
+def contents():
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+    module = Module.objects.create(course=course, title='Module 1')
+    return [
+        Content.objects.create(
+            module=module,
+            item=Text.objects.create(owner=owner, title=f'Text {i}', content='text')
+        )
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def student(contents):
+    user = User.objects.create(username='student', password='testpassword')
+    contents[0].module.course.students.add(user)
+    return user
+
+
+@pytest.fixture
+def buffer():
+    buffer = ProgressBuffer(flush_size=1000, flush_interval=3600)
+    yield buffer
+    buffer.stop()
+
+
+@pytest.mark.django_db
+def test_buffer_merges_events_and_upserts(buffer, contents, student, django_assert_max_num_queries):
+    start = timezone.now() - timedelta(hours=1)
+    ids = [content.pk for content in contents]
+    buffer.add(student.pk, ids, at=start)
+    buffer.add(student.pk, ids[0], at=start + timedelta(minutes=1))
+    buffer.add(student.pk, ids[1], COMPLETED, at=start + timedelta(minutes=2))
+    assert len(buffer) == 3
+    assert not Progress.objects.exists()
+
+    # Проверка контента и студентов и одна вставка в точке сохранения
+    with django_assert_max_num_queries(5):
+        assert buffer.flush() == 3
+    assert len(buffer) == 0
+
+    first = Progress.objects.get(content=contents[0])
+    assert first.views == 2
+    assert first.last_viewed == start + timedelta(minutes=1)
+    assert Progress.objects.get(content=contents[1]).completed_at == start + timedelta(minutes=2)
+
+    buffer.add(student.pk, ids[0], at=start + timedelta(minutes=5))
+    buffer.add(student.pk, ids[1], COMPLETED, at=start + timedelta(minutes=6))
+    buffer.flush()
+    first.refresh_from_db()
+    assert (first.views, first.first_viewed) == (3, start)
+    # Дата завершения не перезаписывается
+    assert Progress.objects.get(content=contents[1]).completed_at == start + timedelta(minutes=2)
+
+
+@pytest.mark.django_db
+def test_buffer_skips_deleted_content(buffer, contents, student):
+    buffer.add(student.pk, [content.pk for content in contents])
+    contents[2].delete()
+    assert buffer.flush() == 2
+    assert Progress.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_buffer_skips_deleted_student(buffer, contents, student):
+    other = User.objects.create(username='other', password='testpassword')
+    buffer.add(student.pk, contents[0].pk)
+    buffer.add(other.pk, contents[0].pk)
+    other.delete()
+    assert buffer.flush() == 1
+    assert len(buffer) == 0
+    assert list(Progress.objects.values_list('user', flat=True)) == [student.pk]
+
+
+@pytest.mark.django_db
+def test_progress_event_view(client, contents, student):
+    client.force_login(student)
+
+    def post(content, data):
+        return client.post(
+            reverse('education:progress_event', args=[content.pk]),
+            data=json.dumps(data),
+            content_type='application/json'
+        )
+
+    assert post(contents[0], {'event': 'completed'}).status_code == 202
+    assert post(contents[1], {}).status_code == 202
+    assert post(contents[1], {'event': 'liked'}).status_code == 400
+    assert post(contents[1], ['viewed']).status_code == 400
+
+    other = User.objects.create(username='other', password='testpassword')
+    client.force_login(other)
+    assert post(contents[0], {}).status_code == 404
+
+    assert not Progress.objects.exists()
+    assert flush_progress() == 2
+    assert Progress.objects.get(content=contents[0]).completed_at is not None
+    assert Progress.objects.get(content=contents[1]).views == 1
@@ -0,0 +1,56 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import caches
+
+from education.models import Text
+from education.service.render_cache import render_cache_key, render_items
+
+
+@pytest.fixture(autouse=True)
+def clear_render_cache():
+    caches['content_render'].clear()
+    yield
+    caches['content_render'].clear()
+
+
+@pytest.fixture
+def owner():
+    return User.objects.create(username='owner', password='testpassword')
+
+
+@pytest.mark.django_db
+def test_render_is_cached_until_item_saved(owner, settings):
+    text = Text.objects.create(owner=owner, title='Text', content='first')
+    assert 'first' in text.render()
+
+    # Обновление в обход save() не меняет updated: отдается кэшированная версия
+    Text.objects.filter(pk=text.pk).update(content='second')
+    text.refresh_from_db()
+    assert 'first' in text.render()
+
+    text.content = 'third'
+    text.save()
+    assert 'third' in text.render()
+
+    # Новая версия разметки после изменения шаблонов не берет старый HTML
+    Text.objects.filter(pk=text.pk).update(content='fourth')
+    text.refresh_from_db()
+    settings.RENDER_CACHE_VERSION += 1
+    assert 'fourth' in text.render()
+
+
+@pytest.mark.django_db
+def test_render_items_batch_and_delete(owner):
+    texts = [
+        Text.objects.create(owner=owner, title=f'Text {i}', content=f'content {i}')
+        for i in range(3)
+    ]
+    cache = caches['content_render']
+
+    rendered = render_items(texts)
+    assert [f'content {i}' in html for i, html in enumerate(rendered)] == [True] * 3
+    assert len(cache.get_many([render_cache_key(text) for text in texts])) == 3
+
+    key = render_cache_key(texts[0])
+    texts[0].delete()
+    assert cache.get(key) is None
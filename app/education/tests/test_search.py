@@ -0,0 +1,71 @@
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.urls import reverse
+
+from education.models import Content, Course, Module, Subject, Text
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='Полнотекстовый поиск работает только на PostgreSQL'
+)
+
+
+@pytest.fixture
+def catalog(django_capture_on_commit_callbacks):
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Python', slug='python')
+    with django_capture_on_commit_callbacks(execute=True):
+        django = Course.objects.create(
+            subject=subject, owner=owner, title='Веб-разработка на Django',
+            slug='django', overview='Модели, представления и шаблоны'
+        )
+        asyncio = Course.objects.create(
+            subject=subject, owner=owner, title='Асинхронный Python',
+            slug='asyncio', overview='Корутины и цикл событий'
+        )
+        module = Module.objects.create(course=asyncio, title='Очереди сообщений')
+        text = Text.objects.create(owner=owner, title='Лекция', content='Брокер RabbitMQ')
+        Content.objects.create(module=module, item=text)
+    return django, asyncio, text
+
+
+@pytest.mark.django_db
+def test_search_covers_course_modules_and_texts(catalog, django_capture_on_commit_callbacks):
+    django, asyncio, text = catalog
+    from education.service.search import search_courses
+
+    assert list(search_courses('django')) == [django]
+    assert list(search_courses('очередь')) == [asyncio]
+    assert list(search_courses('rabbitmq')) == [asyncio]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        text.content = 'Брокер Kafka'
+        text.save()
+    assert list(search_courses('rabbitmq')) == []
+    assert list(search_courses('kafka')) == [asyncio]
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_above_text(catalog, client, django_capture_on_commit_callbacks):
+    django, asyncio, text = catalog
+    with django_capture_on_commit_callbacks(execute=True):
+        django.overview = 'Асинхронные представления'
+        django.save()
+
+    response = client.get(reverse('education:course_search'), {'query': 'асинхронный'})
+    assert response.status_code == 200
+    assert list(response.context['results']) == [asyncio, django]
+
+
+@pytest.mark.django_db
+def test_course_queries_skip_search_vector(catalog, django_capture_on_commit_callbacks):
+    django, asyncio, text = catalog
+    from education.service.search import search_courses
+
+    course = Course.objects.get(pk=django.pk)
+    assert 'search_vector' in course.get_deferred_fields()
+    with django_capture_on_commit_callbacks(execute=True):
+        course.title = 'Веб-разработка на Flask'
+        course.save()
+    assert list(search_courses('flask')) == [course]
@@ -0,0 +1,40 @@
+import pytest
+from django.urls import reverse
+
+from education.models import Course, Module
+
+from .test_content_items import create_module_contents
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('modules, copies', [(1, 1), (5, 3)])
+def test_course_detail_constant_queries(client, course, student, modules, copies,
+                                        django_assert_num_queries):
+    created = [Module.objects.create(course=course, title=f'Module {i}') for i in range(modules)]
+    create_module_contents(created[-1], course.owner, copies)
+    url = reverse('account:student_course_detail_module', args=[course.pk, created[-1].pk])
+    # HTML объектов контента попадает в кэш при первом показе
+    client.get(url)
+
+    # Сессия, пользователь, курс, отметка посещения, Content, четыре
+    # таблицы контента и профиль в base.html; оглавление берется из кэша
+    with django_assert_num_queries(10):
+        response = client.get(url)
+    assert response.status_code == 200
+    assert response.context['module']['id'] == created[-1].pk
+    assert [module['id'] for module in response.context['outline']] == [module.pk for module in created]
+    assert len(response.context['contents']) == 4 * copies
+
+
+@pytest.mark.django_db
+def test_course_detail_not_found(client, course, student):
+    assert client.get(reverse('account:student_course_detail', args=[course.pk])).status_code == 404
+
+    Module.objects.create(course=course, title='Module 1')
+    assert client.get(reverse('account:student_course_detail', args=[course.pk])).status_code == 200
+    other = Module.objects.create(
+        course=Course.objects.create(subject=course.subject, owner=course.owner, title='Other', slug='other'),
+        title='Other module'
+    )
+    url = reverse('account:student_course_detail_module', args=[course.pk, other.pk])
+    assert client.get(url).status_code == 404
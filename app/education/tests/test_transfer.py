@@ -0,0 +1,49 @@
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+from education.models import Content, Course, Module, Subject
+from education.service.deletion import delete_course
+from education.tests.test_content_items import create_module_contents
+
+
+def course_snapshot(slug):
+    """Структура курса без идентификаторов для сравнения."""
+    course = Course.objects.get(slug=slug)
+    modules = list(course.modules.values_list('order', 'title', 'description'))
+    contents = [
+        (content.module.order, content.order, type(content.item).__name__, content.item.title)
+        for content in Content.objects.filter(module__course=course).order_by('module__order', 'order')
+    ]
+    return course.title, course.subject.slug, course.owner.username, modules, contents
+
+
+@pytest.mark.django_db
+def test_export_import_roundtrip(tmp_path):
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Python', slug='python')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course', slug='course',
+                                   overview='Обзор')
+    for title in ('Module 1', 'Module 2'):
+        create_module_contents(Module.objects.create(course=course, title=title), owner, 3)
+    before = course_snapshot('course')
+    path = tmp_path / 'courses.ndjson'
+
+    call_command('export_courses', '--subject', 'python', '--chunk-size', '5', '-o', str(path))
+    records = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [r['type'] for r in records[:4]] == ['subject', 'course', 'module', 'module']
+    assert len(records) == 1 + 1 + 2 + 24
+
+    delete_course(course)
+    call_command('import_courses', str(path), '--batch-size', '7')
+    assert course_snapshot('course') == before
+    imported = Course.objects.get(slug='course')
+    subject.refresh_from_db()
+    assert (imported.total_modules, subject.total_courses) == (2, 1)
+
+    # Повторный импорт ничего не дублирует
+    call_command('import_courses', str(path))
+    assert Course.objects.count() == 1
+    assert Content.objects.count() == 24
@@ -0,0 +1,115 @@
+import hashlib
+import io
+import json
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from education.models import Content, Course, File, Module, Subject, Upload
+from education.service.uploads import start_upload, write_chunk
+
+
+@pytest.fixture
+def module(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+    return Module.objects.create(course=course, title='Module 1')
+
+
+def put_chunk(client, url, data, start, size, checksum=None):
+    return client.put(
+        url,
+        data=data,
+        content_type='application/octet-stream',
+        headers={
+            'Content-Range': f'bytes {start}-{start + len(data) - 1}/{size}',
+            'X-Chunk-SHA256': checksum or hashlib.sha256(data).hexdigest(),
+        }
+    )
+
+
+@pytest.mark.django_db
+def test_chunked_upload_resumes_and_creates_content(client, module, tmp_path,
+                                                    django_capture_on_commit_callbacks):
+    client.force_login(module.course.owner)
+    payload = b'0123456789' * 100
+
+    response = client.post(
+        reverse('education:upload_create', args=[module.id, 'file']),
+        data=json.dumps({'filename': '../lecture notes.pdf', 'size': len(payload)}),
+        content_type='application/json'
+    )
+    assert response.status_code == 201
+    url = response.json()['url']
+
+    assert put_chunk(client, url, payload[:400], 0, len(payload)).json()['offset'] == 400
+
+    # Поврежденная часть отклоняется и не меняет файл
+    response = put_chunk(client, url, payload[400:800], 400, len(payload), checksum='0' * 64)
+    assert response.status_code == 409
+    assert response.json()['offset'] == 400
+    # Часть не с текущего смещения тоже отклоняется
+    assert put_chunk(client, url, payload[800:], 800, len(payload)).status_code == 409
+
+    # Клиент узнает смещение и продолжает загрузку
+    assert client.get(url).json()['offset'] == 400
+    assert put_chunk(client, url, payload[400:800], 400, len(payload)).status_code == 200
+    with django_capture_on_commit_callbacks(execute=True):
+        response = put_chunk(client, url, payload[800:], 800, len(payload))
+    assert response.status_code == 200
+    assert response.json()['complete'] is True
+
+    upload = Upload.objects.get()
+    content = Content.objects.get(module=module)
+    assert upload.content == content
+    assert isinstance(content.item, File)
+    assert content.item.title == 'lecture_notes.pdf'
+    # Собранный файл перенесен в хранилище без копии
+    assert content.item.file.name == upload.file_name
+    assert upload.file_name.startswith('blobs/')
+    assert (tmp_path / upload.file_name).read_bytes() == payload
+    assert not any(tmp_path.joinpath('uploads').iterdir())
+
+
+@pytest.mark.django_db
+def test_upload_requires_module_owner(client, module):
+    other = User.objects.create(username='other', password='testpassword')
+    client.force_login(other)
+    response = client.post(
+        reverse('education:upload_create', args=[module.id, 'image']),
+        data=json.dumps({'filename': 'photo.png', 'size': 10}),
+        content_type='application/json'
+    )
+    assert response.status_code == 404
+    assert not Upload.objects.exists()
+
+
+@pytest.mark.django_db
+def test_failed_completion_keeps_upload_resumable(module, tmp_path, monkeypatch,
+                                                  django_capture_on_commit_callbacks):
+    payload = b'0123456789' * 10
+    upload = start_upload(module.course.owner, module, 'file', 'lecture.pdf', len(payload))
+    content_range = f'bytes 0-{len(payload) - 1}/{len(payload)}'
+    checksum = hashlib.sha256(payload).hexdigest()
+
+    def fail(**kwargs):
+        raise RuntimeError('database error')
+
+    # Ошибка после приема файла хранилищем откатывает завершение загрузки
+    with monkeypatch.context() as patch:
+        patch.setattr(Content.objects, 'create', fail)
+        with django_capture_on_commit_callbacks(execute=True), pytest.raises(RuntimeError):
+            write_chunk(upload, io.BytesIO(payload), content_range, checksum)
+    upload.refresh_from_db()
+    assert upload.status == Upload.Status.ACTIVE and upload.offset == 0
+    assert (tmp_path / upload.file_name).read_bytes() == payload
+    assert not File.objects.exists()
+
+    # Последняя часть отправляется повторно
+    with django_capture_on_commit_callbacks(execute=True):
+        upload = write_chunk(upload, io.BytesIO(payload), content_range, checksum)
+    assert (tmp_path / upload.file_name).read_bytes() == payload
+    assert not any(tmp_path.joinpath('uploads').iterdir())
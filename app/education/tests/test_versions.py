@@ -0,0 +1,81 @@
+import pytest
+from django.contrib.auth.models import User
+
+from core.derivatives import derivatives_ready
+from core.models import ImageDerivative
+from education.models import Content, Course, Image, Module, Subject, Text, Video
+from education.service.render_cache import render_cache_key
+
+from .test_content_items import create_module_contents
+
+
+@pytest.fixture
+def module():
+    owner = User.objects.create(username='owner', password='testpassword')
+    subject = Subject.objects.create(title='Test Subject', slug='test-subject')
+    course = Course.objects.create(subject=subject, owner=owner, title='Course 1', slug='course1')
+    return Module.objects.create(course=course, title='Module 1')
+
+
+def version(module):
+    return Course.objects.values_list('content_version', flat=True).get(pk=module.course_id)
+
+
+@pytest.mark.django_db
+def test_content_changes_bump_course_version(module):
+    start = version(module)
+    text, *_ = create_module_contents(module, module.course.owner, 1)
+    assert version(module) == start + 1
+
+    text.content = 'changed'
+    text.save()
+    assert version(module) == start + 2
+
+    contents = list(module.contents.values_list('pk', flat=True))
+    Content.objects.filter(module=module).reorder({contents[0]: 3, contents[3]: 0})
+    assert version(module) == start + 3
+
+    # bulk_update проходит через update (так обновляются метаданные видео)
+    videos = list(Video.objects.all())
+    for video in videos:
+        video.provider = 'Test'
+    Video.objects.bulk_update(videos, ['provider'])
+    assert version(module) == start + 4
+
+    Content.objects.get(pk=contents[0]).delete()
+    assert version(module) > start + 4
+
+
+@pytest.mark.django_db
+def test_unattached_item_update_keeps_version(module):
+    start = version(module)
+    text = Text.objects.create(owner=module.course.owner, title='Draft', content='text')
+    assert Text.objects.filter(pk=text.pk).update(title='Draft 2') == 1
+    assert version(module) == start
+
+
+@pytest.mark.django_db
+def test_course_save_keeps_newer_version(module):
+    course = Course.objects.get(pk=module.course_id)
+    Module.objects.create(course=course, title='Module 2')
+    bumped = version(module)
+
+    # Курс прочитан до изменения модулей и сохраняется со старой версией в памяти
+    course.title = 'Renamed'
+    course.save()
+    assert version(module) == bumped
+    assert Course.objects.get(pk=course.pk).title == 'Renamed'
+
+
+@pytest.mark.django_db
+def test_image_derivatives_bump_course_version(module):
+    create_module_contents(module, module.course.owner, 1)
+    image = Image.objects.get()
+    old_key = render_cache_key(image)
+    start = version(module)
+    # Построенные копии добавляют srcset в разметку изображения: меняются
+    # ключ кэша прорисовки (во всех процессах) и версия курса
+    derivatives_ready.send(sender=ImageDerivative, source=image.file.name)
+    assert version(module) == start + 1
+    image.refresh_from_db()
+    assert render_cache_key(image) != old_key
@@ -0,0 +1,128 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from embed_video.backends import VideoBackend
+
+from education.models import Video
+from education.service.render_cache import render_cache_key
+
+
+class LocalVideoBackend(VideoBackend):
+    """Бэкенд локального видеохостинга для тестов."""
+    re_detect = re.compile(r'^http://127\.0\.0\.1:\d+/videos/\d+$')
+    re_code = re.compile(r'/videos/(?P<code>\d+)$')
+    pattern_url = '{protocol}://127.0.0.1/embed/{code}'
+    pattern_thumbnail_url = '{protocol}://127.0.0.1/thumbs/{code}.jpg'
+    oembed_endpoint = None
+
+
+class OEmbedHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        video_url = parse_qs(urlparse(self.path).query)['url'][0]
+        code = video_url.rsplit('/', 1)[-1]
+        body = json.dumps(self.server.body or {
+            'type': 'video',
+            'thumbnail_url': f'http://127.0.0.1/oembed-thumbs/{code}.jpg',
+            'duration': self.server.duration,
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def provider(settings, monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OEmbedHandler)
+    server.requests = []
+    server.duration = 754
+    server.body = None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    settings.VIDEO_EMBED_BACKENDS = (f'{__name__}.LocalVideoBackend',)
+    monkeypatch.setattr(LocalVideoBackend, 'oembed_endpoint', f'{base_url}/oembed')
+    server.base_url = base_url
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.django_db
+def test_video_metadata_resolved_on_save_not_on_render(provider):
+    owner = User.objects.create(username='owner', password='testpassword')
+    videos = [
+        Video.objects.create(owner=owner, title=f'Video {i}', url=f'{provider.base_url}/videos/{i}')
+        for i in range(5)
+    ]
+    assert len(provider.requests) == 5
+    video = Video.objects.get(pk=videos[0].pk)
+    assert video.provider == 'LocalVideoBackend'
+    assert video.embed_url == 'http://127.0.0.1/embed/0'
+    assert video.thumbnail_url == 'http://127.0.0.1/oembed-thumbs/0.jpg'
+    assert video.duration == 754
+
+    # Сохранение без смены ссылки не обращается к провайдеру
+    video.title = 'Renamed'
+    video.save()
+    assert len(provider.requests) == 5
+
+    html = ''.join(video.render() for video in Video.objects.all())
+    assert len(provider.requests) == 5
+    assert html.count('<iframe') == 5
+    assert 'Длительность: 12:34' in html
+
+    video.url = f'{provider.base_url}/videos/42'
+    video.save()
+    assert len(provider.requests) == 6
+    assert video.embed_url == 'http://127.0.0.1/embed/42'
+
+
+@pytest.mark.django_db
+def test_refresh_video_embeds_command(provider):
+    owner = User.objects.create(username='owner', password='testpassword')
+    video = Video.objects.create(owner=owner, title='Video', url=f'{provider.base_url}/videos/1')
+    unknown = Video.objects.create(owner=owner, title='Other', url='https://example.com/v.mp4')
+    assert unknown.provider == '' and unknown.embed_url == ''
+    assert len(provider.requests) == 1
+
+    call_command('refresh_video_embeds')
+    assert len(provider.requests) == 1
+
+    video.render()
+    old_key = render_cache_key(video)
+    provider.duration = 3700
+    call_command('refresh_video_embeds', '--all', '--workers', '2')
+    assert len(provider.requests) == 2
+    video.refresh_from_db()
+    assert video.duration == 3700
+    assert video.duration_display == '1:01:40'
+    # Новый ключ кэша: старый HTML не отдается и из локального кэша других процессов
+    assert render_cache_key(video) != old_key
+    assert 'Длительность: 1:01:40' in video.render()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('body, duration, thumbnail_url', [
+    ({'duration': '12.5', 'thumbnail_url': 'http://127.0.0.1/' + 'x' * 600}, 12, 'http://127.0.0.1/' + 'x' * 483),
+    ({'duration': 'about a minute', 'thumbnail_url': ['not', 'a', 'url']}, None, 'http://127.0.0.1/thumbs/1.jpg'),
+    (['not', 'an', 'object'], None, 'http://127.0.0.1/thumbs/1.jpg'),
+])
+def test_unexpected_oembed_response_does_not_break_save(provider, body, duration, thumbnail_url):
+    provider.body = body
+    owner = User.objects.create(username='owner', password='testpassword')
+    video = Video.objects.create(owner=owner, title='Video', url=f'{provider.base_url}/videos/1')
+    assert video.embed_url == 'http://127.0.0.1/embed/1'
+    assert video.duration == duration
+    assert video.thumbnail_url == thumbnail_url
@@ -18,10 +18,16 @@ urlpatterns = [
     path('<pk>/delete/',
          views.CourseDeleteView.as_view(),
          name='course_delete'),
+    path('<pk>/stats/',
+         views.CourseStatsView.as_view(),
+         name='course_stats'),
     # Просмотр курсов
     path('',
          views.CourseListView.as_view(),
          name='course_list'),
+    path('search/',
+         views.CourseSearchView.as_view(),
+         name='course_search'),
     path('subject/<slug:subject>/',
          views.CourseListView.as_view(),
          name='course_list_subject'),
@@ -48,6 +54,27 @@ urlpatterns = [
          views.ContentDeleteView.as_view(),
          name='module_content_delete'),
 
+    # Скачивание файлов контента
+    path('download/<str:model_name>/<int:id>/',
+         views.ContentDownloadView.as_view(),
+         name='content_download'),
+    path('download/<str:model_name>/<int:id>/link/',
+         views.ContentDownloadLinkView.as_view(),
+         name='content_download_link'),
+
+    # Загрузка файлов по частям
+    path('module/<int:module_id>/upload/<str:model_name>/',
+         views.UploadCreateView.as_view(),
+         name='upload_create'),
+    path('upload/<uuid:upload_id>/',
+         views.UploadChunkView.as_view(),
+         name='upload_chunk'),
+
+    # Прогресс студентов
+    path('content/<int:content_id>/progress/',
+         views.ProgressEventView.as_view(),
+         name='progress_event'),
+
     # Порядок (Order)
     path('module/order/',
          views.ModuleOrderView.as_view(),
@@ -1,3 +1,6 @@
 from .courses_views import *
 from .modules_views import *
 from .contents_views import *
+from .uploads_views import *
+from .downloads_views import *
+from .progress_views import *
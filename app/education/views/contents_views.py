@@ -1,12 +1,13 @@
 from braces.views import CsrfExemptMixin, JsonRequestResponseMixin
 
-from django.apps import apps
-from django.forms.models import modelform_factory
+from django.db import IntegrityError, transaction
+from django.http import Http404
 from django.shortcuts import redirect, get_object_or_404
 from django.views.generic.base import TemplateResponseMixin, View
 
 from education.models import Course, Module, Content
 from education.forms import ModuleFormSet
+from education.service.content_registry import content_registry
 
 
 class ContentCreateUpdateView(TemplateResponseMixin, View):
@@ -23,23 +24,16 @@ class ContentCreateUpdateView(TemplateResponseMixin, View):
         """
         Получает модель контента на основе переданного имени.
         """
-        if model_name in ['text', 'video', 'image', 'file']:
-            return apps.get_model(app_label='education', model_name=model_name)
-        return None
+        return content_registry.get_model(model_name)
 
     def get_form(self, model, *args, **kwargs):
         """
         Получает модельную форму на основе переданной модели.
+
+        Класс формы берется из реестра типов контента, где он создан
+        один раз при запуске приложения.
         """
-        form = modelform_factory(
-            model,
-            exclude=[
-                'owner',
-                'order',
-                'created',
-                'updated'
-            ]
-        )
+        form = content_registry.get_form_class(model._meta.model_name)
         return form(*args, **kwargs)
 
     def dispatch(self, request, module_id, model_name, id=None):
@@ -59,6 +53,8 @@ class ContentCreateUpdateView(TemplateResponseMixin, View):
             course__owner=request.user
         )
         self.model = self.get_model(model_name)
+        if self.model is None:
+            raise Http404('Неизвестный тип контента')
 
         if id:
             self.obj = get_object_or_404(
@@ -124,13 +120,16 @@ class ContentCreateUpdateView(TemplateResponseMixin, View):
         )
 
         if form.is_valid():
-            obj = form.save(commit=False)
-            obj.owner = request.user
-            obj.save()
-            if not id:
-                # Создаем новый контент
-                Content.objects.create(module=self.module,
-                                       item=obj)
+            # Объект и его запись Content создаются атомарно, номер порядка
+            # вычисляется под блокировкой модуля
+            with transaction.atomic():
+                obj = form.save(commit=False)
+                obj.owner = request.user
+                obj.save()
+                if not id:
+                    # Создаем новый контент
+                    Content.objects.create(module=self.module,
+                                           item=obj)
             return redirect('education:module_content_list', self.module.id)
         return self.render_to_response(
             {
@@ -175,14 +174,19 @@ class ContentOrderView(CsrfExemptMixin,
     """
 
     def post(self, request):
-        for content_id, order in self.request_json.items():
-            Content.objects.filter(
-                id=content_id,
-                module__course__owner=request.user
-            ).update(order=order)
+        try:
+            # Конфликт номеров откатывает только эту перестановку
+            with transaction.atomic():
+                # Владелец проверяется в том же UPDATE, что и запись позиций
+                updated = Content.objects.filter(
+                    module__course__owner=request.user
+                ).reorder(self.request_json)
+        except (AttributeError, TypeError, ValueError, IntegrityError):
+            return self.render_bad_request_response()
 
         return self.render_json_response(
             {
-                'saved': 'OK'
+                'saved': 'OK',
+                'updated': updated
             }
         )
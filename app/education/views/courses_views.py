@@ -1,13 +1,24 @@
+from datetime import timedelta
+
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.db.models import Count
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+from django.http import HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.views.generic.base import TemplateResponseMixin, View
 from django.views.generic.detail import DetailView
 from django.views.generic.list import ListView
 from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
+from django.utils import timezone
 
+from core.conditional import ConditionalGetMixin
 from education.models import Course, Subject
+from education.forms import CourseSearchForm
+from education.service.deletion import delete_course
+from education.service.pagination import KeysetPaginator
+from education.service.search import search_courses
 from account.forms import CourseEnrollForm
 
 
@@ -111,13 +122,88 @@ class CourseDeleteView(OwnerCourseMixin, DeleteView):
     template_name = 'manage/course/delete.html'
     permission_required = 'education.delete_course'
 
+    def form_valid(self, form):
+        """
+        Удаляет курс вместе с модулями, контентом и файлами контента.
+        """
+        delete_course(self.object)
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class CourseStatsView(OwnerCourseMixin, DetailView):
+    """
+    Статистика курса автора за последние дни.
+
+    Данные берутся только из дневных таблиц статистики
+    (education.service.analytics), а не из записей и прогресса студентов.
+    """
+    template_name = 'manage/course/stats.html'
+    permission_required = 'education.view_course'
+    default_days = 30
+    max_days = 365
+
+    def get_days(self):
+        """Количество дней из параметра days в пределах max_days."""
+        try:
+            days = int(self.request.GET.get('days', self.default_days))
+        except ValueError:
+            days = self.default_days
+        return min(max(days, 1), self.max_days)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        days = self.get_days()
+        since = timezone.localdate() - timedelta(days=days - 1)
+
+        daily = list(self.object.daily_stats.filter(date__gte=since))
+        modules = list(
+            self.object.modules.only('id', 'course', 'title', 'order').annotate(
+                completions=Coalesce(
+                    Sum('daily_stats__completions', filter=Q(daily_stats__date__gte=since)),
+                    0
+                )
+            )
+        )
+        context.update({
+            'days': days,
+            'daily_stats': daily,
+            'modules': modules,
+            'totals': {
+                'enrollments': sum(stats.enrollments for stats in daily),
+                'completions': sum(module.completions for module in modules),
+            },
+        })
+        return context
+
 
 class CourseListView(TemplateResponseMixin, View):
     """
     Отображает список курсов в зависимости от выбранной темы (проекта).
+
+    Курсы выводятся постранично с курсорной пагинацией по (-created, id):
+    стоимость страницы не зависит от ее глубины.
     """
     model = Course
     template_name = 'courses/list.html'
+    paginate_by = 20
+
+    def get_courses(self):
+        """
+        Возвращает QuerySet курсов только с полями, которые выводит шаблон.
+        """
+        return Course.objects.select_related(
+            'subject',
+            'owner'
+        ).only(
+            'title',
+            'slug',
+            'created',
+            'total_modules',
+            'subject__title',
+            'subject__slug',
+            'owner__first_name',
+            'owner__last_name'
+        )
 
     def get(self, request, subject=None):
         """
@@ -130,33 +216,94 @@ class CourseListView(TemplateResponseMixin, View):
         Returns:
             HttpResponse: Ответ с отображением списка курсов.
         """
-        subjects = Subject.objects.annotate(
-            total_courses=Count('courses')
-        )
-        courses = Course.objects.annotate(
-            total_modules=Count('modules')
-        )
+        # Количество курсов и модулей хранится в счетчиках моделей
+        subjects = Subject.objects.all()
+        courses = self.get_courses()
         if subject:
             subject = get_object_or_404(Subject, slug=subject)
             courses = courses.filter(subject=subject)
+
+        paginator = KeysetPaginator(courses, self.paginate_by)
+        page = paginator.page(request.GET.get('cursor'))
         return self.render_to_response(
             {
                 'subjects': subjects,
                 'subject': subject,
-                'courses': courses
+                'courses': page.object_list,
+                'page': page
             }
         )
 
 
-class CourseDetailView(DetailView):
+class CourseSearchView(TemplateResponseMixin, View):
+    """
+    Полнотекстовый поиск по курсам: заголовок, обзор, модули и тексты.
+
+    Результаты упорядочены по релевантности и разбиты на страницы.
+    """
+    template_name = 'courses/search.html'
+    paginate_by = 20
+
+    def get(self, request):
+        """
+        Обрабатывает GET-запрос с поисковой строкой в параметре query.
+
+        Args:
+            request (HttpRequest): GET-запрос.
+
+        Returns:
+            HttpResponse: Ответ со страницей результатов поиска.
+        """
+        form = CourseSearchForm(request.GET)
+        results = None
+        if form.is_valid():
+            courses = search_courses(
+                form.cleaned_data['query'],
+                Course.objects.select_related('subject', 'owner')
+            )
+            paginator = Paginator(courses, self.paginate_by)
+            page_number = request.GET.get('page', 1)
+            try:
+                results = paginator.page(page_number)
+            except EmptyPage:
+                # Если page_number больше диапазона, выдать последнюю страницу
+                results = paginator.page(paginator.num_pages)
+            except PageNotAnInteger:
+                # Если page_number не целое число, то выдать первую страницу
+                results = paginator.page(1)
+
+        return self.render_to_response(
+            {
+                'form': form,
+                'query': form.cleaned_data.get('query') if form.is_valid() else '',
+                'results': results
+            }
+        )
+
+
+class CourseDetailView(ConditionalGetMixin, DetailView):
     """
     Представление детальной информации отображения курса.
 
-    DetailView ожидает, что pk или slug будет извлекать 1 объект курса
+    DetailView ожидает, что pk или slug будет извлекать 1 объект курса.
+    На повторный запрос неизменившейся страницы отвечает 304 Not Modified.
     """
     model = Course
     template_name = 'courses/detail.html'
 
+    def get_validators(self):
+        """
+        Возвращает валидаторы страницы: показываемые поля курса и его версию.
+
+        Поля читаются одним запросом без прорисовки шаблона; у курса нет
+        даты изменения, поэтому Last-Modified не отправляется.
+        """
+        row = Course.objects.filter(slug=self.kwargs['slug']).values_list(
+            'pk', 'content_version', 'title', 'overview', 'total_modules',
+            'subject__title', 'subject__slug', 'owner__first_name', 'owner__last_name'
+        ).first()
+        return (row, None) if row else None
+
     def get_context_data(self, **kwargs):
         """
         Возвращает дополнительные данные контекста, включая форму записи на курс.
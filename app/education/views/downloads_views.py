@@ -0,0 +1,78 @@
+from braces.views import JSONResponseMixin
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.views.generic.base import View
+
+from education.models import Image
+from education.service.downloads import (
+    DOWNLOAD_MODELS,
+    can_download,
+    check_download_token,
+    get_derivative_name,
+    get_signed_download_url,
+    serve_file,
+)
+
+
+def get_download_item(model_name, id):
+    """
+    Получает объект File/Image по имени модели и ИД.
+    """
+    model = DOWNLOAD_MODELS.get(model_name)
+    if model is None:
+        raise Http404
+    return get_object_or_404(model, id=id)
+
+
+class ContentDownloadView(View):
+    """
+    Скачивание файла контента с проверкой доступа.
+
+    Доступ дает запись на курс (или авторство) либо действующая
+    подписанная ссылка (параметр token). Параметры format и width
+    выбирают уменьшенную копию изображения (srcset на странице курса).
+    """
+
+    def get(self, request, model_name, id):
+        item = get_download_item(model_name, id)
+        token = request.GET.get('token')
+        if token:
+            if not check_download_token(token, item):
+                raise PermissionDenied
+        elif not can_download(request.user, item):
+            if not request.user.is_authenticated:
+                return redirect_to_login(request.get_full_path())
+            raise PermissionDenied
+        name = None
+        if 'width' in request.GET:
+            name = get_derivative_name(item, request.GET.get('format'), request.GET['width'])
+            if name is None:
+                raise Http404
+        # Изображения встраиваются в страницы курса, а не скачиваются
+        as_attachment = not isinstance(item, Image)
+        return serve_file(request, item, name, as_attachment=as_attachment)
+
+
+class ContentDownloadLinkView(LoginRequiredMixin,
+                              JSONResponseMixin,
+                              View):
+    """
+    Выдает подписанную ссылку на скачивание с ограниченным сроком действия,
+    например для менеджера загрузок, у которого нет сессии пользователя.
+    """
+
+    def get(self, request, model_name, id):
+        item = get_download_item(model_name, id)
+        if not can_download(request.user, item):
+            raise Http404
+        url, expires = get_signed_download_url(item)
+        return self.render_json_response(
+            {
+                'url': request.build_absolute_uri(url),
+                'expires': expires
+            }
+        )
@@ -1,10 +1,13 @@
 from braces.views import CsrfExemptMixin, JsonRequestResponseMixin
 
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
 from django.shortcuts import redirect, get_object_or_404
 from django.views.generic.base import TemplateResponseMixin, View
 
 from education.models import Course, Module, Content
 from education.forms import ModuleFormSet
+from education.service.outline import get_outline
 
 
 class CourseModuleUpdateView(TemplateResponseMixin, View):
@@ -12,21 +15,29 @@ class CourseModuleUpdateView(TemplateResponseMixin, View):
     Представление для управления модулями в рамках курса.
     Для редактирования модулей использует формы ModuleFormSet.
 
+    Модули выводятся окнами по window_size штук (параметр page), а при
+    сохранении проверяются и записываются только присланные формы, поэтому
+    время сохранения не зависит от общего количества модулей курса.
+
     Attributes:
         template_name (str): Имя шаблона, который будет использоваться для отображения формы.
         course (Course): Курс, с которым работает представление.
+        window_size (int): Количество модулей на одной странице редактора.
 
     Method:
-        get_formset(data=None): Создает и возвращает форму ModuleFormSet для заданного курса.
+        get_formset(module_ids, data=None): Создает и возвращает форму ModuleFormSet для модулей курса.
+        get_submitted_ids(data): Возвращает идентификаторы модулей из присланных форм.
     """
     template_name = 'manage/module/formset.html'
     course = None
+    window_size = 50
 
-    def get_formset(self, data=None):
+    def get_formset(self, module_ids, data=None):
         """
-        Создает и возвращает форму ModuleFormSet для заданного курса.
+        Создает и возвращает форму ModuleFormSet для модулей курса.
 
         Args:
+            module_ids (list): Идентификаторы модулей, попадающих в набор форм.
             data: Данные для инициализации формы. По умолчанию None.
 
         Returns:
@@ -34,9 +45,41 @@ class CourseModuleUpdateView(TemplateResponseMixin, View):
         """
         return ModuleFormSet(
             instance=self.course,
+            queryset=Module.objects.filter(pk__in=module_ids),
             data=data
         )
 
+    def get_submitted_ids(self, data):
+        """
+        Возвращает идентификаторы модулей из присланных форм.
+
+        Args:
+            data (QueryDict): Данные POST-запроса.
+
+        Returns:
+            list: Идентификаторы существующих модулей набора форм.
+        """
+        prefix = ModuleFormSet.get_default_prefix()
+        try:
+            total = int(data.get(f'{prefix}-TOTAL_FORMS', 0))
+        except ValueError:
+            return []
+        module_ids = []
+        for index in range(min(total, ModuleFormSet.max_num)):
+            value = data.get(f'{prefix}-{index}-id')
+            if value and value.isdigit():
+                module_ids.append(int(value))
+        return module_ids
+
+    def render_formset(self, formset, page):
+        return self.render_to_response(
+            {
+                'course': self.course,
+                'formset': formset,
+                'page': page
+            }
+        )
+
     def dispatch(self, request, course_id):
         """
         Метод предоставляется классом View.
@@ -60,7 +103,7 @@ class CourseModuleUpdateView(TemplateResponseMixin, View):
 
     def get(self, request, *args, **kwargs):
         """
-        Обрабатывает GET-запрос и отображает форму для редактирования модулей.
+        Обрабатывает GET-запрос и отображает форму для редактирования окна модулей.
 
         Args:
             request (HttpRequest): GET-запрос.
@@ -68,17 +111,13 @@ class CourseModuleUpdateView(TemplateResponseMixin, View):
         Returns:
             HttpResponse: HTTP-ответ с отображением формы для редактирования модулей.
         """
-        formset = self.get_formset()
-        return self.render_to_response(
-            {
-                'course': self.course,
-                'formset': formset
-            }
-        )
+        paginator = Paginator(self.course.modules.values_list('pk', flat=True), self.window_size)
+        page = paginator.get_page(request.GET.get('page'))
+        return self.render_formset(self.get_formset(list(page.object_list)), page)
 
     def post(self, request, *args, **kwargs):
         """
-        Обрабатывает POST-запрос и сохраняет изменения модулей.
+        Обрабатывает POST-запрос и сохраняет изменения присланных модулей.
 
         Args:
             request (HttpRequest): POST-запрос.
@@ -86,17 +125,12 @@ class CourseModuleUpdateView(TemplateResponseMixin, View):
         Returns:
             HttpResponse: После успешного сохранения, перенаправляет на список курсов.
         """
-        formset = self.get_formset(data=request.POST)
+        formset = self.get_formset(self.get_submitted_ids(request.POST), data=request.POST)
 
         if formset.is_valid():
-            formset.save()
+            formset.save_bulk()
             return redirect('education:manage_course_list')
-        return self.render_to_response(
-            {
-                'course': self.course,
-                'formset': formset
-            }
-        )
+        return self.render_formset(formset, None)
 
 
 class ModuleContentListView(TemplateResponseMixin, View):
@@ -117,13 +151,15 @@ class ModuleContentListView(TemplateResponseMixin, View):
             HttpResponse: Ответ с отображением списка содержимого модуля.
         """
         module = get_object_or_404(
-            Module,
+            Module.objects.select_related('course'),
             id=module_id,
             course__owner=request.user
         )
         return self.render_to_response(
             {
-                'module': module
+                'module': module,
+                'outline': get_outline(module.course),
+                'contents': module.contents.with_items()
             }
         )
 
@@ -136,13 +172,19 @@ class ModuleOrderView(CsrfExemptMixin,
     """
 
     def post(self, request):
-        for module_id, order in self.request_json.items():
-            Module.objects.filter(
-                id=module_id,
-                course__owner=request.user
-            ).update(order=order)
+        try:
+            # Конфликт номеров откатывает только эту перестановку
+            with transaction.atomic():
+                # Владелец проверяется в том же UPDATE, что и запись позиций
+                updated = Module.objects.filter(
+                    course__owner=request.user
+                ).reorder(self.request_json)
+        except (AttributeError, TypeError, ValueError, IntegrityError):
+            return self.render_bad_request_response()
+
         return self.render_json_response(
             {
-                'saved': 'OK'
+                'saved': 'OK',
+                'updated': updated
             }
         )
@@ -0,0 +1,34 @@
+from braces.views import JsonRequestResponseMixin
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
+from django.views.generic.base import View
+
+from education.models import Content
+from education.service.progress import EVENTS, VIEWED, record_progress
+
+
+class ProgressEventView(LoginRequiredMixin,
+                        JsonRequestResponseMixin,
+                        View):
+    """
+    Принимает событие прогресса студента по объекту контента.
+
+    Ожидает JSON вида {"event": "viewed" | "completed"}.
+    Событие записывается в буфер, поэтому ответ 202 не ждет записи в базу.
+    """
+
+    def post(self, request, content_id):
+        try:
+            event = self.request_json.get('event', VIEWED)
+        except AttributeError:
+            return self.render_bad_request_response()
+        if event not in EVENTS:
+            return self.render_bad_request_response({'error': 'Неизвестное событие'})
+        if not Content.objects.filter(
+                pk=content_id,
+                module__course__enrollments__user=request.user
+        ).exists():
+            raise Http404('Контент не найден')
+        record_progress(request.user.pk, content_id, event)
+        return self.render_json_response({'content_id': content_id, 'event': event}, status=202)
@@ -0,0 +1,93 @@
+from braces.views import JsonRequestResponseMixin, JSONResponseMixin
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.generic.base import View
+
+from education.models import Module, Upload
+from education.service.uploads import CHUNK_SIZE, ChunkError, start_upload, write_chunk
+
+
+def upload_state(upload):
+    """
+    Состояние загрузки для ответа клиенту.
+    """
+    return {
+        'upload_id': str(upload.pk),
+        'url': reverse('education:upload_chunk', args=[upload.pk]),
+        'offset': upload.offset,
+        'size': upload.size,
+        'chunk_size': CHUNK_SIZE,
+        'complete': upload.status == Upload.Status.COMPLETE,
+        'content_id': upload.content_id,
+    }
+
+
+class UploadCreateView(LoginRequiredMixin,
+                       JsonRequestResponseMixin,
+                       View):
+    """
+    Начинает возобновляемую загрузку файла для контента модуля.
+
+    Ожидает JSON вида {"filename": "...", "size": 123, "title": "..."}.
+    """
+
+    def post(self, request, module_id, model_name):
+        module = get_object_or_404(
+            Module,
+            id=module_id,
+            course__owner=request.user
+        )
+        try:
+            upload = start_upload(
+                owner=request.user,
+                module=module,
+                model_name=model_name,
+                filename=self.request_json['filename'],
+                size=self.request_json['size'],
+                title=self.request_json.get('title', '')
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return self.render_bad_request_response()
+        return self.render_json_response(upload_state(upload), status=201)
+
+
+class UploadChunkView(LoginRequiredMixin,
+                      JSONResponseMixin,
+                      View):
+    """
+    Принимает части загрузки и сообщает ее состояние.
+
+    GET возвращает смещение, с которого нужно продолжить загрузку.
+    PUT принимает часть в теле запроса с заголовками
+    Content-Range: bytes <start>-<end>/<size> и X-Chunk-SHA256.
+    """
+
+    def get_upload(self, upload_id):
+        return get_object_or_404(
+            Upload,
+            id=upload_id,
+            owner=self.request.user
+        )
+
+    def get(self, request, upload_id):
+        return self.render_json_response(upload_state(self.get_upload(upload_id)))
+
+    def put(self, request, upload_id):
+        upload = self.get_upload(upload_id)
+        try:
+            # Тело читается из потока запроса блоками, а не через request.body
+            upload = write_chunk(
+                upload,
+                request,
+                request.headers.get('Content-Range'),
+                request.headers.get('X-Chunk-SHA256')
+            )
+        except ChunkError as error:
+            upload.refresh_from_db()
+            return self.render_json_response(
+                {'error': str(error), **upload_state(upload)},
+                status=409
+            )
+        return self.render_json_response(upload_state(upload))
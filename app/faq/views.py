@@ -1,7 +1,9 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Count, Max, Q
 from django.views.decorators.http import require_POST
 
+from core.conditional import conditional_page
 from .models import Post
 from .forms import CommentaryForm
 
@@ -32,9 +34,32 @@ def faq_list(request):
                   )
 
 
+def faq_detail_validators(request, year, month, day, comm):
+    """
+    Валидаторы страницы поста: дата изменения поста, количество активных
+    комментариев и дата изменения последнего из них (одним запросом).
+    """
+    row = Post.objects.filter(
+        status=Post.Status.PUBLISHED,
+        publish__year=year,
+        publish__month=month,
+        publish__day=day,
+        slug=comm
+    ).annotate(
+        commentaries=Count('commentary_post', filter=Q(commentary_post__active=True)),
+        commentaries_updated=Max('commentary_post__updated', filter=Q(commentary_post__active=True))
+    ).values_list('pk', 'updated', 'commentaries', 'commentaries_updated').first()
+    if row is None:
+        return None
+    _, updated, _, commentaries_updated = row
+    return row, max(filter(None, (updated, commentaries_updated)))
+
+
+@conditional_page(faq_detail_validators)
 def faq_detail(request, year, month, day, comm):
     """
-    Представление проверяет пост на наличие, возвращает 404 при отсутствии
+    Представление проверяет пост на наличие, возвращает 404 при отсутствии.
+    На повторный запрос неизменившейся страницы отвечает 304 Not Modified.
     """
     comm = get_object_or_404(Post,
                              status=Post.Status.PUBLISHED,